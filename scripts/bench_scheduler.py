@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""Scheduler benchmark — queue wait times under a skewed load.
+
+Drives the real scheduler (pull_task with no task id) against a throwaway
+DB on a virtual clock: tasks arrive in bursts, 80% of them land in one
+zone and 10% are high priority. Runs once with priorities honoured and
+once with every task at priority 0 (plain FIFO) and prints wait-time
+percentiles per priority band, per-agent throughput and pick latency.
+
+Usage: python scripts/bench_scheduler.py [--tasks 400] [--agents 6] [--seed 7]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+_tmp = tempfile.mkdtemp(prefix="minion-bench-")
+os.environ["MINION_COMMS_DB_PATH"] = os.path.join(_tmp, "bench.db")
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from minion_comms.comms import register  # noqa: E402
+from minion_comms.db import get_db, init_db, now_iso  # noqa: E402
+from minion_comms.fs import ensure_dirs  # noqa: E402
+from minion_comms.tasks import pull_task  # noqa: E402
+
+ZONES = ["src/core/", "src/ui/", "src/api/"]
+
+
+def _reset() -> None:
+    conn = get_db()
+    for table in ("tasks", "task_history", "task_dependencies", "events", "agents"):
+        conn.execute(f"DELETE FROM {table}")
+    conn.commit()
+    conn.close()
+
+
+def _pct(values: list[int], p: float) -> int:
+    if not values:
+        return 0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(p * len(ordered)))]
+
+
+def run(policy: str, n_tasks: int, n_agents: int, seed: int) -> dict[str, object]:
+    rng = random.Random(seed)
+    _reset()
+    register("lead", "lead")
+    agents = [f"coder{i}" for i in range(n_agents)]
+    for name in agents:
+        register(name, "coder")
+    conn = get_db()
+    conn.executemany(
+        "UPDATE agents SET current_zone = ? WHERE name = ?",
+        [(ZONES[i % len(ZONES)], name) for i, name in enumerate(agents)],
+    )
+    spec = os.path.join(_tmp, "spec.md")
+    with open(spec, "w") as f:
+        f.write("bench task")
+
+    # Arrivals: a burst every 20 ticks, zone-skewed, 10% urgent
+    arrivals: dict[int, list[tuple[str, int]]] = {}
+    for i in range(n_tasks):
+        tick = (i // 40) * 20
+        zone = ZONES[0] if rng.random() < 0.8 else rng.choice(ZONES[1:])
+        priority = 10 if rng.random() < 0.1 else 0
+        arrivals.setdefault(tick, []).append((zone, priority))
+    conn.commit()
+    conn.close()
+
+    arrived_at: dict[int, int] = {}
+    band: dict[int, int] = {}
+    busy: dict[str, tuple[int, int]] = {}  # agent -> (task_id, done_tick)
+    waits: dict[int, list[int]] = {0: [], 10: []}
+    done: dict[str, int] = {a: 0 for a in agents}
+    pick_ms: list[float] = []
+
+    tick = 0
+    while True:
+        if tick in arrivals:
+            conn = get_db()
+            now = now_iso()
+            for zone, priority in arrivals[tick]:
+                cur = conn.execute(
+                    """INSERT INTO tasks (title, task_file, zone, status, class_required, priority,
+                                          created_by, created_at, updated_at)
+                       VALUES ('bench', ?, ?, 'open', 'coder', ?, 'lead', ?, ?)""",
+                    (spec, zone, priority if policy == "priority" else 0, now, now),
+                )
+                arrived_at[cur.lastrowid] = tick
+                band[cur.lastrowid] = priority
+            conn.commit()
+            conn.close()
+
+        for agent, (task_id, done_tick) in list(busy.items()):
+            if tick >= done_tick:
+                conn = get_db()
+                conn.execute("UPDATE tasks SET status = 'closed', assigned_to = NULL WHERE id = ?", (task_id,))
+                conn.commit()
+                conn.close()
+                done[agent] += 1
+                del busy[agent]
+
+        for agent in agents:
+            if agent in busy:
+                continue
+            started = time.perf_counter()
+            result = pull_task(agent)
+            pick_ms.append((time.perf_counter() - started) * 1000)
+            if "task_id" in result:
+                task_id = int(result["task_id"])
+                waits[band[task_id]].append(tick - arrived_at[task_id])
+                busy[agent] = (task_id, tick + max(1, int(rng.expovariate(1 / 6))))
+
+        tick += 1
+        if len(arrived_at) == n_tasks and not busy and sum(done.values()) == n_tasks:
+            break
+
+    return {"policy": policy, "ticks": tick, "waits": waits, "done": done, "pick_ms": pick_ms}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=400)
+    parser.add_argument("--agents", type=int, default=6)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    init_db()
+    ensure_dirs()
+    for policy in ("fifo", "priority"):
+        r = run(policy, args.tasks, args.agents, args.seed)
+        print(f"== {policy}: drained in {r['ticks']} ticks")
+        for prio, w in sorted(r["waits"].items(), reverse=True):
+            label = "urgent" if prio else "normal"
+            print(f"   {label:7s} n={len(w):4d}  wait p50={_pct(w, .5):4d}  p95={_pct(w, .95):4d}  max={max(w or [0]):4d}")
+        print(f"   per-agent completed: {sorted(r['done'].values())}")
+        print(f"   pick latency: mean={statistics.mean(r['pick_ms']):.2f}ms  p95={_pct([int(x * 100) for x in r['pick_ms']], .95) / 100:.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""Spawn benchmark — tmux pane setup for a crew, per-command vs batched.
+
+Runs against a private tmux server (its own TMUX_TMPDIR, so nothing you
+have open is touched) and a throwaway project dir. "serial" issues every
+tmux command as its own client call, the way spawn_party used to;
+"batched" is crew.daemon.spawn_panes + finalize_layout, one call each.
+Daemon starts are not timed — they need minion-swarm — but they now run
+in a thread pool, so their cost no longer scales with crew size either.
+
+Usage: python scripts/bench_spawn.py [--agents 10] [--runs 5]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+_tmp = tempfile.mkdtemp(prefix="minion-bench-")
+os.environ["TMUX_TMPDIR"] = _tmp
+os.environ.pop("TMUX", None)
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from minion_comms.crew._tmux import finalize_layout, style_cmds  # noqa: E402
+from minion_comms.crew.daemon import _open_pane_cmds, _pane_command, spawn_panes  # noqa: E402
+
+SESSION = "crew-bench"
+ROLES = ["lead", "coder", "builder", "oracle", "recon"]
+
+
+def _crew(n: int) -> list[dict[str, str]]:
+    return [{"name": f"agent{i}", "role": ROLES[i % len(ROLES)], "model": "sonnet", "provider": ""} for i in range(n)]
+
+
+def _kill() -> None:
+    subprocess.run(["tmux", "kill-server"], capture_output=True)
+    # Let the old server finish exiting so it isn't billed to the next run
+    socket = os.path.join(_tmp, f"tmux-{os.getuid()}", "default")
+    deadline = time.monotonic() + 2
+    while os.path.exists(socket) and time.monotonic() < deadline:
+        time.sleep(0.01)
+    time.sleep(0.1)
+
+
+def serial(crew: list[dict[str, str]], project_dir: str) -> None:
+    for i, a in enumerate(crew):
+        cmds = _open_pane_cmds(SESSION, a["name"], _pane_command(a["name"], project_dir), i > 0)
+        cmds += style_cmds(SESSION, i, a["name"], a["role"], a["model"])
+        for cmd in cmds:
+            subprocess.run(["tmux", *cmd], capture_output=True)
+    for cmd in (
+        ["select-layout", "-t", SESSION, "tiled"],
+        ["set-option", "-t", SESSION, "pane-border-status", "top"],
+        ["set-option", "-t", SESSION, "pane-border-format", "#[fg=#{@cc}] #{pane_title} #[default]"],
+    ):
+        subprocess.run(["tmux", *cmd], capture_output=True)
+
+
+def batched(crew: list[dict[str, str]], project_dir: str) -> None:
+    spawned, failed = spawn_panes(SESSION, crew, project_dir, session_exists=False)
+    assert not failed, failed
+    finalize_layout(SESSION, is_new=False, pane_count=len(spawned))
+
+
+def _panes() -> int:
+    out = subprocess.run(["tmux", "list-panes", "-t", SESSION], capture_output=True, text=True).stdout
+    return len(out.strip().splitlines())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--agents", type=int, default=10)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+    if not shutil.which("tmux"):
+        sys.exit("tmux not found")
+
+    crew = _crew(args.agents)
+    project_dir = os.path.join(_tmp, "project")
+    print(f"{args.agents} agents, {args.runs} runs, private tmux server in {_tmp}\n")
+    print(f"{'mode':<10}{'median ms':>12}{'min ms':>10}{'panes':>8}")
+    try:
+        for name, fn in (("serial", serial), ("batched", batched)):
+            times = []
+            for _ in range(args.runs):
+                _kill()
+                started = time.perf_counter()
+                fn(crew, project_dir)
+                times.append((time.perf_counter() - started) * 1000)
+                panes = _panes()
+            print(f"{name:<10}{statistics.median(times):>12.1f}{min(times):>10.1f}{panes:>8}")
+    finally:
+        _kill()
+        shutil.rmtree(_tmp, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
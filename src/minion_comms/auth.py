@@ -46,6 +46,34 @@ CLASS_STALENESS_SECONDS: dict[str, int] = {
     "oracle": 30 * 60,
 }
 
+# ---------------------------------------------------------------------------
+# Task claim lease (seconds) — renewed by update-task and polls, reclaimed on expiry
+# ---------------------------------------------------------------------------
+
+TASK_LEASE_SECONDS = 30 * 60
+
+# ---------------------------------------------------------------------------
+# File claim lease (seconds) — renewed by the holder's claims, context updates
+# and polls; on expiry the claim passes to the head of its waitlist
+# ---------------------------------------------------------------------------
+
+CLAIM_LEASE_SECONDS = 20 * 60
+
+# ---------------------------------------------------------------------------
+# Presence — an agent silent this long is reaped: claims released, tasks
+# requeued, dropped from class/zone sends. Idle pollers heartbeat well inside
+# it; never shorter than the task lease, so a held task expires first.
+# ---------------------------------------------------------------------------
+
+AGENT_DEAD_SECONDS = TASK_LEASE_SECONDS
+HEARTBEAT_SECONDS = 60
+
+# ---------------------------------------------------------------------------
+# Scheduler — max tasks an agent may hold before poll stops offering new ones
+# ---------------------------------------------------------------------------
+
+TASK_INFLIGHT_CAP = 1
+
 # ---------------------------------------------------------------------------
 # Battle plan / task / raid log enums
 # ---------------------------------------------------------------------------
@@ -106,7 +134,7 @@ TOOL_CATALOG: dict[str, tuple[set[str], str]] = {
     "set-status":            (VALID_CLASSES, "Set your current status text"),
     "set-context":           (VALID_CLASSES, "Update context summary and HP metrics"),
     "who":                   (VALID_CLASSES, "List all registered agents"),
-    "send":                  (VALID_CLASSES, "Send a message to an agent or broadcast"),
+    "send":                  (VALID_CLASSES, "Send to an agent, list, class, zone or broadcast"),
     "check-inbox":           (VALID_CLASSES, "Check and clear unread messages"),
     "get-history":           (VALID_CLASSES, "Return last N messages across all agents"),
     "purge-inbox":           (VALID_CLASSES, "Delete old messages from inbox"),
@@ -116,17 +144,24 @@ TOOL_CATALOG: dict[str, tuple[set[str], str]] = {
     "log-raid":              (VALID_CLASSES, "Append an entry to the raid log"),
     "get-raid-log":          (VALID_CLASSES, "Read the raid log"),
     "create-task":           ({"lead"}, "Create a new task with spec file"),
+    "create-tasks":          ({"lead"}, "Bulk-create tasks from a YAML/JSONL manifest"),
     "assign-task":           ({"lead"}, "Assign a task to an agent"),
     "update-task":           (VALID_CLASSES, "Update task status, progress, or files"),
     "get-tasks":             (VALID_CLASSES, "List tasks with filters"),
     "get-task":              (VALID_CLASSES, "Get full detail for a single task"),
     "submit-result":         (VALID_CLASSES, "Submit a result file for a task"),
     "close-task":            ({"lead"}, "Close a completed task"),
+    "close-tasks":           ({"lead"}, "Close matching tasks in one batch (--ids/--status/--zone)"),
+    "update-tasks":          ({"lead"}, "Move matching tasks to a new status in one batch"),
     "claim-file":            ({"coder", "builder"}, "Claim a file for exclusive editing"),
     "release-file":          ({"coder", "builder"}, "Release a file claim"),
+    "claim-files":           ({"coder", "builder"}, "Claim a set of files atomically (all or nothing)"),
+    "release-files":         ({"coder", "builder"}, "Release a set of file claims atomically"),
+    "audit-edits":           (VALID_CLASSES, "Working-tree edits vs file claims, from one git status pass"),
     "get-claims":            (VALID_CLASSES, "List active file claims"),
     "party-status":          ({"lead"}, "Full raid health dashboard"),
     "check-activity":        (VALID_CLASSES, "Check an agent's activity level"),
+    "scan-freshness":        (VALID_CLASSES, "Mark agents' reads stale for files changed since"),
     "check-freshness":       ({"lead"}, "Check file freshness vs agent's last context"),
     "sitrep":                (VALID_CLASSES, "Fused COP: agents + tasks + claims + flags"),
     "update-hp":             ({"lead"}, "Daemon-only: write observed HP to SQLite"),
@@ -140,13 +175,24 @@ TOOL_CATALOG: dict[str, tuple[set[str], str]] = {
     "spawn-party":           (VALID_CLASSES, "Spawn daemon workers in tmux panes (auto-registers lead)"),
     "stand-down":            ({"lead"}, "Dismiss the party"),
     "retire-agent":          ({"lead"}, "Signal a single daemon to exit gracefully"),
+    "autoscale":             ({"lead"}, "Grow/shrink daemon agents per class with queue depth"),
+    "register-process":      (VALID_CLASSES, "Register a daemon PID for direct stand-down/retire signals"),
     "hand-off-zone":         (VALID_CLASSES, "Direct zone handoff between agents"),
     "tools":                 (VALID_CLASSES, "List available tools for your class"),
     "pull-task":             (VALID_CLASSES, "Auto-pull next actionable task from DAG"),
     "task-lineage":          (VALID_CLASSES, "Show task DAG history and who worked each stage"),
     "complete-task":         (VALID_CLASSES, "DAG-routed task completion"),
+    "conflicts":             (VALID_CLASSES, "Show tasks with overlapping file sets or claims"),
+    "reclaim-tasks":         ({"lead"}, "Return tasks with lapsed claim leases to the pool"),
+    "reap":                  ({"lead"}, "Sweep silent agents: release claims, requeue tasks, notify lead"),
     "poll":                  (VALID_CLASSES, "Poll for messages and tasks (replaces poll.sh)"),
     "list-flows":            (VALID_CLASSES, "List available task flow types"),
+    "flow-stats":            (VALID_CLASSES, "Per-stage queue depth, dwell time and throughput"),
+    "simulate-crew":         (VALID_CLASSES, "Simulate crew compositions against the backlog"),
+    "compile-flows":         ({"lead"}, "Recompile flow tables into the cache and validate flows"),
+    "changes":               (VALID_CLASSES, "Stream change events since a sequence number"),
+    "replicate":             ({"lead"}, "Sync the read replica (--follow to keep it current)"),
+    "replica-status":        (VALID_CLASSES, "Show read replica lag"),
 }
 
 
@@ -0,0 +1,63 @@
+"""Change feed — read the events outbox by sequence number.
+
+Every mutating call appends to `events` inside its own transaction, so
+`seq` is a global, monotonically increasing cursor. Consumers remember
+the last seq they processed and ask for everything after it.
+"""
+
+from __future__ import annotations
+
+import json
+import time
+from typing import Any, Iterator
+
+from minion_comms.db import get_read_db
+
+
+def _event_row(row: Any) -> dict[str, Any]:
+    e = dict(row)
+    e["kind"] = f"{e['entity']}.{e['action']}"
+    e["data"] = json.loads(e["data"]) if e.get("data") else None
+    return e
+
+
+def get_changes(since: int = 0, limit: int = 500, entity: str = "") -> dict[str, object]:
+    """Return events with seq > since, oldest first."""
+    conn = get_read_db()
+    cursor = conn.cursor()
+    try:
+        query = "SELECT * FROM events WHERE seq > ?"
+        params: list[str | int] = [since]
+        if entity:
+            query += " AND entity = ?"
+            params.append(entity)
+        query += " ORDER BY seq ASC LIMIT ?"
+        params.append(limit)
+
+        cursor.execute(query, params)
+        events = [_event_row(row) for row in cursor.fetchall()]
+
+        cursor.execute("SELECT COALESCE(MAX(seq), 0) FROM events")
+        head = cursor.fetchone()[0]
+        last_seq = events[-1]["seq"] if events else since
+        return {"events": events, "last_seq": last_seq, "head_seq": head}
+    finally:
+        conn.close()
+
+
+def follow_changes(
+    since: int = 0,
+    interval: float = 1.0,
+    entity: str = "",
+    batch: int = 500,
+) -> Iterator[dict[str, Any]]:
+    """Yield events forever, polling the outbox every `interval` seconds when idle."""
+    cursor_seq = since
+    while True:
+        page = get_changes(cursor_seq, batch, entity)
+        events: list[dict[str, Any]] = page["events"]  # type: ignore[assignment]
+        for e in events:
+            yield e
+        cursor_seq = int(page["last_seq"])  # type: ignore[arg-type]
+        if len(events) < batch:
+            time.sleep(interval)
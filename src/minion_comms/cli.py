@@ -113,11 +113,13 @@ def main(ctx: click.Context, human: bool, compact: bool) -> None:
 @click.option("--model", default="")
 @click.option("--description", default="")
 @click.option("--transport", default="terminal")
+@click.option("--known-hash", default="", help="onboarding_hash you already hold — skips resending docs")
 @click.pass_context
-def register(ctx: click.Context, name: str, agent_class: str, model: str, description: str, transport: str) -> None:
+def register(ctx: click.Context, name: str, agent_class: str, model: str, description: str, transport: str,
+             known_hash: str) -> None:
     """Register an agent."""
     from minion_comms.comms import register as _register
-    _output(_register(name, agent_class, model, description, transport), ctx.obj["human"], ctx.obj["compact"])
+    _output(_register(name, agent_class, model, description, transport, known_hash), ctx.obj["human"], ctx.obj["compact"])
 
 
 @main.command()
@@ -158,11 +160,12 @@ def set_status(ctx: click.Context, agent: str, status: str) -> None:
 @click.option("--tokens-limit", default=0, type=int)
 @click.option("--hp", default=None, type=int, help="Self-reported HP 0-100 (skips daemon token counting)")
 @click.option("--files-modified", default="", help="Comma-separated files modified this turn; warns if unclaimed")
+@click.option("--files-read", default="", help="Comma-separated files read this turn; tracked for freshness")
 @click.pass_context
-def set_context(ctx: click.Context, agent: str, context: str, tokens_used: int, tokens_limit: int, hp: int | None, files_modified: str) -> None:
+def set_context(ctx: click.Context, agent: str, context: str, tokens_used: int, tokens_limit: int, hp: int | None, files_modified: str, files_read: str) -> None:
     """Update context summary and HP metrics."""
     from minion_comms.comms import set_context as _set_context
-    _output(_set_context(agent, context, tokens_used, tokens_limit, hp, files_modified), ctx.obj["human"])
+    _output(_set_context(agent, context, tokens_used, tokens_limit, hp, files_modified, files_read), ctx.obj["human"])
 
 
 @main.command()
@@ -175,14 +178,16 @@ def who(ctx: click.Context) -> None:
 
 @main.command()
 @click.option("--from", "from_agent", required=True)
-@click.option("--to", "to_agent", required=True)
+@click.option("--to", "to_agent", default="", help="Agent, comma-separated list, or 'all' for broadcast")
+@click.option("--to-class", default="", help="Multicast to every agent of this class")
+@click.option("--to-zone", default="", help="Multicast to every agent in this zone")
 @click.option("--message", required=True)
 @click.option("--cc", default="")
 @click.pass_context
-def send(ctx: click.Context, from_agent: str, to_agent: str, message: str, cc: str) -> None:
-    """Send a message to an agent (or 'all' for broadcast)."""
+def send(ctx: click.Context, from_agent: str, to_agent: str, to_class: str, to_zone: str, message: str, cc: str) -> None:
+    """Send a message to an agent, a list, a class or zone (or 'all' for broadcast)."""
     from minion_comms.comms import send as _send
-    _output(_send(from_agent, to_agent, message, cc), ctx.obj["human"])
+    _output(_send(from_agent, to_agent, message, cc, to_class=to_class, to_zone=to_zone), ctx.obj["human"])
 
 
 @main.command("check-inbox")
@@ -196,11 +201,12 @@ def check_inbox(ctx: click.Context, agent: str) -> None:
 
 @main.command("get-history")
 @click.option("--count", default=20, type=int)
+@click.option("--replica", is_flag=True, help="Read from the follower DB instead of the live one")
 @click.pass_context
-def get_history(ctx: click.Context, count: int) -> None:
+def get_history(ctx: click.Context, count: int, replica: bool) -> None:
     """Return the last N messages across all agents."""
     from minion_comms.comms import get_history as _get_history
-    _output(_get_history(count), ctx.obj["human"])
+    _output(_get_history(count, replica=replica), ctx.obj["human"])
 
 
 @main.command("purge-inbox")
@@ -266,11 +272,12 @@ def log_raid(ctx: click.Context, agent: str, entry: str, priority: str) -> None:
 @click.option("--priority", default="")
 @click.option("--count", default=20, type=int)
 @click.option("--agent", default="")
+@click.option("--replica", is_flag=True, help="Read from the follower DB instead of the live one")
 @click.pass_context
-def get_raid_log(ctx: click.Context, priority: str, count: int, agent: str) -> None:
+def get_raid_log(ctx: click.Context, priority: str, count: int, agent: str, replica: bool) -> None:
     """Read the raid log."""
     from minion_comms.warroom import get_raid_log as _get_raid_log
-    _output(_get_raid_log(priority, count, agent), ctx.obj["human"])
+    _output(_get_raid_log(priority, count, agent, replica=replica), ctx.obj["human"])
 
 
 # =========================================================================
@@ -286,13 +293,27 @@ def get_raid_log(ctx: click.Context, priority: str, count: int, agent: str) -> N
 @click.option("--blocked-by", default="")
 @click.option("--class-required", default="", help="Agent class required (e.g. coder, builder, recon)")
 @click.option("--type", "task_type", default="bugfix", help="Task flow type (default: bugfix)")
+@click.option("--priority", default=0, type=int, help="Higher is scheduled first (default: 0)")
+@click.option("--files", default="", help="Comma-separated files the task will touch")
 @click.pass_context
-def create_task(ctx: click.Context, agent: str, title: str, task_file: str, project: str, zone: str, blocked_by: str, class_required: str, task_type: str) -> None:
+def create_task(ctx: click.Context, agent: str, title: str, task_file: str, project: str, zone: str, blocked_by: str, class_required: str, task_type: str, priority: int, files: str) -> None:
     """Create a new task. Lead only."""
     from minion_comms.auth import require_class
     require_class("lead")(lambda: None)()
     from minion_comms.tasks import create_task as _create_task
-    _output(_create_task(agent, title, task_file, project, zone, blocked_by, class_required, task_type), ctx.obj["human"])
+    _output(_create_task(agent, title, task_file, project, zone, blocked_by, class_required, task_type, priority, files), ctx.obj["human"])
+
+
+@main.command("create-tasks")
+@click.option("--agent", required=True)
+@click.option("--manifest", required=True, help="YAML or JSONL file of tasks (blocked_by may reference entry keys)")
+@click.pass_context
+def create_tasks(ctx: click.Context, agent: str, manifest: str) -> None:
+    """Create many tasks from a manifest in one transaction. Lead only."""
+    from minion_comms.auth import require_class
+    require_class("lead")(lambda: None)()
+    from minion_comms.tasks import create_tasks as _create_tasks
+    _output(_create_tasks(agent, manifest), ctx.obj["human"])
 
 
 @main.command("assign-task")
@@ -376,12 +397,43 @@ def close_task(ctx: click.Context, agent: str, task_id: int) -> None:
     _output(_close_task(agent, task_id), ctx.obj["human"])
 
 
+@main.command("close-tasks")
+@click.option("--agent", required=True)
+@click.option("--ids", default="", help="Comma-separated task IDs")
+@click.option("--status", default="", help="Only tasks currently in this status")
+@click.option("--zone", default="")
+@click.option("--project", default="")
+@click.pass_context
+def close_tasks(ctx: click.Context, agent: str, ids: str, status: str, zone: str, project: str) -> None:
+    """Close every matching task in one batch. Lead only."""
+    from minion_comms.auth import require_class
+    require_class("lead")(lambda: None)()
+    from minion_comms.tasks import close_tasks as _close_tasks
+    _output(_close_tasks(agent, ids, status, zone, project), ctx.obj["human"])
+
+
+@main.command("update-tasks")
+@click.option("--agent", required=True)
+@click.option("--status", required=True, help="New status for every matching task")
+@click.option("--ids", default="", help="Comma-separated task IDs")
+@click.option("--from-status", default="", help="Only tasks currently in this status")
+@click.option("--zone", default="")
+@click.option("--project", default="")
+@click.pass_context
+def update_tasks(ctx: click.Context, agent: str, status: str, ids: str, from_status: str, zone: str, project: str) -> None:
+    """Move every matching task to a new status in one batch. Lead only."""
+    from minion_comms.auth import require_class
+    require_class("lead")(lambda: None)()
+    from minion_comms.tasks import update_tasks as _update_tasks
+    _output(_update_tasks(agent, status, ids, from_status, zone, project), ctx.obj["human"])
+
+
 @main.command("pull-task")
 @click.option("--agent", required=True)
-@click.option("--task-id", required=True, type=int)
+@click.option("--task-id", default=0, type=int, help="Task to claim (default: scheduler's next pick)")
 @click.pass_context
 def pull_task_cmd(ctx: click.Context, agent: str, task_id: int) -> None:
-    """Claim a specific task by ID."""
+    """Claim a task by ID, or the next scheduled task."""
     from minion_comms.tasks import pull_task as _pull_task
     _output(_pull_task(agent, task_id), ctx.obj["human"])
 
@@ -397,6 +449,43 @@ def complete_task_cmd(ctx: click.Context, agent: str, task_id: int, failed: bool
     _output(_complete_task(agent, task_id, passed=not failed), ctx.obj["human"])
 
 
+@main.command()
+@click.pass_context
+def conflicts(ctx: click.Context) -> None:
+    """Show active tasks whose file sets overlap or hit another agent's claims."""
+    from minion_comms.scheduler import get_conflicts
+    _output(get_conflicts(), ctx.obj["human"])
+
+
+@main.command("reclaim-tasks")
+@click.option("--agent", required=True)
+@click.pass_context
+def reclaim_tasks(ctx: click.Context, agent: str) -> None:
+    """Return tasks with lapsed claim leases to the pool. Lead only."""
+    from minion_comms.auth import require_class
+    require_class("lead")(lambda: None)()
+    from minion_comms.tasks import reclaim_expired_tasks
+    _output(reclaim_expired_tasks(agent), ctx.obj["human"])
+
+
+@main.command("reap")
+@click.option("--agent", required=True)
+@click.option("--interval", default=0, type=int, help="Seconds between sweeps (0 = sweep once)")
+@click.option("--ticks", default=0, type=int, help="Stop after N sweeps (0 = until interrupted)")
+@click.option("--dead-after", default=0, type=int, help="Silence in seconds before reaping (default 30m)")
+@click.pass_context
+def reap(ctx: click.Context, agent: str, interval: int, ticks: int, dead_after: int) -> None:
+    """Release claims and requeue tasks of silent agents, then notify the lead. Lead only."""
+    from minion_comms.auth import AGENT_DEAD_SECONDS, require_class
+    require_class("lead")(lambda: None)()
+    from minion_comms.reaper import reap_dead_agents, run_reaper
+    dead_after = dead_after or AGENT_DEAD_SECONDS
+    if interval:
+        _output(run_reaper(agent, interval, ticks, dead_after), ctx.obj["human"])
+    else:
+        _output(reap_dead_agents(agent, dead_after), ctx.obj["human"])
+
+
 @main.command()
 @click.option("--agent", required=True)
 @click.option("--interval", default=5, type=int, help="Poll interval in seconds")
@@ -420,16 +509,52 @@ def list_flows_cmd(ctx: click.Context) -> None:
     _output({"flows": available_flows()}, ctx.obj["human"])
 
 
+@main.command("flow-stats")
+@click.option("--type", "task_type", default="", help="Only this flow type")
+@click.option("--hours", default=24, type=int, help="Throughput / peak-depth window")
+@click.pass_context
+def flow_stats(ctx: click.Context, task_type: str, hours: int) -> None:
+    """Per-stage queue depth, dwell time and throughput from the flow rollups."""
+    from minion_comms.flowstats import get_flow_stats
+    _output(get_flow_stats(task_type, hours), ctx.obj["human"])
+
+
+@main.command("simulate-crew")
+@click.option("--crew", "crews", multiple=True, required=True,
+              help="class=count,... or a crew YAML name (repeat to compare)")
+@click.option("--tasks", "n_tasks", default=0, type=int, help="Synthetic backlog size (default: current open tasks)")
+@click.option("--class-required", default="coder", help="Class for synthetic / unclassed tasks")
+@click.option("--type", "task_type", default="bugfix", help="Flow type to simulate")
+@click.option("--runs", default=5, type=int, help="Runs per crew (median reported)")
+@click.option("--seed", default=0, type=int, help="Random seed")
+@click.pass_context
+def simulate_crew(ctx: click.Context, crews: tuple[str, ...], n_tasks: int, class_required: str,
+                  task_type: str, runs: int, seed: int) -> None:
+    """Simulate draining the backlog with candidate crews; report throughput and bottlenecks."""
+    from minion_comms.simulator import simulate_crews
+    _output(simulate_crews(list(crews), n_tasks, class_required, task_type, runs, seed), ctx.obj["human"])
+
+
+@main.command("compile-flows")
+@click.pass_context
+def compile_flows_cmd(ctx: click.Context) -> None:
+    """Recompile task flows into cached lookup tables and report flow errors. Lead only."""
+    from minion_comms.auth import require_class
+    require_class("lead")(lambda: None)()
+    from minion_comms.flow_bridge import compile_flows
+    _output(compile_flows(), ctx.obj["human"])
+
+
 # =========================================================================
 # File Safety (WP-05)
 # =========================================================================
 
 @main.command("claim-file")
 @click.option("--agent", required=True)
-@click.option("--file", "file_path", required=True)
+@click.option("--file", "file_path", required=True, help="File, directory (dir/ or dir/**) or glob")
 @click.pass_context
 def claim_file(ctx: click.Context, agent: str, file_path: str) -> None:
-    """Claim a file for exclusive editing."""
+    """Claim a file, directory subtree or glob for exclusive editing."""
     from minion_comms.auth import require_class
     require_class("lead", "coder", "builder")(lambda: None)()
     from minion_comms.filesafety import claim_file as _claim_file
@@ -449,6 +574,41 @@ def release_file(ctx: click.Context, agent: str, file_path: str, force: bool) ->
     _output(_release_file(agent, file_path, force), ctx.obj["human"])
 
 
+@main.command("claim-files")
+@click.option("--agent", required=True)
+@click.option("--files", required=True, help="Comma-separated files, directories or globs")
+@click.pass_context
+def claim_files(ctx: click.Context, agent: str, files: str) -> None:
+    """Claim several files at once — all or nothing."""
+    from minion_comms.auth import require_class
+    require_class("lead", "coder", "builder")(lambda: None)()
+    from minion_comms.filesafety import claim_files as _claim_files
+    _output(_claim_files(agent, files.split(",")), ctx.obj["human"])
+
+
+@main.command("release-files")
+@click.option("--agent", required=True)
+@click.option("--files", required=True, help="Comma-separated claims to release")
+@click.option("--force", is_flag=True)
+@click.pass_context
+def release_files(ctx: click.Context, agent: str, files: str, force: bool) -> None:
+    """Release several claims at once — all or nothing."""
+    from minion_comms.auth import require_class
+    require_class("lead", "coder", "builder")(lambda: None)()
+    from minion_comms.filesafety import release_files as _release_files
+    _output(_release_files(agent, files.split(","), force), ctx.obj["human"])
+
+
+@main.command("audit-edits")
+@click.option("--project-dir", default=".")
+@click.option("--agent", default="", help="Also flag edits to files claimed by others")
+@click.pass_context
+def audit_edits(ctx: click.Context, project_dir: str, agent: str) -> None:
+    """Report working-tree edits to unclaimed or foreign-claimed files (one git status pass)."""
+    from minion_comms.filesafety import audit_edits as _audit_edits
+    _output(_audit_edits(project_dir, agent), ctx.obj["human"])
+
+
 @main.command("get-claims")
 @click.option("--agent", default="")
 @click.pass_context
@@ -481,6 +641,14 @@ def check_activity(ctx: click.Context, agent: str) -> None:
     _output(_check_activity(agent), ctx.obj["human"])
 
 
+@main.command("scan-freshness")
+@click.pass_context
+def scan_freshness(ctx: click.Context) -> None:
+    """Stat every file agents have read once; mark changed reads stale in bulk."""
+    from minion_comms.freshness import scan_file_changes
+    _output(scan_file_changes(), ctx.obj["human"])
+
+
 @main.command("check-freshness")
 @click.option("--agent", required=True)
 @click.option("--files", required=True)
@@ -494,11 +662,12 @@ def check_freshness(ctx: click.Context, agent: str, files: str) -> None:
 
 
 @main.command()
+@click.option("--replica", is_flag=True, help="Read from the follower DB instead of the live one")
 @click.pass_context
-def sitrep(ctx: click.Context) -> None:
+def sitrep(ctx: click.Context, replica: bool) -> None:
     """Fused COP: agents + tasks + zones + claims + flags + recent comms."""
     from minion_comms.monitoring import sitrep as _sitrep
-    _output(_sitrep(), ctx.obj["human"])
+    _output(_sitrep(replica=replica), ctx.obj["human"])
 
 
 @main.command("update-hp")
@@ -521,11 +690,12 @@ def update_hp(ctx: click.Context, agent: str, input_tokens: int, output_tokens:
 
 @main.command("cold-start")
 @click.option("--agent", required=True)
+@click.option("--since", "since_last", is_flag=True, help="Only what changed since this agent's last cold start.")
 @click.pass_context
-def cold_start(ctx: click.Context, agent: str) -> None:
+def cold_start(ctx: click.Context, agent: str, since_last: bool) -> None:
     """Bootstrap an agent into (or back into) a session."""
     from minion_comms.lifecycle import cold_start as _cold_start
-    _output(_cold_start(agent), ctx.obj["human"], ctx.obj["compact"])
+    _output(_cold_start(agent, since_last), ctx.obj["human"], ctx.obj["compact"])
 
 
 @main.command("fenix-down")
@@ -636,6 +806,36 @@ def retire_agent_cmd(ctx: click.Context, agent: str, requesting_agent: str) -> N
     _output(_retire_agent(agent, requesting_agent), ctx.obj["human"])
 
 
+@main.command("register-process")
+@click.option("--agent", required=True)
+@click.option("--pid", default=0, type=int, help="Process to register (default: the caller's parent)")
+@click.option("--kind", type=click.Choice(["daemon", "poller"]), default="daemon")
+@click.pass_context
+def register_process_cmd(ctx: click.Context, agent: str, pid: int, kind: str) -> None:
+    """Register a daemon PID so stand-down/retire-agent can signal it directly."""
+    from minion_comms.processes import register_process
+    _output(register_process(agent, pid or os.getppid(), kind), ctx.obj["human"])
+
+
+@main.command("autoscale")
+@click.option("--agent", required=True, help="Lead running the autoscaler")
+@click.option("--crew", required=True, help="Crew whose YAML holds the autoscale policy")
+@click.option("--project-dir", default=".")
+@click.option("--interval", default=30, type=int, help="Seconds between ticks")
+@click.option("--ticks", default=0, type=int, help="Stop after N ticks (0 = until interrupted)")
+@click.option("--dry-run", is_flag=True, help="Report scaling decisions without acting")
+@click.option("--runtime", type=click.Choice(["python", "ts"]), default="python",
+              help="Daemon runtime for spawned agents.")
+@click.pass_context
+def autoscale_cmd(ctx: click.Context, agent: str, crew: str, project_dir: str, interval: int,
+                  ticks: int, dry_run: bool, runtime: str) -> None:
+    """Scale daemon agents per class with queue depth and idle time. Lead only."""
+    from minion_comms.auth import require_class
+    require_class("lead")(lambda: None)()
+    from minion_comms.crew import autoscale as _autoscale
+    _output(_autoscale(agent, crew, project_dir, interval, ticks, dry_run, runtime), ctx.obj["human"])
+
+
 @main.command("hand-off-zone")
 @click.option("--from", "from_agent", required=True)
 @click.option("--to", "to_agents", required=True, help="Comma-separated agent names")
@@ -647,25 +847,88 @@ def hand_off_zone(ctx: click.Context, from_agent: str, to_agents: str, zone: str
     _output(_hand_off(from_agent, to_agents, zone), ctx.obj["human"])
 
 
+# =========================================================================
+# Change Feed
+# =========================================================================
+
+@main.command()
+@click.option("--since", default=0, type=int, help="Return events after this sequence number")
+@click.option("--follow", is_flag=True, help="Keep streaming new events as they are committed")
+@click.option("--entity", default="", help="Only events for this entity (task, message, claim, ...)")
+@click.option("--limit", default=500, type=int, help="Max events per batch")
+@click.option("--interval", default=1.0, type=float, help="Idle poll interval for --follow (seconds)")
+def changes(since: int, follow: bool, entity: str, limit: int, interval: float) -> None:
+    """Stream change events as JSON lines."""
+    from minion_comms.changes import follow_changes, get_changes
+    if follow:
+        try:
+            for event in follow_changes(since, interval, entity, limit):
+                click.echo(json.dumps(event, default=str))
+                sys.stdout.flush()
+        except KeyboardInterrupt:
+            pass
+        return
+    page = get_changes(since, limit, entity)
+    for event in page["events"]:  # type: ignore[union-attr]
+        click.echo(json.dumps(event, default=str))
+
+
+@main.command()
+@click.option("--replica-path", default="", help="Follower DB path (default: <db>.replica.db)")
+@click.option("--follow", is_flag=True, help="Keep the follower in sync until interrupted")
+@click.option("--interval", default=2.0, type=float, help="Seconds between lag checks with --follow")
+@click.option("--pages", default=256, type=int, help="Pages copied per backup step")
+@click.pass_context
+def replicate(ctx: click.Context, replica_path: str, follow: bool, interval: float, pages: int) -> None:
+    """Copy committed state to the read replica. Lead only."""
+    from minion_comms.auth import require_class
+    require_class("lead")(lambda: None)()
+    from minion_comms.replica import run_replicator, sync_replica
+    if follow:
+        try:
+            run_replicator(replica_path, interval, pages)
+        except KeyboardInterrupt:
+            pass
+        return
+    _output(sync_replica(replica_path, pages), ctx.obj["human"])
+
+
+@main.command("replica-status")
+@click.option("--replica-path", default="")
+@click.pass_context
+def replica_status_cmd(ctx: click.Context, replica_path: str) -> None:
+    """Show how far the read replica trails the live DB."""
+    from minion_comms.replica import replica_status
+    _output(replica_status(replica_path), ctx.obj["human"])
+
+
 # =========================================================================
 # Discovery
 # =========================================================================
 
 @main.command()
 @click.option("--class", "agent_class", default="", help="Class to list tools for (default: MINION_CLASS env)")
+@click.option("--known-hash", default="", help="onboarding_hash you already hold — returns 'unchanged' if current")
 @click.pass_context
-def tools(ctx: click.Context, agent_class: str) -> None:
+def tools(ctx: click.Context, agent_class: str, known_hash: str) -> None:
     """List available tools for your class."""
     from minion_comms.auth import get_agent_class, get_tools_for_class
     cls = agent_class or get_agent_class()
-    from minion_comms.db import DOCS_DIR
+    from minion_comms.db import DOCS_DIR, onboarding_bundle
+    result: dict[str, object] = {"class": cls}
+    if known_hash:
+        # Only a hash check needs the bundle; the plain listing stays doc-free
+        bundle = onboarding_bundle(cls, known_hash)
+        if bundle.get("unchanged"):
+            _output({"class": cls, "onboarding_hash": bundle["hash"], "tools": "unchanged"}, ctx.obj["human"], ctx.obj["compact"])
+            return
+        result["onboarding_hash"] = bundle["hash"]
     docs_dir = DOCS_DIR
     protocol_file = f"protocol-{cls}.md"
-    result: dict[str, object] = {
-        "class": cls,
+    result.update({
         "tools": get_tools_for_class(cls),
         "protocol_doc": os.path.join(docs_dir, protocol_file) if os.path.isfile(os.path.join(docs_dir, protocol_file)) else None,
-    }
+    })
     _output(result, ctx.obj["human"], ctx.obj["compact"])
 
 
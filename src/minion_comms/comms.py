@@ -1,78 +1,95 @@
-"""Core Comms — register, deregister, rename, set_status, set_context,
-who, send, check_inbox, get_history, purge_inbox."""
+"""Core Comms — register, register_many, deregister, rename, set_status,
+set_context, who, send, check_inbox, get_history, purge_inbox."""
 
 from __future__ import annotations
 
 import datetime
 import json
 import os
+import sqlite3
 
-from minion_comms.auth import CLASS_MODEL_WHITELIST, VALID_CLASSES, get_tools_for_class
+from minion_comms.auth import CLASS_MODEL_WHITELIST, VALID_CLASSES
 from minion_comms.db import (
     DOCS_DIR,
+    emit_event,
     enrich_agent_row,
-    format_trigger_codebook,
     get_db,
     get_lead,
+    get_read_db,
     hp_summary,
-    load_onboarding,
     now_iso,
+    onboarding_bundle,
     scan_triggers,
     staleness_check,
 )
 from minion_comms.fs import (
     atomic_write_file,
     message_file_path,
+    multicast_file_path,
     read_content_file,
 )
 
 
+def _registration_error(agent_class: str, model: str, transport: str) -> str | None:
+    if transport not in ("terminal", "daemon", "daemon-ts"):
+        return f"Invalid transport '{transport}'. Must be 'terminal', 'daemon', or 'daemon-ts'."
+    if agent_class not in VALID_CLASSES:
+        return f"Unknown class '{agent_class}'. Valid: {', '.join(sorted(VALID_CLASSES))}"
+    allowed_models = CLASS_MODEL_WHITELIST.get(agent_class, set())
+    if allowed_models and model and model not in allowed_models:
+        return f"Model '{model}' not allowed for class '{agent_class}'. Allowed: {', '.join(sorted(allowed_models))}"
+    return None
+
+
+def _upsert_agents(cursor: sqlite3.Cursor, rows: list[tuple[str, str, str, str, str]], now: str) -> None:
+    """Insert or refresh (name, class, model, description, transport) rows in one pass."""
+    cursor.executemany(
+        """INSERT INTO agents
+            (name, agent_class, model, registered_at, last_seen, description, status, transport)
+        VALUES (?, ?, ?, ?, ?, ?, 'waiting for work', ?)
+        ON CONFLICT(name) DO UPDATE SET
+            last_seen        = excluded.last_seen,
+            agent_class      = excluded.agent_class,
+            model            = COALESCE(NULLIF(excluded.model, ''), agents.model),
+            description      = COALESCE(NULLIF(excluded.description, ''), agents.description),
+            transport        = excluded.transport,
+            status           = 'waiting for work',
+            hp_alerts_fired  = NULL
+        """,
+        [(name, cls, model or None, now, now, desc or None, transport) for name, cls, model, desc, transport in rows],
+    )
+
+    # Auto-mark old broadcasts as read
+    cutoff = (datetime.datetime.now() - datetime.timedelta(hours=1)).isoformat()
+    cursor.executemany(
+        """INSERT OR IGNORE INTO broadcast_reads (agent_name, message_id)
+           SELECT ?, id FROM messages WHERE to_agent = 'all' AND timestamp < ?""",
+        [(r[0], cutoff) for r in rows],
+    )
+
+    # Clear retire flag for re-spawned agents
+    cursor.executemany("DELETE FROM agent_retire WHERE agent_name = ?", [(r[0],) for r in rows])
+    for name, cls, _, _, transport in rows:
+        emit_event(cursor, "agent", "registered", name, name, {"agent_class": cls, "transport": transport})
+
+
 def register(
     agent_name: str,
     agent_class: str,
     model: str = "",
     description: str = "",
     transport: str = "terminal",
+    known_hash: str = "",
 ) -> dict[str, object]:
-    if transport not in ("terminal", "daemon", "daemon-ts"):
-        return {"error": f"Invalid transport '{transport}'. Must be 'terminal', 'daemon', or 'daemon-ts'."}
-    if agent_class not in VALID_CLASSES:
-        return {"error": f"Unknown class '{agent_class}'. Valid: {', '.join(sorted(VALID_CLASSES))}"}
-
-    allowed_models = CLASS_MODEL_WHITELIST.get(agent_class, set())
-    if allowed_models and model and model not in allowed_models:
-        return {"error": f"Model '{model}' not allowed for class '{agent_class}'. Allowed: {', '.join(sorted(allowed_models))}"}
+    error = _registration_error(agent_class, model, transport)
+    if error:
+        return {"error": error}
 
     conn = get_db()
     cursor = conn.cursor()
     now = now_iso()
     try:
-        cursor.execute(
-            """INSERT INTO agents
-                (name, agent_class, model, registered_at, last_seen, description, status, transport)
-            VALUES (?, ?, ?, ?, ?, ?, 'waiting for work', ?)
-            ON CONFLICT(name) DO UPDATE SET
-                last_seen        = excluded.last_seen,
-                agent_class      = excluded.agent_class,
-                model            = COALESCE(NULLIF(excluded.model, ''), agents.model),
-                description      = COALESCE(NULLIF(excluded.description, ''), agents.description),
-                transport        = excluded.transport,
-                status           = 'waiting for work',
-                hp_alerts_fired  = NULL
-            """,
-            (agent_name, agent_class, model or None, now, now, description or None, transport),
-        )
-
-        # Auto-mark old broadcasts as read
-        cutoff = (datetime.datetime.now() - datetime.timedelta(hours=1)).isoformat()
-        cursor.execute(
-            """INSERT OR IGNORE INTO broadcast_reads (agent_name, message_id)
-               SELECT ?, id FROM messages WHERE to_agent = 'all' AND timestamp < ?""",
-            (agent_name, cutoff),
-        )
-
-        # Clear retire flag for re-spawned agents
-        cursor.execute("DELETE FROM agent_retire WHERE agent_name = ?", (agent_name,))
+        _upsert_agents(cursor, [(agent_name, agent_class, model, description, transport)], now)
         conn.commit()
 
         result: dict[str, object] = {
@@ -85,12 +102,16 @@ def register(
         if description:
             result["description"] = description
 
-        onboarding = load_onboarding(agent_class)
-        if onboarding:
-            result["onboarding"] = onboarding
-
-        result["triggers"] = format_trigger_codebook()
-        result["tools"] = get_tools_for_class(agent_class)
+        # Skip the docs/codebook/tools payload if the agent already holds it
+        bundle = onboarding_bundle(agent_class, known_hash)
+        result["onboarding_hash"] = bundle["hash"]
+        if bundle.get("unchanged"):
+            result["onboarding"] = "unchanged"
+        else:
+            if bundle["onboarding"]:
+                result["onboarding"] = bundle["onboarding"]
+            result["triggers"] = bundle["triggers"]
+            result["tools"] = bundle["tools"]
         if transport == "terminal":
             result["playbook"] = {
                 "type": "terminal",
@@ -120,6 +141,43 @@ def register(
         conn.close()
 
 
+def register_many(agents: list[dict[str, str]], include_docs: bool = False) -> dict[str, object]:
+    """Register a whole crew in one transaction.
+
+    Each entry takes name and agent_class, plus optional model, description
+    and transport (default 'daemon'). All entries are validated before any
+    write; one bad entry fails the batch. The result is one compact line per
+    agent. With include_docs, each class's onboarding bundle (docs, codebook,
+    tools, hash) comes once, rather than once per agent.
+    """
+    rows: list[tuple[str, str, str, str, str]] = []
+    for a in agents:
+        name, cls = a.get("name", ""), a.get("agent_class", "")
+        model, transport = a.get("model", "") or "", a.get("transport", "daemon")
+        error = _registration_error(cls, model, transport) if name else "Missing agent name."
+        if error:
+            return {"error": f"BLOCKED: {name or '?'}: {error}"}
+        rows.append((name, cls, model, a.get("description", "") or "", transport))
+
+    conn = get_db()
+    cursor = conn.cursor()
+    try:
+        cursor.execute("BEGIN IMMEDIATE")
+        _upsert_agents(cursor, rows, now_iso())
+        conn.commit()
+    finally:
+        conn.close()
+
+    result: dict[str, object] = {
+        "status": "registered",
+        "count": len(rows),
+        "agents": [{"agent": name, "class": cls, "transport": transport} for name, cls, _, _, transport in rows],
+    }
+    if include_docs:
+        result["onboarding"] = {cls: onboarding_bundle(cls) for cls in sorted({r[1] for r in rows})}
+    return result
+
+
 def deregister(agent_name: str) -> dict[str, object]:
     conn = get_db()
     cursor = conn.cursor()
@@ -128,21 +186,19 @@ def deregister(agent_name: str) -> dict[str, object]:
         if not cursor.fetchone():
             return {"error": f"Agent '{agent_name}' not found."}
 
-        # Release file claims
-        cursor.execute("SELECT file_path FROM file_claims WHERE agent_name = ?", (agent_name,))
-        claimed_files = [row["file_path"] for row in cursor.fetchall()]
-        waitlist_notes: list[str] = []
-        for fp in claimed_files:
-            cursor.execute("DELETE FROM file_claims WHERE file_path = ?", (fp,))
-            cursor.execute(
-                "SELECT agent_name FROM file_waitlist WHERE file_path = ? ORDER BY added_at ASC LIMIT 1",
-                (fp,),
-            )
-            waiter = cursor.fetchone()
-            if waiter:
-                waitlist_notes.append(f"{fp} -> {waiter['agent_name']} waiting")
+        # Release file claims, handing each to the head of its waitlist
+        from minion_comms.filesafety import release_claims
+
         cursor.execute("DELETE FROM file_waitlist WHERE agent_name = ?", (agent_name,))
+        cursor.execute("SELECT * FROM file_claims WHERE agent_name = ?", (agent_name,))
+        claims = cursor.fetchall()
+        claimed_files = [row["file_path"] for row in claims]
+        promoted, _ = release_claims(cursor, agent_name, claims) if claims else ({}, {})
+        waitlist_notes = [f"{fp} -> {waiter} claimed" for fp, waiter in promoted.items()]
+        cursor.execute("DELETE FROM agent_files_read WHERE agent_name = ?", (agent_name,))
         cursor.execute("DELETE FROM agents WHERE name = ?", (agent_name,))
+        emit_event(cursor, "agent", "deregistered", agent_name, agent_name,
+                   {"released_claims": claimed_files})
         conn.commit()
 
         result: dict[str, object] = {
@@ -173,6 +229,9 @@ def rename(old_name: str, new_name: str) -> dict[str, object]:
         cursor.execute("UPDATE messages SET to_agent = ? WHERE to_agent = ?", (new_name, old_name))
         cursor.execute("UPDATE messages SET cc_original_to = ? WHERE cc_original_to = ?", (new_name, old_name))
         cursor.execute("UPDATE broadcast_reads SET agent_name = ? WHERE agent_name = ?", (new_name, old_name))
+        cursor.execute("UPDATE agent_files_read SET agent_name = ? WHERE agent_name = ?", (new_name, old_name))
+        cursor.execute("UPDATE agent_processes SET agent_name = ? WHERE agent_name = ?", (new_name, old_name))
+        emit_event(cursor, "agent", "renamed", new_name, new_name, {"old": old_name})
         conn.commit()
         return {"status": "renamed", "old": old_name, "new": new_name}
     finally:
@@ -183,10 +242,12 @@ def set_status(agent_name: str, status: str) -> dict[str, object]:
     conn = get_db()
     now = now_iso()
     try:
-        conn.execute(
+        cursor = conn.cursor()
+        cursor.execute(
             "UPDATE agents SET status = ?, last_seen = ? WHERE name = ?",
             (status, now, agent_name),
         )
+        emit_event(cursor, "agent", "status", agent_name, agent_name, {"status": status})
         conn.commit()
         return {"status": "ok", "agent": agent_name, "new_status": status}
     finally:
@@ -200,6 +261,7 @@ def set_context(
     tokens_limit: int = 0,
     hp: int | None = None,
     files_modified: str = "",
+    files_read: str = "",
 ) -> dict[str, object]:
     conn = get_db()
     now = now_iso()
@@ -228,6 +290,13 @@ def set_context(
                    WHERE name = ?""",
                 (context, now, now, agent_name),
             )
+        emit_event(conn.cursor(), "agent", "context", agent_name, agent_name,
+                   {"context": context, "hp": hp})
+        from minion_comms.filesafety import renew_claims
+        renew_claims(conn.cursor(), agent_name)
+        if files_read:
+            from minion_comms.freshness import record_reads
+            record_reads(conn.cursor(), agent_name, files_read)
         conn.commit()
 
         result: dict[str, object] = {"status": "ok", "agent": agent_name, "context": context}
@@ -241,21 +310,11 @@ def set_context(
 
         # Warn if agent reports modifying files they haven't claimed
         if files_modified:
-            import os
-            from minion_comms.db import get_db as _get_db
-            conn2 = _get_db()
+            from minion_comms.filesafety import unclaimed_by
+            conn2 = get_read_db()
             try:
-                unclaimed = []
-                for f in files_modified.split(","):
-                    f = f.strip()
-                    if not f:
-                        continue
-                    normalized = os.path.abspath(f)
-                    row = conn2.execute(
-                        "SELECT agent_name FROM file_claims WHERE file_path = ?", (normalized,)
-                    ).fetchone()
-                    if not row or row["agent_name"] != agent_name:
-                        unclaimed.append(f)
+                files = [f.strip() for f in files_modified.split(",") if f.strip()]
+                unclaimed = unclaimed_by(conn2.cursor(), agent_name, files)
                 if unclaimed:
                     result["unclaimed_files"] = unclaimed
                     result["claim_warning"] = (
@@ -271,26 +330,78 @@ def set_context(
 
 
 def who() -> dict[str, object]:
-    conn = get_db()
+    conn = get_read_db()
     cursor = conn.cursor()
     now = datetime.datetime.now()
     try:
         cursor.execute("SELECT * FROM agents ORDER BY last_seen DESC")
         agents = [enrich_agent_row(row, now) for row in cursor.fetchall()]
+        from minion_comms.freshness import attach_stale_reads
+        attach_stale_reads(cursor, agents)
         return {"agents": agents}
     finally:
         conn.close()
 
 
+def _resolve_recipients(
+    cursor: sqlite3.Cursor,
+    from_agent: str,
+    to_agent: str,
+    to_class: str,
+    to_zone: str,
+) -> tuple[list[str], str | None]:
+    """Resolve a send target into delivery recipients.
+
+    Returns (recipients, group_target). group_target is None for a single
+    direct send, otherwise a label like 'class:coder', 'zone:src/auth' or
+    'list:a,b' recorded on every delivery row. Class and zone targets skip
+    reaped agents; explicit names are always delivered.
+    """
+    from minion_comms.reaper import ALIVE_SQL
+
+    explicit = [a.strip() for a in to_agent.split(",") if a.strip()] if to_agent else []
+    if not to_class and not to_zone and len(explicit) == 1:
+        return explicit, None
+
+    recipients: list[str] = list(explicit)
+    labels: list[str] = []
+    if explicit:
+        labels.append("list:" + ",".join(explicit))
+    if to_class:
+        cursor.execute(
+            f"SELECT name FROM agents WHERE agent_class = ? AND name != ? AND {ALIVE_SQL} ORDER BY name",
+            (to_class, from_agent),
+        )
+        recipients.extend(row["name"] for row in cursor.fetchall())
+        labels.append(f"class:{to_class}")
+    if to_zone:
+        cursor.execute(
+            f"SELECT name FROM agents WHERE current_zone = ? AND name != ? AND {ALIVE_SQL} ORDER BY name",
+            (to_zone, from_agent),
+        )
+        recipients.extend(row["name"] for row in cursor.fetchall())
+        labels.append(f"zone:{to_zone}")
+
+    # De-duplicate, preserving order
+    unique = list(dict.fromkeys(recipients))
+    return unique, " ".join(labels)
+
+
 def send(
     from_agent: str,
     to_agent: str,
     message: str,
     cc: str = "",
+    to_class: str = "",
+    to_zone: str = "",
 ) -> dict[str, object]:
     # Normalize broadcast alias
     if to_agent == "broadcast":
         to_agent = "all"
+    if not to_agent and not to_class and not to_zone:
+        return {"error": "No recipient. Pass --to, --to-class, or --to-zone."}
+    if to_agent == "all" and (to_class or to_zone):
+        return {"error": "Broadcast (--to all) cannot be combined with --to-class or --to-zone."}
 
     conn = get_db()
     cursor = conn.cursor()
@@ -325,42 +436,52 @@ def send(
         if is_stale:
             return {"error": stale_msg}
 
+        recipients, group_target = _resolve_recipients(cursor, from_agent, to_agent, to_class, to_zone)
+        if not recipients:
+            return {"error": f"No agents match target '{group_target}'."}
+
         # Auto-register unknown senders
         cursor.execute(
             "INSERT OR IGNORE INTO agents (name, agent_class, registered_at, last_seen) VALUES (?, 'coder', ?, ?)",
             (from_agent, now, now),
         )
 
-        # Write message body to filesystem
-        content_file = message_file_path(to_agent, from_agent)
+        # Write message body to filesystem once — every delivery row points at it
+        if group_target is None:
+            content_file = message_file_path(recipients[0], from_agent)
+        else:
+            content_file = multicast_file_path(from_agent, group_target)
         atomic_write_file(content_file, message)
 
-        # Insert metadata into DB
-        cursor.execute(
-            "INSERT INTO messages (from_agent, to_agent, content_file, timestamp, read_flag, is_cc) VALUES (?, ?, ?, ?, 0, 0)",
-            (from_agent, to_agent, content_file, now),
-        )
-
         # Build CC list: explicit + auto-CC lead
         cc_agents = [a.strip() for a in cc.split(",") if a.strip()] if cc else []
 
         lead_name = get_lead(cursor)
-        if lead_name and from_agent != lead_name and to_agent != lead_name and lead_name not in cc_agents:
+        if lead_name and from_agent != lead_name and lead_name not in recipients and lead_name not in cc_agents:
             cc_agents.append(lead_name)
-
-        for cc_agent in cc_agents:
-            if cc_agent != to_agent:
-                cc_file = message_file_path(cc_agent, from_agent, "cc")
-                atomic_write_file(cc_file, message)
-                cursor.execute(
-                    """INSERT INTO messages
-                       (from_agent, to_agent, content_file, timestamp, read_flag, is_cc, cc_original_to)
-                       VALUES (?, ?, ?, ?, 0, 1, ?)""",
-                    (from_agent, cc_agent, cc_file, now, to_agent),
-                )
+        cc_agents = [a for a in cc_agents if a not in recipients]
+
+        target_label = recipients[0] if group_target is None else group_target
+        deliveries: list[tuple[object, ...]] = [
+            (from_agent, r, content_file, now, 0, None, group_target) for r in recipients
+        ]
+        deliveries.extend(
+            (from_agent, a, content_file, now, 1, target_label, group_target) for a in cc_agents
+        )
+        cursor.executemany(
+            """INSERT INTO messages
+               (from_agent, to_agent, content_file, timestamp, read_flag, is_cc, cc_original_to, group_target)
+               VALUES (?, ?, ?, ?, 0, ?, ?, ?)""",
+            deliveries,
+        )
 
         # Update sender's last_seen
         cursor.execute("UPDATE agents SET last_seen = ? WHERE name = ?", (now, from_agent))
+        emit_event(cursor, "message", "sent", content_file, from_agent, {
+            "to": recipients[0] if group_target is None else group_target,
+            "recipients": recipients,
+            "cc": cc_agents,
+        })
 
         # Trigger word detection
         triggers_found = scan_triggers(message)
@@ -372,6 +493,7 @@ def send(
                    ON CONFLICT(key) DO UPDATE SET value = '1', set_by = excluded.set_by, set_at = excluded.set_at""",
                 (from_agent, now),
             )
+            emit_event(cursor, "flag", "set", "moon_crash", from_agent)
 
         if "stand_down" in triggers_found:
             cursor.execute(
@@ -380,14 +502,17 @@ def send(
                    ON CONFLICT(key) DO UPDATE SET value = '1', set_by = excluded.set_by, set_at = excluded.set_at""",
                 (from_agent, now),
             )
+            emit_event(cursor, "flag", "set", "stand_down", from_agent)
 
         conn.commit()
 
         result: dict[str, object] = {
             "status": "sent",
             "from": from_agent,
-            "to": to_agent,
+            "to": target_label,
         }
+        if group_target is not None:
+            result["recipients"] = recipients
         if cc_agents:
             result["cc"] = cc_agents
         if triggers_found:
@@ -398,13 +523,13 @@ def send(
         sender_row = cursor.fetchone()
         if sender_row and sender_row["transport"] == "terminal":
             result["reminder"] = "Ensure 'minion poll' is running so you don't miss replies."
-        if sender_row and sender_row["agent_class"] == "lead" and to_agent != "all":
+        if sender_row and sender_row["agent_class"] == "lead" and group_target is None and target_label != "all":
             cursor.execute(
                 "SELECT COUNT(*) FROM tasks WHERE assigned_to = ? AND status IN ('open', 'assigned', 'in_progress')",
-                (to_agent,),
+                (target_label,),
             )
             if cursor.fetchone()[0] == 0:
-                result["nudge"] = f"No open task found for {to_agent} — create one with `create-task`"
+                result["nudge"] = f"No open task found for {target_label} — create one with `create-task`"
 
         # Artifact nudge: large messages with no file path reference likely contain inline artifacts
         _FILE_PATH_SIGNALS = (".minion-comms/", ".md\n", ".md ", ".md\t", ".md'", '.md"')
@@ -456,6 +581,9 @@ def check_inbox(agent_name: str) -> dict[str, object]:
                 (agent_name, msg["id"]),
             )
 
+        if direct_msgs or broadcast_msgs:
+            emit_event(cursor, "message", "read", None, agent_name,
+                       {"ids": [m["id"] for m in direct_msgs + broadcast_msgs]})
         conn.commit()
 
         all_messages = direct_msgs + broadcast_msgs
@@ -489,15 +617,26 @@ def check_inbox(agent_name: str) -> dict[str, object]:
         conn.close()
 
 
-def get_history(count: int = 20) -> dict[str, object]:
-    conn = get_db()
+def get_history(count: int = 20, replica: bool = False) -> dict[str, object]:
+    replica_info: dict[str, object] = {}
+    if replica:
+        from minion_comms.replica import get_replica_db
+        replica_conn, replica_info = get_replica_db()
+        if replica_conn is None:
+            return replica_info
+        conn = replica_conn
+    else:
+        conn = get_read_db()
     cursor = conn.cursor()
     try:
         cursor.execute("SELECT * FROM messages ORDER BY timestamp DESC LIMIT ?", (count,))
         msgs = [dict(row) for row in cursor.fetchall()]
         for msg in msgs:
             msg["content"] = read_content_file(msg.get("content_file"))
-        return {"messages": msgs[::-1]}
+        result: dict[str, object] = {"messages": msgs[::-1]}
+        if replica:
+            result["replica"] = replica_info
+        return result
     finally:
         conn.close()
 
@@ -526,6 +665,8 @@ def purge_inbox(agent_name: str, older_than_hours: int = 2) -> dict[str, object]
                AND message_id NOT IN (SELECT id FROM messages)""",
             (agent_name,),
         )
+        emit_event(cursor, "message", "purged", None, agent_name,
+                   {"deleted_direct": deleted, "older_than_hours": older_than_hours})
         conn.commit()
 
         return {
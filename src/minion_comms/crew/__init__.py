@@ -1,10 +1,12 @@
-"""Crew — spawn, stand down, retire, hand off."""
+"""Crew — spawn, stand down, retire, hand off, autoscale."""
 
+from minion_comms.crew.autoscale import autoscale
 from minion_comms.crew.spawn import list_crews, spawn_party
 from minion_comms.crew.stand_down import retire_agent, stand_down
 from minion_comms.crew.hand_off import hand_off_zone
 
 __all__ = [
+    "autoscale",
     "hand_off_zone",
     "list_crews",
     "retire_agent",
@@ -148,32 +148,45 @@ def _short_model(model: str, provider: str = "") -> str:
     return ""
 
 
-def style_pane(tmux_session: str, pane_idx: int, agent: str, role: str, model: str = "", provider: str = "") -> None:
-    """Set pane title and class color."""
+def run_tmux_batch(cmds: list[list[str]]) -> subprocess.CompletedProcess[str]:
+    """Run tmux commands in one client invocation, chained with ';'.
+
+    tmux stops at the first failing command, so a non-zero return means
+    everything before it took effect and nothing after it did.
+    """
+    argv = ["tmux"]
+    for i, cmd in enumerate(cmds):
+        if i:
+            argv.append(";")
+        argv.extend(cmd)
+    return subprocess.run(argv, capture_output=True, text=True)
+
+
+def style_cmds(tmux_session: str, pane_idx: int, agent: str, role: str, model: str = "", provider: str = "") -> list[list[str]]:
+    """tmux commands that set a pane's title and class color."""
     color = CLASS_COLORS.get(role, "colour7")
     base_title = f"{agent}({role})" if role else agent
     short = _short_model(model, provider)
     pane_title = f"{base_title} {short}" if short else base_title
     pane_target = f"{tmux_session}:{0}.{pane_idx}"
+    return [
+        ["select-pane", "-t", pane_target, "-T", pane_title],
+        ["set-option", "-p", "-t", pane_target, "@cc", color],
+    ]
+
 
-    subprocess.run([
-        "tmux", "select-pane", "-t", pane_target, "-T", pane_title,
-    ], capture_output=True)
-    subprocess.run([
-        "tmux", "set-option", "-p", "-t", pane_target, "@cc", color,
-    ], capture_output=True)
+def style_pane(tmux_session: str, pane_idx: int, agent: str, role: str, model: str = "", provider: str = "") -> None:
+    """Set pane title and class color."""
+    run_tmux_batch(style_cmds(tmux_session, pane_idx, agent, role, model, provider))
 
 
 def finalize_layout(tmux_session: str, is_new: bool, pane_count: int = 1) -> None:
     """Apply tiled layout, border colors, and open terminal if new."""
-    subprocess.run(["tmux", "select-layout", "-t", tmux_session, "tiled"],
-                   capture_output=True)
-    subprocess.run(["tmux", "set-option", "-t", tmux_session,
-                    "pane-border-status", "top"], capture_output=True)
-    subprocess.run([
-        "tmux", "set-option", "-t", tmux_session, "pane-border-format",
-        "#[fg=#{@cc}] #{pane_title} #[default]",
-    ], capture_output=True)
+    run_tmux_batch([
+        ["select-layout", "-t", tmux_session, "tiled"],
+        ["set-option", "-t", tmux_session, "pane-border-status", "top"],
+        ["set-option", "-t", tmux_session, "pane-border-format", "#[fg=#{@cc}] #{pane_title} #[default]"],
+    ])
 
     if is_new:
         open_tmux_terminal(tmux_session, pane_count)
@@ -0,0 +1,315 @@
+"""Autoscale — grow and shrink a crew's daemon roster with its task queue.
+
+Policy lives in the crew YAML:
+
+    autoscale:
+      up_per_agent: 2          # scale up while claimable tasks > 2 per agent
+      down_idle_seconds: 600   # an agent idle this long may be retired
+      sustain_ticks: 3         # condition must hold this many ticks in a row
+      cooldown_seconds: 300    # min gap between actions on one class
+      classes:
+        coder: {min: 1, max: 4, template: ba}
+
+Each tick observes claimable depth per class (scheduler.claimable_depth)
+and each daemon's idle time, then moves at most one agent per class.
+Scale-up clones the template agent's config under a fresh name and goes
+through the same spawn_pane/start_swarm path as spawn_party; scale-down
+goes through retire_agent, preferring agents the autoscaler added.
+Between the two thresholds nothing happens — together with the sustain
+and cooldown rules this keeps the roster from flapping.
+"""
+
+from __future__ import annotations
+
+import datetime
+import os
+import re
+import shutil
+import subprocess
+import time
+from dataclasses import dataclass, field
+from typing import Any
+
+from minion_comms.db import get_db, get_read_db, now_iso
+from minion_comms.crew.daemon import spawn_pane, start_swarm
+from minion_comms.crew.spawn import find_crew_file, role_to_class
+
+DEFAULT_UP_PER_AGENT = 2
+DEFAULT_DOWN_IDLE_SECONDS = 600
+DEFAULT_SUSTAIN_TICKS = 3
+DEFAULT_COOLDOWN_SECONDS = 300
+
+
+@dataclass
+class ScaleState:
+    """Hysteresis bookkeeping carried between ticks."""
+    up_streak: dict[str, int] = field(default_factory=dict)
+    down_streak: dict[str, int] = field(default_factory=dict)
+    last_action: dict[str, float] = field(default_factory=dict)
+
+
+# -- Policy --
+
+def load_policy(crew: str, project_dir: str = ".") -> dict[str, Any] | str:
+    """Read the autoscale section of a crew YAML. Error string on failure."""
+    import yaml
+
+    crew_file = find_crew_file(crew, project_dir)
+    if not crew_file:
+        return f"BLOCKED: Crew '{crew}' not found."
+    with open(crew_file) as f:
+        cfg: dict[str, Any] = yaml.safe_load(f) or {}
+    section: dict[str, Any] = cfg.get("autoscale") or {}
+    scaled: dict[str, dict[str, Any]] = section.get("classes") or {}
+    if not scaled:
+        return f"BLOCKED: Crew '{crew}' has no autoscale.classes section."
+
+    roster: dict[str, dict[str, Any]] = cfg.get("agents") or {}
+    classes: dict[str, dict[str, Any]] = {}
+    for cls, limits in scaled.items():
+        members = [n for n, c in roster.items() if role_to_class(str(c.get("role", ""))) == cls]
+        template = str(limits.get("template") or (members[0] if members else ""))
+        if template not in roster:
+            return f"BLOCKED: autoscale.{cls} needs a template agent from the roster."
+        lo, hi = int(limits.get("min", 0)), int(limits.get("max", len(members)))
+        if lo > hi:
+            return f"BLOCKED: autoscale.{cls} min ({lo}) exceeds max ({hi})."
+        classes[cls] = {"min": lo, "max": hi, "template": template}
+
+    return {
+        "crew": crew,
+        "roster": roster,
+        "up_per_agent": section.get("up_per_agent", DEFAULT_UP_PER_AGENT),
+        "down_idle_seconds": section.get("down_idle_seconds", DEFAULT_DOWN_IDLE_SECONDS),
+        "sustain_ticks": section.get("sustain_ticks", DEFAULT_SUSTAIN_TICKS),
+        "cooldown_seconds": section.get("cooldown_seconds", DEFAULT_COOLDOWN_SECONDS),
+        "classes": classes,
+    }
+
+
+# -- Observe --
+
+def observe(policy: dict[str, Any]) -> dict[str, dict[str, Any]]:
+    """Claimable depth and live daemon agents (with idle seconds) per scaled class."""
+    from minion_comms.flow_bridge import active_statuses
+    from minion_comms.scheduler import claimable_depth
+
+    actives = active_statuses()
+    now = datetime.datetime.now()
+    conn = get_read_db()
+    cursor = conn.cursor()
+    try:
+        depth = claimable_depth(cursor)
+        cursor.execute(
+            f"""SELECT a.name, a.agent_class, a.spawned_from,
+                       COALESCE((SELECT MAX(h.timestamp) FROM task_history h WHERE h.agent = a.name),
+                                a.registered_at) AS last_work,
+                       (SELECT COUNT(*) FROM tasks t WHERE t.assigned_to = a.name
+                        AND t.status IN ({','.join('?' for _ in actives)})) AS inflight
+                FROM agents a WHERE a.transport != 'terminal'""",
+            actives,
+        )
+        agents = cursor.fetchall()
+    finally:
+        conn.close()
+
+    tag = f"autoscale:{policy['crew']}"
+    observed: dict[str, dict[str, Any]] = {
+        cls: {"depth": depth.get(cls, 0), "agents": [], "idle": []} for cls in policy["classes"]
+    }
+    for a in agents:
+        cls = a["agent_class"]
+        if cls not in observed or (a["name"] not in policy["roster"] and a["spawned_from"] != tag):
+            continue
+        observed[cls]["agents"].append(a["name"])
+        if not a["inflight"] and a["last_work"]:
+            idle = (now - datetime.datetime.fromisoformat(a["last_work"])).total_seconds()
+            observed[cls]["idle"].append({"agent": a["name"], "seconds": idle, "scaled": a["spawned_from"] == tag})
+    return observed
+
+
+# -- Decide --
+
+def decide(
+    policy: dict[str, Any],
+    observed: dict[str, dict[str, Any]],
+    state: ScaleState,
+    now: float,
+) -> list[dict[str, Any]]:
+    """One scaling step per class, or nothing. Mutates `state`."""
+    actions: list[dict[str, Any]] = []
+    for cls, limits in sorted(policy["classes"].items()):
+        obs = observed[cls]
+        count, depth = len(obs["agents"]), obs["depth"]
+        cooling = now - state.last_action.get(cls, float("-inf")) < policy["cooldown_seconds"]
+
+        if count < limits["min"]:
+            # A clone that is still starting up hasn't registered yet — wait
+            # out the cooldown rather than spawning another every tick.
+            if not cooling:
+                actions.append({"action": "spawn", "class": cls, "reason": f"{count} below min {limits['min']}"})
+                state.last_action[cls] = now
+            continue
+
+        idle = sorted(
+            (i for i in obs["idle"] if i["seconds"] >= policy["down_idle_seconds"]),
+            key=lambda i: (not i["scaled"], -i["seconds"]),
+        )
+        want_up = count < limits["max"] and depth > policy["up_per_agent"] * max(count, 1)
+        want_down = count > limits["min"] and depth == 0 and bool(idle)
+        state.up_streak[cls] = state.up_streak.get(cls, 0) + 1 if want_up else 0
+        state.down_streak[cls] = state.down_streak.get(cls, 0) + 1 if want_down else 0
+
+        if cooling:
+            continue
+        if state.up_streak[cls] >= policy["sustain_ticks"]:
+            actions.append({"action": "spawn", "class": cls, "reason": f"{depth} claimable for {count} agents"})
+        elif state.down_streak[cls] >= policy["sustain_ticks"]:
+            actions.append({
+                "action": "retire", "class": cls, "agent": idle[0]["agent"],
+                "reason": f"idle {int(idle[0]['seconds'])}s with empty queue",
+            })
+        else:
+            continue
+        state.up_streak[cls] = state.down_streak[cls] = 0
+        state.last_action[cls] = now
+    return actions
+
+
+# -- Act --
+
+def _next_name(template: str) -> str:
+    conn = get_read_db()
+    try:
+        taken = {r[0] for r in conn.execute("SELECT name FROM agents WHERE name LIKE ?", (f"{template}%",))}
+    finally:
+        conn.close()
+    n = 2
+    while f"{template}{n}" in taken:
+        n += 1
+    return f"{template}{n}"
+
+
+def _drop_from_config(crew_config: str, name: str) -> None:
+    """Remove a clone from the minion-swarm runtime config."""
+    import yaml
+
+    if not os.path.isfile(crew_config):
+        return
+    with open(crew_config) as f:
+        swarm_cfg: dict[str, Any] = yaml.safe_load(f) or {}
+    agents: dict[str, Any] = swarm_cfg.get("agents") or {}
+    if agents.pop(name, None) is not None:
+        with open(crew_config, "w") as f:
+            yaml.dump(swarm_cfg, f, default_flow_style=False)
+
+
+def _spawn_clone(policy: dict[str, Any], cls: str, project_dir: str, runtime: str) -> dict[str, Any]:
+    """Clone the class template under a new name and start it as a daemon."""
+    import yaml
+
+    from minion_comms.comms import deregister, register
+
+    template = policy["classes"][cls]["template"]
+    name = _next_name(template)
+    cfg = dict(policy["roster"][template])
+    if "system" in cfg:
+        cfg["system"] = re.sub(rf"\b{re.escape(template)}\b", name, cfg["system"])
+
+    # spawn_party writes the minion-swarm runtime config; add the clone to it
+    crew = policy["crew"]
+    crew_config = os.path.expanduser(f"~/.minion-swarm/{crew}.yaml")
+    if not os.path.isfile(crew_config):
+        return {"error": f"BLOCKED: Crew '{crew}' has no runtime config. spawn-party first."}
+    with open(crew_config) as f:
+        swarm_cfg: dict[str, Any] = yaml.safe_load(f) or {}
+    swarm_cfg.setdefault("agents", {})[name] = cfg
+    with open(crew_config, "w") as f:
+        yaml.dump(swarm_cfg, f, default_flow_style=False)
+
+    transport = cfg.get("transport", "daemon")
+    result = register(name, cls, model=cfg.get("model", ""), transport=transport)
+    if "error" in result:
+        _drop_from_config(crew_config, name)
+        return result
+    conn = get_db()
+    try:
+        conn.execute("UPDATE agents SET spawned_from = ? WHERE name = ?", (f"autoscale:{crew}", name))
+        conn.commit()
+    finally:
+        conn.close()
+
+    tmux_session = f"crew-{crew}"
+    session_exists = subprocess.run(["tmux", "has-session", "-t", tmux_session], capture_output=True).returncode == 0
+    try:
+        pane_error = spawn_pane(tmux_session, name, project_dir, crew_config, session_exists)
+    except subprocess.CalledProcessError as e:
+        pane_error = (e.stderr or str(e)).strip()
+    if pane_error is not None:
+        # Roll back so the clone doesn't linger as a registered agent with no daemon
+        deregister(name)
+        _drop_from_config(crew_config, name)
+        return {"error": f"BLOCKED: No pane for {name}: {pane_error}"}
+    agent_runtime = "ts" if transport == "daemon-ts" else runtime
+    start_swarm(name, crew_config, project_dir, runtime=agent_runtime)
+    return {"agent": name}
+
+
+def autoscale(
+    agent_name: str,
+    crew: str,
+    project_dir: str = ".",
+    interval: int = 30,
+    ticks: int = 0,
+    dry_run: bool = False,
+    runtime: str = "python",
+) -> dict[str, object]:
+    """Run the autoscaler loop. ticks=0 runs until interrupted."""
+    from minion_comms.crew.stand_down import retire_agent
+
+    conn = get_read_db()
+    try:
+        row = conn.execute("SELECT agent_class FROM agents WHERE name = ?", (agent_name,)).fetchone()
+    finally:
+        conn.close()
+    if not row:
+        return {"error": f"BLOCKED: Agent '{agent_name}' not registered."}
+    if row["agent_class"] != "lead":
+        return {"error": f"BLOCKED: Only lead-class agents can autoscale. '{agent_name}' is '{row['agent_class']}'."}
+    if not dry_run and not (shutil.which("tmux") and shutil.which("minion-swarm")):
+        return {"error": "BLOCKED: tmux and minion-swarm required (or pass --dry-run)."}
+
+    policy = load_policy(crew, project_dir)
+    if isinstance(policy, str):
+        return {"error": policy}
+    project_dir = os.path.abspath(project_dir)
+
+    state = ScaleState()
+    log: list[dict[str, Any]] = []
+    tick = 0
+    try:
+        while not ticks or tick < ticks:
+            if tick:
+                time.sleep(interval)
+            tick += 1
+            observed = observe(policy)
+            for action in decide(policy, observed, state, time.monotonic()):
+                action["at"] = now_iso()
+                if not dry_run:
+                    if action["action"] == "spawn":
+                        action.update(_spawn_clone(policy, action["class"], project_dir, runtime))
+                    else:
+                        action.update(retire_agent(action["agent"], agent_name))
+                        if "error" not in action and action["agent"] not in policy["roster"]:
+                            _drop_from_config(os.path.expanduser(f"~/.minion-swarm/{crew}.yaml"), action["agent"])
+                log.append(action)
+    except KeyboardInterrupt:
+        pass
+
+    return {
+        "crew": crew,
+        "ticks": tick,
+        "dry_run": dry_run,
+        "actions": log,
+        "roster": {cls: obs["agents"] for cls, obs in observe(policy).items()},
+    }
@@ -5,6 +5,30 @@ from __future__ import annotations
 import os
 import subprocess
 
+from minion_comms.crew._tmux import run_tmux_batch, style_cmds, style_pane
+
+
+def _pane_command(agent: str, project_dir: str) -> str:
+    log_file = os.path.join(project_dir, ".minion-swarm", "logs", f"{agent}.log")
+    os.makedirs(os.path.dirname(log_file), exist_ok=True)
+    open(log_file, "a").close()
+    return f"tail -f {log_file}"
+
+
+def _open_pane_cmds(tmux_session: str, agent: str, pane_cmd: str, session_exists: bool) -> list[list[str]]:
+    if not session_exists:
+        return [[
+            "new-session", "-d",
+            "-s", tmux_session, "-n", agent,
+            "-x", "220", "-y", "50",
+            "bash", "-c", pane_cmd,
+        ]]
+    # Rebalance layout before splitting so tmux has room for the new pane
+    return [
+        ["select-layout", "-t", tmux_session, "tiled"],
+        ["split-window", "-t", tmux_session, "bash", "-c", pane_cmd],
+    ]
+
 
 def spawn_pane(
     tmux_session: str,
@@ -12,36 +36,57 @@ def spawn_pane(
     project_dir: str,
     crew_config: str,
     session_exists: bool,
-) -> bool:
+) -> str | None:
     """Create a tmux pane tailing the agent's log file.
 
-    Returns True if pane was created, False if it didn't fit.
+    Returns None if the pane was created, else tmux's error (e.g. it didn't fit).
     """
-    log_file = os.path.join(project_dir, ".minion-swarm", "logs", f"{agent}.log")
-    os.makedirs(os.path.dirname(log_file), exist_ok=True)
-    open(log_file, "a").close()
-    pane_cmd = f"tail -f {log_file}"
+    cmds = _open_pane_cmds(tmux_session, agent, _pane_command(agent, project_dir), session_exists)
+    result = run_tmux_batch(cmds)
+    if result.returncode != 0:
+        if not session_exists:
+            raise subprocess.CalledProcessError(result.returncode, cmds[0], result.stdout, result.stderr)
+        return result.stderr.strip()
+    return None
 
-    if not session_exists:
-        subprocess.run([
-            "tmux", "new-session", "-d",
-            "-s", tmux_session, "-n", agent,
-            "-x", "220", "-y", "50",
-            "bash", "-c", pane_cmd,
-        ], check=True)
-    else:
-        # Rebalance layout before splitting so tmux has room for the new pane
-        subprocess.run(
-            ["tmux", "select-layout", "-t", tmux_session, "tiled"],
-            capture_output=True,
-        )
-        result = subprocess.run([
-            "tmux", "split-window", "-t", tmux_session,
-            "bash", "-c", pane_cmd,
-        ], capture_output=True, text=True)
-        if result.returncode != 0:
-            return result.stderr.strip()
-    return True
+
+def spawn_panes(
+    tmux_session: str,
+    agents: list[dict[str, str]],
+    project_dir: str,
+    session_exists: bool,
+    first_idx: int = 0,
+) -> tuple[list[str], dict[str, str]]:
+    """Create and style one log pane per agent in a single tmux invocation.
+
+    `agents` are dicts with name, role, model, provider. If a split doesn't
+    fit, the batch stops there; the panes that were made are kept and the
+    rest go one at a time, so one oversized crew only costs a few extra
+    calls. Returns (names given a pane, {name: error}).
+    """
+    cmds: list[list[str]] = []
+    exists = session_exists
+    for i, a in enumerate(agents):
+        cmds.extend(_open_pane_cmds(tmux_session, a["name"], _pane_command(a["name"], project_dir), exists))
+        cmds.extend(style_cmds(tmux_session, first_idx + i, a["name"], a.get("role", ""), a.get("model", ""), a.get("provider", "")))
+        exists = True
+    if not cmds or run_tmux_batch(cmds).returncode == 0:
+        return [a["name"] for a in agents], {}
+
+    listed = subprocess.run(["tmux", "list-panes", "-t", tmux_session], capture_output=True, text=True)
+    made = len(listed.stdout.strip().splitlines()) - first_idx if listed.returncode == 0 else 0
+    spawned = [a["name"] for a in agents[:made]]
+    failed: dict[str, str] = {}
+    pane_idx = first_idx + made
+    for a in agents[made:]:
+        error = spawn_pane(tmux_session, a["name"], project_dir, "", session_exists or pane_idx > 0)
+        if error is not None:
+            failed[a["name"]] = error
+            continue
+        style_pane(tmux_session, pane_idx, a["name"], a.get("role", ""), a.get("model", ""), a.get("provider", ""))
+        spawned.append(a["name"])
+        pane_idx += 1
+    return spawned, failed
 
 
 def _find_ts_daemon_dir() -> str:
@@ -70,7 +115,7 @@ def start_swarm(agent: str, crew_config: str, project_dir: str, runtime: str = "
         log_fp = open(log_file, "a")
         env = {**os.environ, "MINION_CLASS": "lead"}
         env.pop("CLAUDECODE", None)
-        subprocess.Popen(
+        proc = subprocess.Popen(
             ["npx", "tsx", "src/main.ts", "--config", crew_config, "--agent", agent],
             cwd=_find_ts_daemon_dir(),
             stdin=subprocess.DEVNULL,
@@ -80,6 +125,8 @@ def start_swarm(agent: str, crew_config: str, project_dir: str, runtime: str = "
             env=env,
         )
         log_fp.close()
+        from minion_comms.processes import register_process
+        register_process(agent, proc.pid, kind="daemon")
     else:
         subprocess.run(
             ["minion-swarm", "start", agent, "--config", crew_config],
@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from minion_comms.db import get_db, now_iso
+from minion_comms.db import emit_event, get_db, now_iso
 
 
 def hand_off_zone(
@@ -51,6 +51,8 @@ def hand_off_zone(
                VALUES (?, ?, 'high', ?)""",
             (from_agent, entry_file, now),
         )
+        emit_event(cursor, "raid_log", "logged", cursor.lastrowid, from_agent, {"priority": "high", "entry_file": entry_file})
+        emit_event(cursor, "agent", "zone_handoff", from_agent, from_agent, {"to": targets, "zone": zone})
 
         conn.commit()
 
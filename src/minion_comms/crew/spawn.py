@@ -5,21 +5,21 @@ from __future__ import annotations
 import os
 import shutil
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
 
 from minion_comms.db import get_db
-from minion_comms.crew._tmux import (
-    finalize_layout,
-    kill_all_crews,
-    style_pane,
-)
-from minion_comms.crew.daemon import spawn_pane, start_swarm
+from minion_comms.crew._tmux import finalize_layout, kill_all_crews
+from minion_comms.crew.daemon import spawn_panes, start_swarm
 from minion_comms.crew.terminal import spawn_terminal
 
+# Concurrent `minion-swarm start` calls while spawning a crew
+MAX_PARALLEL_STARTS = 8
+
 CREW_SEARCH_PATHS = [
     os.path.expanduser("~/.minion-swarm/crews"),
     os.path.expanduser("~/.minion-swarm"),
-    # Project-local crews/ checked at spawn time via _find_crew_file
+    # Project-local crews/ checked at spawn time via find_crew_file
 ]
 
 # Try bundled crews from minion-swarm package
@@ -41,7 +41,8 @@ def _all_search_paths(project_dir: str = ".") -> list[str]:
     return paths
 
 
-def _find_crew_file(crew_name: str, project_dir: str = ".") -> str | None:
+def find_crew_file(crew_name: str, project_dir: str = ".") -> str | None:
+    """Path of `<crew_name>.yaml` in the first search path that has it."""
     for d in _all_search_paths(project_dir):
         candidate = os.path.join(d, f"{crew_name}.yaml")
         if os.path.isfile(candidate):
@@ -49,7 +50,7 @@ def _find_crew_file(crew_name: str, project_dir: str = ".") -> str | None:
     return None
 
 
-def _role_to_class(role: str) -> str:
+def role_to_class(role: str) -> str:
     """Map crew YAML role to agent class for registration."""
     return role if role in ("lead", "coder", "builder", "oracle", "recon") else "coder"
 
@@ -100,7 +101,7 @@ def spawn_party(
     if not shutil.which("minion-swarm"):
         return {"error": "BLOCKED: minion-swarm required."}
 
-    crew_file = _find_crew_file(crew, project_dir)
+    crew_file = find_crew_file(crew, project_dir)
     if not crew_file:
         available: list[str] = []
         for d in CREW_SEARCH_PATHS:
@@ -178,7 +179,7 @@ def spawn_party(
         kill_all_crews()
 
     # --- Auto-register all agents, clear flags ---
-    from minion_comms.comms import register as _register
+    from minion_comms.comms import register_many as _register_many
 
     conn = get_db()
     try:
@@ -192,19 +193,25 @@ def spawn_party(
     finally:
         conn.close()
 
-    for name in all_agent_names:
-        cfg = all_agents_cfg[name]
-        transport = cfg.get("transport", "daemon")
-        # Skip terminal agents already registered — they're alive, don't clobber
-        if transport == "terminal" and name in registered:
-            continue
-        _register(
-            agent_name=name,
-            agent_class=_role_to_class(cfg.get("role", "coder")),
-            model=cfg.get("model", ""),
-            transport=transport,
-        )
-        registered.add(name)
+    # Skip terminal agents already registered — they're alive, don't clobber
+    to_register = [
+        name for name in all_agent_names
+        if not (all_agents_cfg[name].get("transport", "daemon") == "terminal" and name in registered)
+    ]
+    registered.update(to_register)
+
+    # One transaction for the whole crew, overlapping the tmux work;
+    # daemons start only once it's done
+    registrar = ThreadPoolExecutor(max_workers=1)
+    registration = registrar.submit(_register_many, [
+        {
+            "name": name,
+            "agent_class": role_to_class(all_agents_cfg[name].get("role", "coder")),
+            "model": all_agents_cfg[name].get("model", ""),
+            "transport": all_agents_cfg[name].get("transport", "daemon"),
+        }
+        for name in to_register
+    ])
 
     # --- Name deconfliction for agents already registered by other crews ---
     spawn_agents: list[str] = []
@@ -272,42 +279,30 @@ def spawn_party(
         if result.returncode == 0:
             existing_panes = len(result.stdout.strip().splitlines())
 
-    pane_idx = existing_panes
-    failed_agents: dict[str, str] = {}
-    spawned_agents: list[str] = []
+    spawned: set[str] = set()
+    pane_agents: list[dict[str, str]] = []
     for agent in spawn_agents:
         cfg = resolved_cfgs.get(agent, {})
-        transport = cfg.get("transport", "daemon")
-
-        if transport == "terminal":
+        if cfg.get("transport", "daemon") == "terminal":
             if agent in registered:
                 # Already alive in a terminal session — skip spawning
                 continue
             spawn_terminal(agent, project_dir, cfg)
-            spawned_agents.append(agent)
-            continue
-
-        result = spawn_pane(tmux_session, agent, project_dir, crew_config, session_exists)
-        if result is not True:
-            failed_agents[agent] = result if isinstance(result, str) else "unknown error"
+            spawned.add(agent)
             continue
-        session_exists = True
-        spawned_agents.append(agent)
-
-        style_pane(tmux_session, pane_idx, agent, agent_roles.get(agent, ""), model=resolved_cfgs.get(agent, {}).get("model", ""), provider=resolved_cfgs.get(agent, {}).get("provider", ""))
-        pane_idx += 1
-
-    finalize_layout(tmux_session, is_new, pane_count=pane_idx)
-
-    # Start daemons — per-agent runtime from transport, global --runtime as fallback
-    import time
-    daemon_list = [
-        a for a in spawned_agents
-        if resolved_cfgs.get(a, {}).get("transport", "daemon") != "terminal"
-    ]
-    for i, agent in enumerate(daemon_list):
-        if i > 0:
-            time.sleep(0.25)
+        pane_agents.append({
+            "name": agent, "role": agent_roles.get(agent, ""),
+            "model": cfg.get("model", ""), "provider": cfg.get("provider", ""),
+        })
+
+    # Every daemon pane plus its styling goes to tmux as one command batch
+    paned, failed_agents = spawn_panes(tmux_session, pane_agents, project_dir, session_exists, existing_panes)
+    spawned.update(paned)
+    spawned_agents = [a for a in spawn_agents if a in spawned]
+    finalize_layout(tmux_session, is_new, pane_count=existing_panes + len(paned))
+
+    # Start daemons in parallel — per-agent runtime from transport, global --runtime as fallback
+    def _start(agent: str) -> None:
         transport = resolved_cfgs.get(agent, {}).get("transport", "daemon")
         if transport == "daemon-ts":
             agent_runtime = "ts"
@@ -317,6 +312,18 @@ def spawn_party(
             agent_runtime = "python"
         start_swarm(agent, crew_config, project_dir, runtime=agent_runtime)
 
+    registered_result = registration.result()
+    registrar.shutdown()
+    if "error" in registered_result:
+        failed_agents.update({a: registered_result["error"] for a in to_register})
+    daemon_list = [
+        a for a in spawned_agents
+        if resolved_cfgs.get(a, {}).get("transport", "daemon") != "terminal" and a not in failed_agents
+    ]
+    if daemon_list:
+        with ThreadPoolExecutor(max_workers=min(len(daemon_list), MAX_PARALLEL_STARTS)) as pool:
+            list(pool.map(_start, daemon_list))
+
     result_dict: dict[str, object] = {
         "status": "spawned",
         "agents": spawned_agents,
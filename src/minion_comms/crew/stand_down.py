@@ -1,13 +1,32 @@
-"""Stand down and retire — crew dismissal and individual agent retirement."""
+"""Stand down and retire — crew dismissal and individual agent retirement.
+
+Both set their DB flag first (pollers that are between signals still see
+it), then SIGTERM the registered daemon/poller processes through the
+process registry so shutdown doesn't wait for the next poll. The
+minion-swarm / tmux teardown always runs as well: python-runtime daemons
+(`minion-swarm start`) never register a PID, and stopping one that was
+already signalled is a no-op.
+"""
 
 from __future__ import annotations
 
 import os
 import subprocess
+from typing import Any
 
 from minion_comms.comms import deregister
-from minion_comms.db import get_db, now_iso
+from minion_comms.db import emit_event, get_db, now_iso
 from minion_comms.crew._tmux import close_terminal_by_title, kill_all_crews, kill_tmux_pane_by_title
+from minion_comms.processes import signal_agents
+
+
+def _crew_agents(config_path: str) -> list[str]:
+    import yaml
+
+    with open(config_path) as f:
+        cfg: dict[str, Any] = yaml.safe_load(f) or {}
+    agents: dict[str, Any] = cfg.get("agents") or {}
+    return list(agents)
 
 
 def stand_down(agent_name: str, crew: str = "") -> dict[str, object]:
@@ -28,21 +47,25 @@ def stand_down(agent_name: str, crew: str = "") -> dict[str, object]:
                ON CONFLICT(key) DO UPDATE SET value = '1', set_by = excluded.set_by, set_at = excluded.set_at""",
             (agent_name, now),
         )
+        emit_event(cursor, "flag", "set", "stand_down", agent_name)
         conn.commit()
     finally:
         conn.close()
 
     if crew:
         config_path = os.path.expanduser(f"~/.minion-swarm/{crew}.yaml")
+        names = _crew_agents(config_path) if os.path.isfile(config_path) else []
+        signalled = signal_agents(names, agent_name, exclude=(agent_name,))
         if os.path.isfile(config_path):
             subprocess.run(["minion-swarm", "stop", "--config", config_path], capture_output=True)
         close_terminal_by_title(f"workers:crew-{crew}")
         close_terminal_by_title(f"lead:")
         subprocess.run(["tmux", "kill-session", "-t", f"crew-{crew}"], capture_output=True)
-        return {"status": "dismissed", "crew": crew}
+        return {"status": "dismissed", "crew": crew, "processes": signalled}
     else:
+        signalled = signal_agents(None, agent_name, exclude=(agent_name,))
         kill_all_crews()
-        return {"status": "dismissed", "crew": "all"}
+        return {"status": "dismissed", "crew": "all", "processes": signalled}
 
 
 def retire_agent(agent_name: str, requesting_agent: str) -> dict[str, object]:
@@ -63,11 +86,13 @@ def retire_agent(agent_name: str, requesting_agent: str) -> dict[str, object]:
                ON CONFLICT(agent_name) DO UPDATE SET set_at = excluded.set_at, set_by = excluded.set_by""",
             (agent_name, now, requesting_agent),
         )
+        emit_event(cursor, "agent", "retired", agent_name, requesting_agent)
         conn.commit()
     finally:
         conn.close()
 
+    signalled = signal_agents([agent_name], requesting_agent)
     deregister(agent_name)
     kill_tmux_pane_by_title(agent_name)
 
-    return {"status": "retired", "agent": agent_name, "by": requesting_agent}
+    return {"status": "retired", "agent": agent_name, "by": requesting_agent, "processes": signalled}
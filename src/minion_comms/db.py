@@ -13,11 +13,19 @@ v2 schema changes from v1:
 from __future__ import annotations
 
 import datetime
+import hashlib
+import json
 import os
 import sqlite3
 from typing import Any
 
-from minion_comms.auth import CLASS_STALENESS_SECONDS, TRIGGER_WORDS
+from minion_comms.auth import (
+    CLAIM_LEASE_SECONDS,
+    CLASS_STALENESS_SECONDS,
+    TASK_LEASE_SECONDS,
+    TRIGGER_WORDS,
+    get_tools_for_class,
+)
 from minion_comms.defaults import resolve_db_path, resolve_docs_dir
 
 # ---------------------------------------------------------------------------
@@ -43,6 +51,23 @@ def get_db() -> sqlite3.Connection:
     return conn
 
 
+def get_read_db(path: str = "") -> sqlite3.Connection:
+    """Open a read-only connection pinned to one snapshot.
+
+    mode=ro + query_only, no journal-mode round trip. The explicit BEGIN
+    holds a single WAL snapshot until close, so multi-query readers never
+    see a half-applied write and never take the write lock.
+    """
+    path = path or DB_PATH
+    if not os.path.exists(path):
+        return get_db()
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True, timeout=5, isolation_level=None)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA query_only=ON")
+    conn.execute("BEGIN")
+    return conn
+
+
 # ---------------------------------------------------------------------------
 # Schema
 # ---------------------------------------------------------------------------
@@ -70,7 +95,9 @@ CREATE TABLE IF NOT EXISTS agents (
     hp_turn_output      INTEGER DEFAULT NULL,
     hp_updated_at       TEXT DEFAULT NULL,
     files_read          TEXT DEFAULT NULL,
-    hp_alerts_fired     TEXT DEFAULT NULL
+    hp_alerts_fired     TEXT DEFAULT NULL,
+    reaped_at           TEXT DEFAULT NULL,
+    briefing_version    INTEGER DEFAULT NULL
 );
 
 CREATE TABLE IF NOT EXISTS messages (
@@ -81,7 +108,8 @@ CREATE TABLE IF NOT EXISTS messages (
     timestamp       TEXT,
     read_flag       INTEGER DEFAULT 0,
     is_cc           INTEGER DEFAULT 0,
-    cc_original_to  TEXT DEFAULT NULL
+    cc_original_to  TEXT DEFAULT NULL,
+    group_target    TEXT DEFAULT NULL
 );
 
 CREATE TABLE IF NOT EXISTS broadcast_reads (
@@ -123,14 +151,110 @@ CREATE TABLE IF NOT EXISTS tasks (
     task_type       TEXT DEFAULT 'bugfix',
     activity_count  INTEGER NOT NULL DEFAULT 0,
     result_file     TEXT DEFAULT NULL,
+    lease_expires_at TEXT DEFAULT NULL,
+    priority        INTEGER NOT NULL DEFAULT 0,
+    status_entered_at TEXT DEFAULT NULL,
     created_at      TEXT NOT NULL,
     updated_at      TEXT NOT NULL
 );
 
+CREATE TABLE IF NOT EXISTS task_dependencies (
+    task_id     INTEGER NOT NULL,
+    blocker_id  INTEGER NOT NULL,
+    PRIMARY KEY (task_id, blocker_id)
+);
+
+-- Flow rollups, maintained by flowstats.record_transitions on every transition
+CREATE TABLE IF NOT EXISTS flow_stage_stats (
+    task_type       TEXT NOT NULL,
+    status          TEXT NOT NULL,
+    entered         INTEGER NOT NULL DEFAULT 0,
+    exited          INTEGER NOT NULL DEFAULT 0,
+    dwell_count     INTEGER NOT NULL DEFAULT 0,
+    dwell_total     REAL NOT NULL DEFAULT 0,
+    dwell_max       REAL NOT NULL DEFAULT 0,
+    PRIMARY KEY (task_type, status)
+);
+
+CREATE TABLE IF NOT EXISTS flow_stage_hourly (
+    task_type       TEXT NOT NULL,
+    status          TEXT NOT NULL,
+    hour            TEXT NOT NULL,
+    peak_depth      INTEGER NOT NULL DEFAULT 0,
+    last_depth      INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (task_type, status, hour)
+);
+
+CREATE TABLE IF NOT EXISTS flow_throughput (
+    task_type       TEXT NOT NULL,
+    status          TEXT NOT NULL,
+    agent_class     TEXT NOT NULL,
+    hour            TEXT NOT NULL,
+    exits           INTEGER NOT NULL DEFAULT 0,
+    dwell_total     REAL NOT NULL DEFAULT 0,
+    PRIMARY KEY (task_type, status, agent_class, hour)
+);
+
+CREATE TABLE IF NOT EXISTS task_files (
+    task_id     INTEGER NOT NULL,
+    file_path   TEXT NOT NULL,
+    PRIMARY KEY (task_id, file_path)
+);
+
+-- file_path is an exact file, a directory ending in '/' (kind 'dir', the
+-- whole subtree) or a glob (kind 'glob'). prefix is the file itself or the
+-- wildcard-free directory the claim lives under — the key conflict checks
+-- probe with each ancestor of the file being claimed.
 CREATE TABLE IF NOT EXISTS file_claims (
     file_path   TEXT PRIMARY KEY,
     agent_name  TEXT NOT NULL,
-    claimed_at  TEXT NOT NULL
+    claimed_at  TEXT NOT NULL,
+    kind        TEXT NOT NULL DEFAULT 'file',
+    prefix      TEXT NOT NULL DEFAULT '',
+    expires_at  TEXT DEFAULT NULL
+);
+
+-- Reverse index of reads: stat at read time, flipped stale by freshness.scan_file_changes
+CREATE TABLE IF NOT EXISTS agent_files_read (
+    agent_name  TEXT NOT NULL,
+    file_path   TEXT NOT NULL,
+    mtime_ns    INTEGER,
+    size        INTEGER,
+    read_at     TEXT NOT NULL,
+    stale       INTEGER NOT NULL DEFAULT 0,
+    content_hash TEXT DEFAULT NULL,
+    PRIMARY KEY (agent_name, file_path)
+);
+
+-- Daemon / poller PIDs for direct signalling. start_token is the kernel
+-- start time, so a recycled PID never matches a stale row.
+CREATE TABLE IF NOT EXISTS agent_processes (
+    pid           INTEGER PRIMARY KEY,
+    agent_name    TEXT NOT NULL,
+    kind          TEXT NOT NULL DEFAULT 'poller',
+    start_token   TEXT NOT NULL,
+    registered_at TEXT NOT NULL
+);
+
+-- Onboarding bundle per class, valid while doc_key (doc stats plus
+-- codebook/tool-list digest) matches — lets a known hash be confirmed, or
+-- the bundle served from body, without reading the docs.
+CREATE TABLE IF NOT EXISTS onboarding_bundles (
+    agent_class TEXT PRIMARY KEY,
+    doc_key     TEXT NOT NULL,
+    hash        TEXT NOT NULL,
+    built_at    TEXT NOT NULL,
+    body        TEXT DEFAULT NULL
+);
+
+-- Content hash cache: a file is only re-read when (size, mtime_ns) moves.
+-- changed_at advances only when the hash does, so touch/checkout doesn't count.
+CREATE TABLE IF NOT EXISTS file_hashes (
+    file_path   TEXT PRIMARY KEY,
+    size        INTEGER NOT NULL,
+    mtime_ns    INTEGER NOT NULL,
+    hash        TEXT NOT NULL,
+    changed_at  TEXT NOT NULL
 );
 
 CREATE TABLE IF NOT EXISTS file_waitlist (
@@ -171,14 +295,99 @@ CREATE TABLE IF NOT EXISTS task_history (
     agent       TEXT NOT NULL,
     timestamp   TEXT NOT NULL
 );
+
+CREATE TABLE IF NOT EXISTS events (
+    seq         INTEGER PRIMARY KEY AUTOINCREMENT,
+    entity      TEXT NOT NULL,
+    action      TEXT NOT NULL,
+    entity_id   TEXT DEFAULT NULL,
+    agent       TEXT DEFAULT NULL,
+    data        TEXT DEFAULT NULL,
+    created_at  TEXT NOT NULL
+);
+
+-- Cold-start briefing, materialized. version is bumped by trg_briefing_version
+-- on every event that changes the plan, raid log, tasks or roster; body is
+-- rebuilt lazily when built_version falls behind it.
+CREATE TABLE IF NOT EXISTS briefing_snapshot (
+    id              INTEGER PRIMARY KEY CHECK (id = 1),
+    version         INTEGER NOT NULL DEFAULT 0,
+    built_version   INTEGER DEFAULT NULL,
+    plan_key        TEXT DEFAULT NULL,
+    body            TEXT DEFAULT NULL,
+    built_at        TEXT DEFAULT NULL
+);
+INSERT OR IGNORE INTO briefing_snapshot (id, version) VALUES (1, 0);
+"""
+
+# Events that change what cold_start briefs. Agent events are limited to
+# roster changes — cold_start/heartbeat-style events must not invalidate.
+BRIEFING_EVENT_FILTER = (
+    "entity IN ('battle_plan', 'raid_log', 'task', 'session')"
+    " OR (entity = 'agent' AND action IN ('registered', 'deregistered', 'renamed', 'status', 'reaped'))"
+)
+
+_TRIGGER_SQL = f"""
+DROP TRIGGER IF EXISTS trg_briefing_version;
+CREATE TRIGGER trg_briefing_version AFTER INSERT ON events
+WHEN {BRIEFING_EVENT_FILTER.replace("entity", "NEW.entity").replace("action", "NEW.action")}
+BEGIN
+    UPDATE briefing_snapshot SET version = NEW.seq WHERE id = 1;
+END;
+"""
+
+# Indexes run after _migrate so they can reference migrated columns.
+_INDEX_SQL = """
+CREATE INDEX IF NOT EXISTS idx_agents_class ON agents(agent_class);
+CREATE INDEX IF NOT EXISTS idx_agents_zone ON agents(current_zone);
+CREATE INDEX IF NOT EXISTS idx_agents_last_seen ON agents(last_seen);
+CREATE INDEX IF NOT EXISTS idx_messages_to_unread ON messages(to_agent, read_flag);
+CREATE INDEX IF NOT EXISTS idx_events_entity_seq ON events(entity, seq);
+CREATE INDEX IF NOT EXISTS idx_tasks_lease ON tasks(lease_expires_at);
+CREATE INDEX IF NOT EXISTS idx_tasks_assigned ON tasks(assigned_to, status);
+CREATE INDEX IF NOT EXISTS idx_tasks_queue ON tasks(status, class_required, priority DESC, created_at);
+CREATE INDEX IF NOT EXISTS idx_task_deps_blocker ON task_dependencies(blocker_id);
+CREATE INDEX IF NOT EXISTS idx_task_files_path ON task_files(file_path);
+CREATE INDEX IF NOT EXISTS idx_tasks_status_entered ON tasks(status, status_entered_at);
+CREATE INDEX IF NOT EXISTS idx_task_history_agent ON task_history(agent, timestamp);
+CREATE INDEX IF NOT EXISTS idx_file_claims_prefix ON file_claims(prefix);
+CREATE INDEX IF NOT EXISTS idx_file_claims_expiry ON file_claims(expires_at);
+CREATE INDEX IF NOT EXISTS idx_file_claims_agent ON file_claims(agent_name);
+CREATE INDEX IF NOT EXISTS idx_files_read_path ON agent_files_read(file_path, stale);
+CREATE INDEX IF NOT EXISTS idx_files_read_stale ON agent_files_read(stale, agent_name);
+CREATE INDEX IF NOT EXISTS idx_agent_processes_agent ON agent_processes(agent_name);
 """
 
 
+# Bump whenever _SCHEMA_SQL, _migrate, _INDEX_SQL or _TRIGGER_SQL change
+SCHEMA_VERSION = 15
+
+
+def _schema_current() -> bool:
+    """True if the DB exists and was initialized at SCHEMA_VERSION."""
+    if not os.path.exists(DB_PATH):
+        return False
+    conn = get_read_db()
+    try:
+        return conn.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION
+    finally:
+        conn.close()
+
+
 def init_db() -> None:
-    """Create all tables if they don't exist."""
+    """Create all tables and indexes if they don't exist.
+
+    Skipped (read-only check) when the schema is already current, so
+    query-only CLI calls never open a read/write connection.
+    """
+    if _schema_current():
+        return
     conn = get_db()
     conn.executescript(_SCHEMA_SQL)
     _migrate(conn)
+    conn.executescript(_INDEX_SQL)
+    conn.executescript(_TRIGGER_SQL)
+    conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
     conn.close()
 
 
@@ -191,10 +400,18 @@ def _migrate(conn: sqlite3.Connection) -> None:
         ("hp_turn_input", "INTEGER DEFAULT NULL"),
         ("hp_turn_output", "INTEGER DEFAULT NULL"),
         ("hp_alerts_fired", "TEXT DEFAULT NULL"),
+        ("reaped_at", "TEXT DEFAULT NULL"),
+        ("briefing_version", "INTEGER DEFAULT NULL"),
     ]:
         if col not in agent_cols:
             conn.execute(f"ALTER TABLE agents ADD COLUMN {col} {typedef}")
 
+    # Messages table migrations
+    cursor = conn.execute("PRAGMA table_info(messages)")
+    message_cols = {row["name"] for row in cursor.fetchall()}
+    if "group_target" not in message_cols:
+        conn.execute("ALTER TABLE messages ADD COLUMN group_target TEXT DEFAULT NULL")
+
     # Tasks table migrations
     cursor = conn.execute("PRAGMA table_info(tasks)")
     task_cols = {row["name"] for row in cursor.fetchall()}
@@ -204,6 +421,55 @@ def _migrate(conn: sqlite3.Connection) -> None:
     ]:
         if col not in task_cols:
             conn.execute(f"ALTER TABLE tasks ADD COLUMN {col} {typedef}")
+    if "lease_expires_at" not in task_cols:
+        conn.execute("ALTER TABLE tasks ADD COLUMN lease_expires_at TEXT DEFAULT NULL")
+        # Existing claims get a fresh lease rather than being reclaimed on upgrade
+        conn.execute(
+            "UPDATE tasks SET lease_expires_at = ? WHERE assigned_to IS NOT NULL",
+            (lease_expiry(),),
+        )
+    if "priority" not in task_cols:
+        conn.execute("ALTER TABLE tasks ADD COLUMN priority INTEGER NOT NULL DEFAULT 0")
+        # blocked_by CSV predates task_dependencies — backfill the edge table
+        for row in conn.execute("SELECT id, blocked_by FROM tasks WHERE blocked_by IS NOT NULL").fetchall():
+            conn.executemany(
+                "INSERT OR IGNORE INTO task_dependencies (task_id, blocker_id) VALUES (?, ?)",
+                [(row["id"], int(b)) for b in row["blocked_by"].split(",") if b.strip().isdigit()],
+            )
+    if "status_entered_at" not in task_cols:
+        conn.execute("ALTER TABLE tasks ADD COLUMN status_entered_at TEXT DEFAULT NULL")
+        conn.execute("UPDATE tasks SET status_entered_at = updated_at")
+        # Seed rollups with current occupancy so queue depth starts out right
+        conn.execute(
+            """INSERT OR IGNORE INTO flow_stage_stats (task_type, status, entered)
+               SELECT COALESCE(task_type, 'bugfix'), status, COUNT(*) FROM tasks
+               GROUP BY COALESCE(task_type, 'bugfix'), status"""
+        )
+    # File claims: exact paths only before directory/glob claims
+    cursor = conn.execute("PRAGMA table_info(file_claims)")
+    claim_cols = {row["name"] for row in cursor.fetchall()}
+    if "kind" not in claim_cols:
+        conn.execute("ALTER TABLE file_claims ADD COLUMN kind TEXT NOT NULL DEFAULT 'file'")
+        conn.execute("ALTER TABLE file_claims ADD COLUMN prefix TEXT NOT NULL DEFAULT ''")
+        conn.execute("UPDATE file_claims SET prefix = file_path")
+    if "expires_at" not in claim_cols:
+        conn.execute("ALTER TABLE file_claims ADD COLUMN expires_at TEXT DEFAULT NULL")
+        conn.execute("UPDATE file_claims SET expires_at = ?", (lease_expiry(CLAIM_LEASE_SECONDS),))
+
+    cursor = conn.execute("PRAGMA table_info(agent_files_read)")
+    if "content_hash" not in {row["name"] for row in cursor.fetchall()}:
+        conn.execute("ALTER TABLE agent_files_read ADD COLUMN content_hash TEXT DEFAULT NULL")
+
+    cursor = conn.execute("PRAGMA table_info(onboarding_bundles)")
+    if "body" not in {row["name"] for row in cursor.fetchall()}:
+        conn.execute("ALTER TABLE onboarding_bundles ADD COLUMN body TEXT DEFAULT NULL")
+
+    # files CSV predates task_files — backfill once (INSERT OR IGNORE keeps it idempotent)
+    for row in conn.execute("SELECT id, files FROM tasks WHERE files IS NOT NULL").fetchall():
+        conn.executemany(
+            "INSERT OR IGNORE INTO task_files (task_id, file_path) VALUES (?, ?)",
+            [(row["id"], p) for p in split_file_list(row["files"])],
+        )
 
     conn.commit()
 
@@ -217,6 +483,44 @@ def now_iso() -> str:
     return datetime.datetime.now().isoformat()
 
 
+def split_file_list(files: str) -> list[str]:
+    """Parse a comma-separated file list into sorted, de-duplicated absolute paths."""
+    return sorted({os.path.abspath(f.strip()) for f in files.split(",") if f.strip()})
+
+
+def lease_expiry(seconds: int = TASK_LEASE_SECONDS) -> str:
+    """ISO timestamp `seconds` from now — comparable with now_iso() strings."""
+    return (datetime.datetime.now() + datetime.timedelta(seconds=seconds)).isoformat()
+
+
+def emit_event(
+    cursor: sqlite3.Cursor,
+    entity: str,
+    action: str,
+    entity_id: object = None,
+    agent: str | None = None,
+    data: dict[str, Any] | None = None,
+) -> int:
+    """Append a change to the events outbox. Returns its sequence number.
+
+    Call inside the mutating transaction so the event commits (or rolls
+    back) together with the change it describes.
+    """
+    cursor.execute(
+        """INSERT INTO events (entity, action, entity_id, agent, data, created_at)
+           VALUES (?, ?, ?, ?, ?, ?)""",
+        (
+            entity,
+            action,
+            None if entity_id is None else str(entity_id),
+            agent,
+            json.dumps(data, default=str) if data else None,
+            now_iso(),
+        ),
+    )
+    return cursor.lastrowid or 0
+
+
 def get_lead(cursor: sqlite3.Cursor) -> str | None:
     """Return the name of the first registered lead agent, or None."""
     cursor.execute("SELECT name FROM agents WHERE agent_class = 'lead' LIMIT 1")
@@ -367,3 +671,72 @@ def load_onboarding(agent_class: str) -> str:
                 parts.append(f.read())
 
     return "\n\n---\n\n".join(parts) if parts else ""
+
+
+# (DOCS_DIR, class) -> (doc_key, bundle); lives as long as the process
+_bundle_memo: dict[tuple[str, str], tuple[str, dict[str, Any]]] = {}
+
+
+def _onboarding_doc_key(agent_class: str) -> str:
+    """Stat of each onboarding doc plus a digest of the in-code codebook and tools."""
+    parts = [DOCS_DIR]
+    names = ["protocol-common.md"] + ([f"protocol-{agent_class}.md"] if agent_class else [])
+    for name in names:
+        try:
+            st = os.stat(os.path.join(DOCS_DIR, name))
+            parts.append(f"{st.st_mtime_ns}:{st.st_size}")
+        except OSError:
+            parts.append("-")
+    static = json.dumps([format_trigger_codebook(), get_tools_for_class(agent_class)])
+    parts.append(hashlib.blake2b(static.encode(), digest_size=8).hexdigest())
+    return "|".join(parts)
+
+
+def onboarding_bundle(agent_class: str, known_hash: str = "") -> dict[str, Any]:
+    """Onboarding docs, trigger codebook and tool list for a class, with a content hash.
+
+    Returns {"hash", "unchanged": True} when `known_hash` is still current,
+    otherwise the full bundle: {"hash", "onboarding", "triggers", "tools"}.
+    While the doc stats match, the bundle comes from the process memo or
+    the onboarding_bundles row; the docs are only read when they changed.
+    """
+    doc_key = _onboarding_doc_key(agent_class)
+    memo = _bundle_memo.get((DOCS_DIR, agent_class))
+    if memo and memo[0] == doc_key:
+        bundle = memo[1]
+    else:
+        conn = get_read_db()
+        try:
+            row = conn.execute(
+                "SELECT doc_key, hash, body FROM onboarding_bundles WHERE agent_class = ?", (agent_class,),
+            ).fetchone()
+        finally:
+            conn.close()
+        if row and row["doc_key"] == doc_key and row["body"]:
+            bundle = {"hash": row["hash"], **json.loads(row["body"])}
+        else:
+            content = {
+                "onboarding": load_onboarding(agent_class),
+                "triggers": format_trigger_codebook(),
+                "tools": get_tools_for_class(agent_class),
+            }
+            body = json.dumps(content, sort_keys=True)
+            bundle = {"hash": hashlib.blake2b(body.encode(), digest_size=8).hexdigest(), **content}
+            conn = get_db()
+            try:
+                conn.execute(
+                    """INSERT INTO onboarding_bundles (agent_class, doc_key, hash, built_at, body)
+                       VALUES (?, ?, ?, ?, ?)
+                       ON CONFLICT (agent_class) DO UPDATE SET
+                           doc_key = excluded.doc_key, hash = excluded.hash,
+                           built_at = excluded.built_at, body = excluded.body""",
+                    (agent_class, doc_key, bundle["hash"], now_iso(), body),
+                )
+                conn.commit()
+            finally:
+                conn.close()
+        _bundle_memo[(DOCS_DIR, agent_class)] = (doc_key, bundle)
+
+    if known_hash and known_hash == bundle["hash"]:
+        return {"hash": known_hash, "unchanged": True}
+    return bundle
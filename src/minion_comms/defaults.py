@@ -13,6 +13,8 @@ import os
 # ---------------------------------------------------------------------------
 
 ENV_DB_PATH = "MINION_COMMS_DB_PATH"
+ENV_REPLICA_PATH = "MINION_COMMS_REPLICA_PATH"
+ENV_FLOW_CACHE = "MINION_FLOW_CACHE"
 ENV_DOCS_DIR = "MINION_DOCS_DIR"
 ENV_PROJECT = "MINION_PROJECT"
 ENV_CLASS = "MINION_CLASS"
@@ -23,6 +25,7 @@ ENV_CLASS = "MINION_CLASS"
 
 WORK_ROOT = "~/.minion_work"
 DEFAULT_DOCS_DIR = "~/.minion_work/docs"
+DEFAULT_FLOW_CACHE = "~/.minion_work/flow-cache.json"
 
 # Project-local directory for intel, traps, code maps
 COMMS_DIR_NAME = ".minion-comms"
@@ -42,6 +45,20 @@ def resolve_db_path() -> str:
     return os.path.expanduser(f"{WORK_ROOT}/{project}/minion.db")
 
 
+def resolve_replica_path(db_path: str) -> str:
+    """Resolve read-replica path: ENV_REPLICA_PATH > sibling of db_path."""
+    explicit = os.getenv(ENV_REPLICA_PATH)
+    if explicit:
+        return explicit
+    root, _ = os.path.splitext(db_path)
+    return f"{root}.replica.db"
+
+
 def resolve_docs_dir() -> str:
     """Resolve docs dir: ENV_DOCS_DIR > default."""
     return os.getenv(ENV_DOCS_DIR, os.path.expanduser(DEFAULT_DOCS_DIR))
+
+
+def resolve_flow_cache_path() -> str:
+    """Resolve compiled-flow cache: ENV_FLOW_CACHE > default (shared across projects)."""
+    return os.getenv(ENV_FLOW_CACHE, os.path.expanduser(DEFAULT_FLOW_CACHE))
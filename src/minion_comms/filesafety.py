@@ -1,16 +1,266 @@
-"""File Safety — claim, release, get_claims."""
+"""File Safety — claim, release, get_claims.
+
+A claim is an exact file, a directory (`src/auth/`, `src/auth/**` or an
+existing directory path — the whole subtree) or a glob (`src/**/*.sql`).
+Every claim row carries a prefix: the file itself, or the wildcard-free
+directory the claim lives under. Checking a file then means probing the
+indexed prefix column with the file and each of its ancestor directories
+— a walk down the path trie, a handful of index lookups however many
+claims exist. Directory and glob claims additionally range-scan the
+prefixes beneath them. Glob-vs-directory overlaps are judged on prefixes,
+so they err on the side of conflict.
+
+Claims are leased (CLAIM_LEASE_SECONDS). Claiming, releasing, set-context
+and polling renew all of the holder's claims. When a claim is released
+or its lease lapses, the oldest waiter it was blocking gets the claim in
+the same transaction plus an inbox message, so waiters don't need to
+retry claim-file.
+"""
 
 from __future__ import annotations
 
+import functools
 import json
 import os
+import re
+import sqlite3
+import subprocess
 from typing import Any
 
-from minion_comms.db import get_db, now_iso
+from minion_comms.auth import CLAIM_LEASE_SECONDS
+from minion_comms.db import emit_event, get_db, get_read_db, lease_expiry, now_iso
+from minion_comms.fs import atomic_write_file, message_file_path
+
+_WILDCARD = re.compile(r"[*?]")
+_SQL_CHUNK = 500
+
+
+def normalize_claim(path: str) -> tuple[str, str, str]:
+    """(claim_path, kind, prefix) for a file, directory or glob claim."""
+    raw = path.strip()
+    if raw.endswith("/**"):
+        raw = raw[:-3] + "/"
+    if raw.endswith("/") or (not _WILDCARD.search(raw) and os.path.isdir(raw)):
+        d = os.path.abspath(raw).rstrip("/") + "/"
+        return d, "dir", d
+    normalized = os.path.abspath(raw)
+    if not _WILDCARD.search(normalized):
+        return normalized, "file", normalized
+    literal: list[str] = []
+    for part in normalized.split("/")[:-1]:
+        if _WILDCARD.search(part):
+            break
+        literal.append(part)
+    return normalized, "glob", "/".join(literal) + "/"
+
+
+def _ancestors(path: str) -> list[str]:
+    """The path itself plus every ancestor directory, '/'-terminated."""
+    out = [path]
+    head = path.rstrip("/")
+    while head:
+        head = head.rsplit("/", 1)[0]
+        out.append(head + "/")
+    return out
+
+
+@functools.lru_cache(maxsize=256)
+def _glob_regex(pattern: str) -> re.Pattern[str]:
+    """`**` spans directories, `*` and `?` stay within one path segment."""
+    out: list[str] = []
+    i = 0
+    while i < len(pattern):
+        if pattern.startswith("**/", i):
+            out.append("(?:.*/)?")
+            i += 3
+        elif pattern.startswith("**", i):
+            out.append(".*")
+            i += 2
+        elif pattern[i] == "*":
+            out.append("[^/]*")
+            i += 1
+        elif pattern[i] == "?":
+            out.append("[^/]")
+            i += 1
+        else:
+            out.append(re.escape(pattern[i]))
+            i += 1
+    return re.compile("".join(out))
+
+
+def claim_covers(kind: str, claim_path: str, file_path: str) -> bool:
+    """Does a claim of this kind and path cover the given absolute file?"""
+    if kind == "dir":
+        return file_path.startswith(claim_path)
+    if kind == "glob":
+        return _glob_regex(claim_path).fullmatch(file_path) is not None
+    return file_path == claim_path
+
+
+def _overlaps(claim: sqlite3.Row, path: str, kind: str, prefix: str) -> bool:
+    if kind == "file":
+        return claim_covers(claim["kind"], claim["file_path"], path)
+    if claim["kind"] == "file":
+        return claim_covers(kind, path, claim["file_path"])
+    return claim["prefix"].startswith(prefix) or prefix.startswith(claim["prefix"])
+
+
+def overlapping_claims(
+    cursor: sqlite3.Cursor,
+    targets: list[tuple[str, str, str]],
+) -> dict[str, list[sqlite3.Row]]:
+    """Existing claims overlapping each normalized (path, kind, prefix), in one pass."""
+    probes = sorted({a for _, _, prefix in targets for a in _ancestors(prefix)})
+    candidates: dict[str, sqlite3.Row] = {}
+    for i in range(0, len(probes), _SQL_CHUNK):
+        chunk = probes[i:i + _SQL_CHUNK]
+        cursor.execute(
+            f"SELECT * FROM file_claims WHERE prefix IN ({','.join('?' for _ in chunk)})", chunk,
+        )
+        candidates.update((r["file_path"], r) for r in cursor.fetchall())
+    for _, kind, prefix in targets:
+        if kind != "file":
+            # Everything beneath the directory: prefix range [dir/, dir0)
+            cursor.execute(
+                "SELECT * FROM file_claims WHERE prefix >= ? AND prefix < ?",
+                (prefix, prefix[:-1] + "0"),
+            )
+            candidates.update((r["file_path"], r) for r in cursor.fetchall())
+
+    return {
+        path: [c for c in candidates.values() if _overlaps(c, path, kind, prefix)]
+        for path, kind, prefix in targets
+    }
+
+
+def unclaimed_by(cursor: sqlite3.Cursor, agent_name: str, files: list[str]) -> list[str]:
+    """Files (as given) not covered by any claim the agent holds."""
+    targets = {f: normalize_claim(f) for f in files}
+    found = overlapping_claims(cursor, [t for t in targets.values() if t[1] == "file"])
+    return [
+        f for f, (path, kind, _) in targets.items()
+        if kind != "file" or not any(c["agent_name"] == agent_name for c in found.get(path, []))
+    ]
+
+
+def _in_chunks(items: list[str]) -> list[list[str]]:
+    return [items[i:i + _SQL_CHUNK] for i in range(0, len(items), _SQL_CHUNK)]
+
+
+def renew_claims(cursor: sqlite3.Cursor, agent_name: str) -> int:
+    """Extend the lease on every claim the agent holds. Returns rows renewed."""
+    cursor.execute(
+        "UPDATE file_claims SET expires_at = ? WHERE agent_name = ?",
+        (lease_expiry(CLAIM_LEASE_SECONDS), agent_name),
+    )
+    return cursor.rowcount
+
+
+def _notify(cursor: sqlite3.Cursor, to_agent: str, text: str, now: str) -> None:
+    content_file = message_file_path(to_agent, "system", "claim")
+    atomic_write_file(content_file, text)
+    cursor.execute(
+        "INSERT INTO messages (from_agent, to_agent, content_file, timestamp, read_flag, is_cc) VALUES (?, ?, ?, ?, 0, 0)",
+        ("system", to_agent, content_file, now),
+    )
+    emit_event(cursor, "message", "sent", content_file, "system", {"to": to_agent, "recipients": [to_agent], "cc": []})
+
+
+def _waiting_on(cursor: sqlite3.Cursor, released: list[sqlite3.Row]) -> list[sqlite3.Row]:
+    """Waitlist rows overlapping any released claim, oldest first."""
+    probes = sorted({a for c in released for a in _ancestors(c["prefix"])} | {c["file_path"] for c in released})
+    rows: dict[int, sqlite3.Row] = {}
+    for chunk in _in_chunks(probes):
+        cursor.execute(
+            f"SELECT * FROM file_waitlist WHERE file_path IN ({','.join('?' for _ in chunk)})", chunk,
+        )
+        rows.update((r["id"], r) for r in cursor.fetchall())
+    for c in released:
+        if c["kind"] != "file":
+            cursor.execute(
+                "SELECT * FROM file_waitlist WHERE file_path >= ? AND file_path < ?",
+                (c["prefix"], c["prefix"][:-1] + "0"),
+            )
+            rows.update((r["id"], r) for r in cursor.fetchall())
+    waiting: list[sqlite3.Row] = []
+    for r in rows.values():
+        path, kind, prefix = normalize_claim(r["file_path"])
+        if any(_overlaps(c, path, kind, prefix) for c in released):
+            waiting.append(r)
+    return sorted(waiting, key=lambda r: (r["added_at"], r["id"]))
+
+
+def release_claims(
+    cursor: sqlite3.Cursor,
+    agent_name: str,
+    released: list[sqlite3.Row],
+) -> tuple[dict[str, str], dict[str, list[str]]]:
+    """Drop claim rows and hand each freed path to the head of its waitlist.
+
+    Waiters are tried oldest first; one whose target no longer overlaps
+    anyone else's claim is granted it in this transaction and sent a
+    message. Returns ({path: promoted agent}, {path: agents still waiting}).
+    """
+    now = now_iso()
+    cursor.executemany("DELETE FROM file_claims WHERE file_path = ?", [(c["file_path"],) for c in released])
+
+    promoted: dict[str, str] = {}
+    waiting: dict[str, list[str]] = {}
+    for w in _waiting_on(cursor, released):
+        target = normalize_claim(w["file_path"])
+        path, kind, prefix = target
+        blockers = [c for c in overlapping_claims(cursor, [target])[path] if c["agent_name"] != w["agent_name"]]
+        if blockers or path in promoted:
+            waiting.setdefault(path, []).append(w["agent_name"])
+            continue
+        cursor.execute("DELETE FROM file_waitlist WHERE id = ?", (w["id"],))
+        cursor.execute(
+            """INSERT OR IGNORE INTO file_claims (file_path, agent_name, claimed_at, kind, prefix, expires_at)
+               VALUES (?, ?, ?, ?, ?, ?)""",
+            (path, w["agent_name"], now, kind, prefix, lease_expiry(CLAIM_LEASE_SECONDS)),
+        )
+        promoted[path] = w["agent_name"]
+        emit_event(cursor, "claim", "claimed", path, w["agent_name"], {"promoted_from_waitlist": True})
+        _notify(cursor, w["agent_name"], f"Claim granted: '{path}' is now yours (you were first on its waitlist).", now)
+
+    for c in released:
+        emit_event(cursor, "claim", "released", c["file_path"], agent_name, {
+            "holder": c["agent_name"],
+            "promoted": {p: a for p, a in promoted.items() if _overlaps(c, *normalize_claim(p))},
+        })
+    return promoted, waiting
+
+
+def expire_claims(agent_name: str = "system") -> dict[str, object]:
+    """Release claims whose lease lapsed, promoting their waitlists."""
+    conn = get_db()
+    cursor = conn.cursor()
+    try:
+        cursor.execute("BEGIN IMMEDIATE")
+        cursor.execute(
+            "SELECT * FROM file_claims WHERE expires_at IS NOT NULL AND expires_at < ? ORDER BY file_path",
+            (now_iso(),),
+        )
+        expired = cursor.fetchall()
+        if not expired:
+            return {"status": "ok", "expired": []}
+        for c in expired:
+            emit_event(cursor, "claim", "expired", c["file_path"], c["agent_name"])
+        promoted, _ = release_claims(cursor, agent_name, expired)
+        conn.commit()
+        result: dict[str, object] = {
+            "status": "ok",
+            "expired": [{"file": c["file_path"], "from_agent": c["agent_name"]} for c in expired],
+        }
+        if promoted:
+            result["promoted"] = promoted
+        return result
+    finally:
+        conn.close()
 
 
 def claim_file(agent_name: str, file_path: str) -> dict[str, object]:
-    normalized = os.path.abspath(file_path)
+    normalized, kind, prefix = normalize_claim(file_path)
     conn = get_db()
     cursor = conn.cursor()
     now = now_iso()
@@ -19,39 +269,54 @@ def claim_file(agent_name: str, file_path: str) -> dict[str, object]:
         if not cursor.fetchone():
             return {"error": f"BLOCKED: Agent '{agent_name}' not registered."}
 
-        cursor.execute(
-            "SELECT agent_name, claimed_at FROM file_claims WHERE file_path = ?",
-            (normalized,),
-        )
-        existing = cursor.fetchone()
+        overlapping = overlapping_claims(cursor, [(normalized, kind, prefix)])[normalized]
+        own = next((c for c in overlapping if c["agent_name"] == agent_name), None)
+        existing = next((c for c in overlapping if c["agent_name"] != agent_name), None)
 
         if existing:
-            if existing["agent_name"] == agent_name:
-                return {"status": "already_claimed", "file": normalized, "by": agent_name}
-
             cursor.execute(
                 "INSERT OR IGNORE INTO file_waitlist (file_path, agent_name, added_at) VALUES (?, ?, ?)",
                 (normalized, agent_name, now),
             )
+            emit_event(cursor, "claim", "waitlisted", normalized, agent_name,
+                       {"holder": existing["agent_name"], "claim": existing["file_path"]})
             conn.commit()
+            if existing["file_path"] == normalized:
+                return {
+                    "error": f"BLOCKED: File '{normalized}' claimed by '{existing['agent_name']}' since {existing['claimed_at']}. Added to waitlist.",
+                }
             return {
-                "error": f"BLOCKED: File '{normalized}' claimed by '{existing['agent_name']}' since {existing['claimed_at']}. Added to waitlist.",
+                "error": f"BLOCKED: '{normalized}' overlaps '{existing['file_path']}' claimed by '{existing['agent_name']}' since {existing['claimed_at']}. Added to waitlist.",
             }
 
+        if own and (own["file_path"] == normalized or kind == "file"):
+            renew_claims(cursor, agent_name)
+            conn.commit()
+            result: dict[str, object] = {"status": "already_claimed", "file": normalized, "by": agent_name}
+            if own["file_path"] != normalized:
+                result["via"] = own["file_path"]
+            return result
+
         cursor.execute(
-            "INSERT INTO file_claims (file_path, agent_name, claimed_at) VALUES (?, ?, ?)",
-            (normalized, agent_name, now),
+            """INSERT INTO file_claims (file_path, agent_name, claimed_at, kind, prefix, expires_at)
+               VALUES (?, ?, ?, ?, ?, ?)""",
+            (normalized, agent_name, now, kind, prefix, lease_expiry(CLAIM_LEASE_SECONDS)),
         )
+        renew_claims(cursor, agent_name)
         cursor.execute("UPDATE agents SET last_seen = ? WHERE name = ?", (now, agent_name))
+        emit_event(cursor, "claim", "claimed", normalized, agent_name, {"kind": kind} if kind != "file" else None)
         conn.commit()
 
-        return {"status": "claimed", "file": normalized, "by": agent_name}
+        result = {"status": "claimed", "file": normalized, "by": agent_name}
+        if kind != "file":
+            result["kind"] = kind
+        return result
     finally:
         conn.close()
 
 
 def release_file(agent_name: str, file_path: str, force: bool = False) -> dict[str, object]:
-    normalized = os.path.abspath(file_path)
+    normalized = normalize_claim(file_path)[0]
     conn = get_db()
     cursor = conn.cursor()
     now = now_iso()
@@ -61,7 +326,7 @@ def release_file(agent_name: str, file_path: str, force: bool = False) -> dict[s
         if not agent_row:
             return {"error": f"BLOCKED: Agent '{agent_name}' not registered."}
 
-        cursor.execute("SELECT agent_name FROM file_claims WHERE file_path = ?", (normalized,))
+        cursor.execute("SELECT * FROM file_claims WHERE file_path = ?", (normalized,))
         claim = cursor.fetchone()
         if not claim:
             return {"error": f"File '{normalized}' is not claimed by anyone."}
@@ -71,19 +336,17 @@ def release_file(agent_name: str, file_path: str, force: bool = False) -> dict[s
             if agent_row["agent_class"] != "lead" or not force:
                 return {"error": f"BLOCKED: File '{normalized}' is claimed by '{claim_holder}'. Only holder or lead (with --force) can release."}
 
-        cursor.execute("DELETE FROM file_claims WHERE file_path = ?", (normalized,))
-        cursor.execute(
-            "SELECT agent_name FROM file_waitlist WHERE file_path = ? ORDER BY added_at ASC",
-            (normalized,),
-        )
-        waiters = [row["agent_name"] for row in cursor.fetchall()]
-        cursor.execute("DELETE FROM file_waitlist WHERE file_path = ?", (normalized,))
+        promoted, waiting = release_claims(cursor, agent_name, [claim])
+        renew_claims(cursor, agent_name)
         cursor.execute("UPDATE agents SET last_seen = ? WHERE name = ?", (now, agent_name))
         conn.commit()
 
         result: dict[str, object] = {"status": "released", "file": normalized, "was_held_by": claim_holder}
         if claim_holder != agent_name:
             result["force_released_by"] = agent_name
+        if promoted:
+            result["promoted"] = promoted
+        waiters = [a for agents in waiting.values() for a in agents]
         if waiters:
             result["waitlisted_agents"] = waiters
         return result
@@ -91,9 +354,195 @@ def release_file(agent_name: str, file_path: str, force: bool = False) -> dict[s
         conn.close()
 
 
-def get_claims(agent_name: str = "") -> dict[str, object]:
+def claim_files(agent_name: str, files: list[str]) -> dict[str, object]:
+    """Claim a set of files/directories/globs: all of them, or none.
+
+    Targets are checked and inserted in sorted order inside one
+    write-locked transaction, so two agents grabbing overlapping sets
+    can't each end up holding half. If anything is held by someone else,
+    nothing is claimed and the agent is waitlisted on the blocked paths.
+    """
+    targets = sorted({normalize_claim(f) for f in files if f.strip()})
+    if not targets:
+        return {"error": "BLOCKED: No files given."}
     conn = get_db()
     cursor = conn.cursor()
+    now = now_iso()
+    try:
+        cursor.execute("SELECT name FROM agents WHERE name = ?", (agent_name,))
+        if not cursor.fetchone():
+            return {"error": f"BLOCKED: Agent '{agent_name}' not registered."}
+
+        cursor.execute("BEGIN IMMEDIATE")
+        overlapping = overlapping_claims(cursor, targets)
+        blocked: list[dict[str, str]] = []
+        held: list[str] = []
+        to_claim: list[tuple[str, str, str]] = []
+        for path, kind, prefix in targets:
+            other = next((c for c in overlapping[path] if c["agent_name"] != agent_name), None)
+            own = next((c for c in overlapping[path] if c["agent_name"] == agent_name), None)
+            if other:
+                blocked.append({"file": path, "claim": other["file_path"],
+                                "holder": other["agent_name"], "since": other["claimed_at"]})
+            elif own and (own["file_path"] == path or kind == "file"):
+                held.append(path)
+            else:
+                to_claim.append((path, kind, prefix))
+
+        if blocked:
+            cursor.executemany(
+                "INSERT OR IGNORE INTO file_waitlist (file_path, agent_name, added_at) VALUES (?, ?, ?)",
+                [(b["file"], agent_name, now) for b in blocked],
+            )
+            for b in blocked:
+                emit_event(cursor, "claim", "waitlisted", b["file"], agent_name,
+                           {"holder": b["holder"], "claim": b["claim"]})
+            conn.commit()
+            return {
+                "error": f"BLOCKED: {len(blocked)} of {len(targets)} paths are claimed by others. Nothing claimed; waitlisted on the blocked paths.",
+                "blocked": blocked,
+            }
+
+        expires = lease_expiry(CLAIM_LEASE_SECONDS)
+        cursor.executemany(
+            """INSERT INTO file_claims (file_path, agent_name, claimed_at, kind, prefix, expires_at)
+               VALUES (?, ?, ?, ?, ?, ?)""",
+            [(path, agent_name, now, kind, prefix, expires) for path, kind, prefix in to_claim],
+        )
+        renew_claims(cursor, agent_name)
+        for path, kind, _ in to_claim:
+            emit_event(cursor, "claim", "claimed", path, agent_name, {"kind": kind} if kind != "file" else None)
+        cursor.execute("UPDATE agents SET last_seen = ? WHERE name = ?", (now, agent_name))
+        conn.commit()
+
+        result: dict[str, object] = {"status": "claimed", "claimed": [t[0] for t in to_claim], "by": agent_name}
+        if held:
+            result["already_claimed"] = held
+        return result
+    finally:
+        conn.close()
+
+
+def release_files(agent_name: str, files: list[str], force: bool = False) -> dict[str, object]:
+    """Release a set of claims: all of them, or none if any can't be released."""
+    paths = sorted({normalize_claim(f)[0] for f in files if f.strip()})
+    if not paths:
+        return {"error": "BLOCKED: No files given."}
+    conn = get_db()
+    cursor = conn.cursor()
+    now = now_iso()
+    try:
+        cursor.execute("SELECT name, agent_class FROM agents WHERE name = ?", (agent_name,))
+        agent_row = cursor.fetchone()
+        if not agent_row:
+            return {"error": f"BLOCKED: Agent '{agent_name}' not registered."}
+        can_force = force and agent_row["agent_class"] == "lead"
+
+        cursor.execute("BEGIN IMMEDIATE")
+        claims: list[sqlite3.Row] = []
+        for chunk in _in_chunks(paths):
+            cursor.execute(
+                f"SELECT * FROM file_claims WHERE file_path IN ({','.join('?' for _ in chunk)})", chunk,
+            )
+            claims.extend(cursor.fetchall())
+        holders = {c["file_path"]: c["agent_name"] for c in claims}
+
+        problems = [f"'{p}' is not claimed by anyone." for p in paths if p not in holders]
+        problems += [
+            f"'{p}' is claimed by '{h}'. Only holder or lead (with --force) can release."
+            for p, h in holders.items() if h != agent_name and not can_force
+        ]
+        if problems:
+            return {"error": f"BLOCKED: Nothing released — {len(problems)} of {len(paths)} paths can't be.",
+                    "problems": problems}
+
+        promoted, waiting = release_claims(cursor, agent_name, claims)
+        renew_claims(cursor, agent_name)
+        cursor.execute("UPDATE agents SET last_seen = ? WHERE name = ?", (now, agent_name))
+        conn.commit()
+
+        result: dict[str, object] = {"status": "released", "released": paths, "by": agent_name}
+        forced = sorted(p for p, h in holders.items() if h != agent_name)
+        if forced:
+            result["force_released"] = forced
+        if promoted:
+            result["promoted"] = promoted
+        if waiting:
+            result["waitlisted_agents"] = waiting
+        return result
+    finally:
+        conn.close()
+
+
+def _git_changed_files(project_dir: str) -> list[str] | str:
+    """Absolute paths git sees as modified, added, deleted or untracked. Error string on failure."""
+    try:
+        root = subprocess.run(
+            ["git", "-C", project_dir, "rev-parse", "--show-toplevel"],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+        out = subprocess.run(
+            ["git", "-C", root, "status", "--porcelain", "-z", "--untracked-files=all"],
+            capture_output=True, text=True, check=True,
+        ).stdout
+    except (OSError, subprocess.CalledProcessError) as exc:
+        return f"BLOCKED: git status failed in '{project_dir}': {exc}"
+
+    changed: set[str] = set()
+    entries = iter(out.split("\0"))
+    for entry in entries:
+        if len(entry) < 4:
+            continue
+        status, path = entry[:2], entry[3:]
+        changed.add(os.path.join(root, path))
+        if "R" in status or "C" in status:
+            next(entries, None)  # -z puts the rename source in its own field
+    return sorted(changed)
+
+
+def audit_edits(project_dir: str = ".", agent_name: str = "") -> dict[str, object]:
+    """Cross-check the working tree against file claims, crew-wide.
+
+    One `git status` pass lists every edited file; one claims lookup over
+    the prefix index finds who (if anyone) holds each. With agent_name,
+    files claimed by someone else are called out as foreign edits.
+    """
+    changed = _git_changed_files(project_dir)
+    if isinstance(changed, str):
+        return {"error": changed}
+
+    conn = get_read_db()
+    try:
+        found = overlapping_claims(conn.cursor(), [(p, "file", p) for p in changed])
+    finally:
+        conn.close()
+
+    unclaimed: list[str] = []
+    by_holder: dict[str, list[str]] = {}
+    foreign: list[dict[str, str]] = []
+    for path in changed:
+        holders = sorted({c["agent_name"] for c in found[path]})
+        if not holders:
+            unclaimed.append(path)
+            continue
+        for h in holders:
+            by_holder.setdefault(h, []).append(path)
+        if agent_name and agent_name not in holders:
+            foreign.append({"file": path, "claimed_by": ", ".join(holders)})
+
+    result: dict[str, object] = {
+        "changed": len(changed),
+        "unclaimed": unclaimed,
+        "claimed": by_holder,
+    }
+    if agent_name:
+        result["foreign"] = foreign
+    return result
+
+
+def get_claims(agent_name: str = "") -> dict[str, object]:
+    conn = get_read_db()
+    cursor = conn.cursor()
     try:
         if agent_name:
             cursor.execute(
@@ -1,138 +1,397 @@
 """Bridge to minion-tasks DAG engine with hardcoded fallback.
 
-All DAG queries route through here. If minion-tasks is installed, uses
-YAML-defined flows. Otherwise falls back to auth.VALID_TRANSITIONS constants.
+All DAG queries route through here. Each flow is compiled once into an
+immutable CompiledFlow — status sets plus transition, next-status and
+worker-routing lookup tables — and every query is a dict/set lookup.
+
+If minion-tasks is installed, its YAML flows are compiled (and validated)
+and the tables are persisted to a JSON cache keyed on each YAML file's
+mtime, size and hash. Later processes load the cache without importing
+minion-tasks or parsing YAML; the import only happens when a flow file
+changed. Otherwise falls back to auth.VALID_TRANSITIONS constants.
 """
 
 from __future__ import annotations
 
-from typing import Any
+import hashlib
+import importlib.util
+import json
+import os
+import tempfile
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Mapping
 
-from minion_comms.auth import TASK_STATUSES, VALID_TRANSITIONS
+from minion_comms.auth import TASK_STATUSES, VALID_CLASSES, VALID_TRANSITIONS
+from minion_comms.defaults import resolve_flow_cache_path
 
-# Cache loaded flows so we don't re-parse YAML every call
-_flow_cache: dict[str, Any] = {}
+# Bump when CompiledFlow's JSON shape changes
+_CACHE_FORMAT = 1
 
-_HAS_DAG = False
-try:
-    from minion_tasks import TaskFlow, list_flows as _mt_list_flows, load_flow as _mt_load_flow
-    _HAS_DAG = True
-except ImportError:
-    pass
 
+class FlowCompileError(ValueError):
+    """A flow definition is internally inconsistent."""
 
-def _get_flow(task_type: str = "bugfix") -> Any | None:
-    """Load and cache a TaskFlow, or return None if unavailable."""
-    if not _HAS_DAG:
-        return None
-    if task_type in _flow_cache:
-        return _flow_cache[task_type]
+
+@dataclass(frozen=True)
+class CompiledFlow:
+    name: str
+    statuses: frozenset[str]
+    terminal: frozenset[str]
+    dead_ends: frozenset[str]
+    active: tuple[str, ...]
+    transitions: Mapping[str, frozenset[str]]
+    next_pass: Mapping[str, str]
+    next_fail: Mapping[str, str]
+    # status -> class_required ("" = any) -> worker classes, None = assignee continues
+    workers: Mapping[str, Mapping[str, tuple[str, ...] | None]]
+
+    def to_json(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "statuses": sorted(self.statuses),
+            "terminal": sorted(self.terminal),
+            "dead_ends": sorted(self.dead_ends),
+            "active": list(self.active),
+            "transitions": {s: sorted(t) for s, t in self.transitions.items()},
+            "next_pass": dict(self.next_pass),
+            "next_fail": dict(self.next_fail),
+            "workers": {
+                s: {c: list(w) if w is not None else None for c, w in by_class.items()}
+                for s, by_class in self.workers.items()
+            },
+        }
+
+    @classmethod
+    def from_json(cls, d: dict[str, Any]) -> CompiledFlow:
+        return _freeze(
+            d["name"], d["statuses"], d["terminal"], d["dead_ends"], d["active"],
+            d["transitions"], d["next_pass"], d["next_fail"], d["workers"],
+        )
+
+
+def _freeze(
+    name: str,
+    statuses: Any,
+    terminal: Any,
+    dead_ends: Any,
+    active: Any,
+    transitions: Mapping[str, Any],
+    next_pass: Mapping[str, str],
+    next_fail: Mapping[str, str],
+    workers: Mapping[str, Mapping[str, Any]],
+) -> CompiledFlow:
+    return CompiledFlow(
+        name=name,
+        statuses=frozenset(statuses),
+        terminal=frozenset(terminal),
+        dead_ends=frozenset(dead_ends),
+        active=tuple(active),
+        transitions=MappingProxyType({s: frozenset(t) for s, t in transitions.items()}),
+        next_pass=MappingProxyType(dict(next_pass)),
+        next_fail=MappingProxyType(dict(next_fail)),
+        workers=MappingProxyType({
+            s: MappingProxyType({c: tuple(w) if w is not None else None for c, w in by_class.items()})
+            for s, by_class in workers.items()
+        }),
+    )
+
+
+# -- Compilation --
+
+def _validate(flow: CompiledFlow) -> CompiledFlow:
+    """Reject flows that would misroute tasks at runtime."""
+    where = f"flow '{flow.name}'"
+    if not flow.statuses:
+        raise FlowCompileError(f"{where}: no stages")
+    if not flow.terminal:
+        raise FlowCompileError(f"{where}: no terminal stage")
+    for status, targets in flow.transitions.items():
+        unknown = sorted(targets - flow.statuses)
+        if unknown:
+            raise FlowCompileError(f"{where}: stage '{status}' transitions to unknown status {unknown}")
+    for label, table in (("pass", flow.next_pass), ("fail", flow.next_fail)):
+        for status, target in table.items():
+            if target not in flow.statuses:
+                raise FlowCompileError(f"{where}: stage '{status}' {label} route targets unknown status '{target}'")
+    for status in flow.active:
+        if status not in flow.next_pass and not flow.transitions.get(status):
+            raise FlowCompileError(f"{where}: active stage '{status}' has no way forward")
+    for status, by_class in flow.workers.items():
+        for workers in by_class.values():
+            bad = sorted(set(workers or ()) - VALID_CLASSES)
+            if bad:
+                raise FlowCompileError(f"{where}: stage '{status}' routes to unknown class(es) {bad}")
+    return flow
+
+
+def _compile_taskflow(name: str, flow: Any) -> CompiledFlow:
+    """Query a minion-tasks TaskFlow once per (status, input) and freeze the answers."""
     try:
-        flow = _mt_load_flow(task_type)
-        _flow_cache[task_type] = flow
-        return flow
-    except (FileNotFoundError, ValueError):
-        _flow_cache[task_type] = None
+        statuses = list(flow.stages.keys())
+        dead_ends = set(flow.dead_ends)
+        terminal = {s for s in statuses if flow.is_terminal(s)}
+        classes = ["", *sorted(VALID_CLASSES)]
+        transitions: dict[str, set[str]] = {}
+        next_pass: dict[str, str] = {}
+        next_fail: dict[str, str] = {}
+        workers: dict[str, dict[str, Any]] = {}
+        for s in statuses:
+            transitions[s] = set(flow.valid_transitions(s) or ())
+            for passed, table in ((True, next_pass), (False, next_fail)):
+                target = flow.next_status(s, passed)
+                if target is not None:
+                    table[s] = target
+            workers[s] = {c: flow.workers_for(s, c) for c in classes}
+    except FlowCompileError:
+        raise
+    except Exception as e:
+        raise FlowCompileError(f"flow '{name}': {e}") from e
+
+    active = [s for s in statuses if s not in terminal and s not in dead_ends]
+    return _validate(_freeze(
+        name, statuses, terminal, dead_ends, active,
+        transitions, next_pass, next_fail, workers,
+    ))
+
+
+def _compile_fallback() -> CompiledFlow:
+    linear = {
+        "open": "assigned",
+        "assigned": "in_progress",
+        "in_progress": "fixed",
+        "fixed": "verified",
+        "verified": "closed",
+    }
+    stage_workers: dict[str, list[str] | None] = {
+        "open": None,
+        "assigned": None,
+        "in_progress": None,
+        "fixed": ["oracle", "recon"],
+        "verified": ["recon"],
+    }
+    return _freeze(
+        "bugfix",
+        TASK_STATUSES,
+        {"closed"},
+        {"abandoned", "stale", "obsolete"},
+        ("open", "assigned", "in_progress", "fixed", "verified"),
+        VALID_TRANSITIONS,
+        linear,
+        {"fixed": "assigned", "verified": "assigned"},
+        {s: {"": w} for s, w in stage_workers.items()},
+    )
+
+
+_FALLBACK = _validate(_compile_fallback())
+
+# task_type -> compiled flow (None = unknown / failed to compile → fallback)
+_flow_cache: dict[str, CompiledFlow | None] = {}
+
+_HAS_DAG: bool | None = None
+
+
+def _dag_available() -> bool:
+    """Is minion-tasks importable? Checked via find_spec — no import."""
+    global _HAS_DAG
+    if _HAS_DAG is None:
+        _HAS_DAG = importlib.util.find_spec("minion_tasks") is not None
+    return _HAS_DAG
+
+
+# -- Persistent cache --
+
+def _flow_sources() -> tuple[list[str], list[str]]:
+    """(yaml files, directories) shipped in the minion_tasks package."""
+    spec = importlib.util.find_spec("minion_tasks")
+    roots = list(spec.submodule_search_locations or []) if spec else []
+    files: list[str] = []
+    dirs: list[str] = []
+    for root in roots:
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames[:] = [d for d in dirnames if not d.startswith((".", "__"))]
+            dirs.append(dirpath)
+            files.extend(os.path.join(dirpath, f) for f in filenames if f.endswith((".yaml", ".yml")))
+    return sorted(files), sorted(dirs)
+
+
+def _file_hash(path: str) -> str:
+    with open(path, "rb") as f:
+        return hashlib.blake2b(f.read(), digest_size=16).hexdigest()
+
+
+def _fingerprint(files: list[str], dirs: list[str]) -> dict[str, Any]:
+    fp: dict[str, Any] = {"files": {}, "dirs": {}}
+    for path in files:
+        st = os.stat(path)
+        fp["files"][path] = {"mtime_ns": st.st_mtime_ns, "size": st.st_size, "hash": _file_hash(path)}
+    for path in dirs:
+        fp["dirs"][path] = os.stat(path).st_mtime_ns
+    return fp
+
+
+def _cache_fresh(fp: dict[str, Any]) -> bool:
+    """Stat every source; only re-hash files whose mtime or size moved."""
+    try:
+        for path, mtime_ns in fp["dirs"].items():
+            if os.stat(path).st_mtime_ns != mtime_ns:
+                return False
+        for path, meta in fp["files"].items():
+            st = os.stat(path)
+            if st.st_mtime_ns == meta["mtime_ns"] and st.st_size == meta["size"]:
+                continue
+            if _file_hash(path) != meta["hash"]:
+                return False
+    except OSError:
+        return False
+    return True
+
+
+def _read_cache() -> dict[str, Any] | None:
+    try:
+        with open(resolve_flow_cache_path()) as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if data.get("format") != _CACHE_FORMAT or not _cache_fresh(data.get("sources", {})):
         return None
+    return data
 
 
-# -- Terminal statuses (closed, abandoned, etc.) --
+def _write_cache(data: dict[str, Any]) -> None:
+    path = resolve_flow_cache_path()
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".flow-cache-")
+    with os.fdopen(fd, "w") as f:
+        json.dump(data, f)
+    os.replace(tmp, path)
+
+
+def compile_flows(write_cache: bool = True) -> dict[str, object]:
+    """Compile every minion-tasks flow, validate it, and persist the tables.
+
+    Validation problems come back in `errors` (one per flow) instead of
+    surfacing later as misrouted tasks.
+    """
+    if not _dag_available():
+        return {"status": "fallback", "flows": [_FALLBACK.name], "note": "minion-tasks not installed — using built-in flow."}
+
+    from minion_tasks import list_flows as _mt_list_flows, load_flow as _mt_load_flow
+
+    files, dirs = _flow_sources()
+    compiled: dict[str, CompiledFlow] = {}
+    errors: dict[str, str] = {}
+    try:
+        names = list(_mt_list_flows())
+    except Exception as e:
+        names = []
+        errors["*"] = f"list_flows failed: {e}"
+    for name in names:
+        try:
+            compiled[name] = _compile_taskflow(name, _mt_load_flow(name))
+        except FlowCompileError as e:
+            errors[name] = str(e)
+        except Exception as e:  # FileNotFoundError, YAML errors
+            errors[name] = f"flow '{name}': {e}"
+
+    _flow_cache.update(compiled)
+    _flow_cache.update({name: None for name in errors if name != "*"})
+
+    result: dict[str, object] = {"status": "compiled", "flows": sorted(compiled)}
+    if errors:
+        result["errors"] = errors
+    if write_cache:
+        _write_cache({
+            "format": _CACHE_FORMAT,
+            "sources": _fingerprint(files, dirs),
+            "flows": {name: flow.to_json() for name, flow in compiled.items()},
+            "errors": errors,
+        })
+        result["cache"] = resolve_flow_cache_path()
+    return result
 
-_FALLBACK_TERMINAL = {"closed"}
-_FALLBACK_DEAD_ENDS = {"abandoned", "stale", "obsolete"}
 
+def _load_flows() -> None:
+    """Fill _flow_cache from the persistent cache, recompiling if it's stale."""
+    data = _read_cache()
+    if data is None:
+        compile_flows()
+        return
+    for name, table in data.get("flows", {}).items():
+        _flow_cache[name] = CompiledFlow.from_json(table)
+    for name in data.get("errors", {}):
+        if name != "*":
+            _flow_cache[name] = None
+
+
+def _get_flow(task_type: str = "bugfix") -> CompiledFlow:
+    """Compiled tables for task_type, or the built-in fallback."""
+    flow = _flow_cache.get(task_type)
+    if flow is not None:
+        return flow
+    if task_type not in _flow_cache:
+        if _dag_available():
+            _load_flows()
+        _flow_cache.setdefault(task_type, None)
+        flow = _flow_cache[task_type]
+    return flow if flow is not None else _FALLBACK
+
+
+# -- Terminal statuses (closed, abandoned, etc.) --
 
 def is_terminal(status: str, task_type: str = "bugfix") -> bool:
     """Is this status terminal (no further transitions)?"""
-    flow = _get_flow(task_type)
-    if flow is not None:
-        return flow.is_terminal(status)
-    return status in _FALLBACK_TERMINAL
+    return status in _get_flow(task_type).terminal
 
 
 def is_dead_end(status: str, task_type: str = "bugfix") -> bool:
     """Is this a dead-end status (abandoned/stale/obsolete)?"""
-    flow = _get_flow(task_type)
-    if flow is not None:
-        return status in flow.dead_ends
-    return status in _FALLBACK_DEAD_ENDS
+    return status in _get_flow(task_type).dead_ends
 
 
 # -- Status sets --
 
-def all_statuses(task_type: str = "bugfix") -> set[str]:
+def all_statuses(task_type: str = "bugfix") -> frozenset[str]:
     """All known statuses for this flow type."""
-    flow = _get_flow(task_type)
-    if flow is not None:
-        return set(flow.stages.keys())
-    return TASK_STATUSES
+    return _get_flow(task_type).statuses
 
 
 def active_statuses(task_type: str = "bugfix") -> tuple[str, ...]:
     """Non-terminal, non-dead-end statuses (what agents actively work on)."""
-    flow = _get_flow(task_type)
-    if flow is not None:
-        return tuple(
-            name for name, stage in flow.stages.items()
-            if not stage.terminal and name not in flow.dead_ends
-        )
-    return ("open", "assigned", "in_progress", "fixed", "verified")
+    return _get_flow(task_type).active
 
 
 # -- Transitions --
 
-def valid_transitions(current: str, task_type: str = "bugfix") -> set[str] | None:
+def valid_transitions(current: str, task_type: str = "bugfix") -> frozenset[str] | None:
     """Valid next statuses from current. None if current is unknown/terminal."""
-    flow = _get_flow(task_type)
-    if flow is not None:
-        result = flow.valid_transitions(current)
-        return result if result else None
-    return VALID_TRANSITIONS.get(current)
+    return _get_flow(task_type).transitions.get(current) or None
 
 
 def next_status(current: str, task_type: str = "bugfix", passed: bool = True) -> str | None:
     """DAG-driven next status. Returns None if terminal/unknown."""
     flow = _get_flow(task_type)
-    if flow is not None:
-        return flow.next_status(current, passed)
-    # Fallback: simple linear pipeline
-    _linear = {
-        "open": "assigned",
-        "assigned": "in_progress",
-        "in_progress": "fixed",
-        "fixed": "verified",
-        "verified": "closed",
-    }
-    if not passed:
-        return "assigned" if current in ("fixed", "verified") else None
-    return _linear.get(current)
+    return (flow.next_pass if passed else flow.next_fail).get(current)
 
 
 # -- Worker routing --
 
 def workers_for(status: str, class_required: str, task_type: str = "bugfix") -> list[str] | None:
     """Which agent classes can work on this stage? None = current assignee continues."""
-    flow = _get_flow(task_type)
-    if flow is not None:
-        return flow.workers_for(status, class_required)
-    # Fallback: hardcoded routing
-    _stage_workers: dict[str, list[str] | None] = {
-        "open": None,
-        "assigned": None,
-        "in_progress": None,
-        "fixed": ["oracle", "recon"],
-        "verified": ["recon"],
-    }
-    return _stage_workers.get(status)
+    by_class = _get_flow(task_type).workers.get(status)
+    if by_class is None:
+        return None
+    workers = by_class.get(class_required, by_class.get(""))
+    return list(workers) if workers is not None else None
 
 
 # -- Flow discovery --
 
 def available_flows() -> list[str]:
     """List available flow type names."""
-    if _HAS_DAG:
-        try:
-            return _mt_list_flows()
-        except Exception:
-            pass
-    return ["bugfix"]
+    if _dag_available():
+        _get_flow()
+        names = sorted(name for name, flow in _flow_cache.items() if flow is not None)
+        if names:
+            return names
+    return [_FALLBACK.name]
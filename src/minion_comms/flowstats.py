@@ -0,0 +1,178 @@
+"""Flow metrics — per-stage dwell time, queue depth and throughput.
+
+Rollups are maintained incrementally: every task transition passes
+through tasks._log_transitions, which calls record_transitions in the
+same transaction. Reading stats is then a handful of primary-key lookups
+per stage instead of a scan of task_history.
+
+  flow_stage_stats   running totals per (flow, stage): entered / exited
+                     (depth = entered - exited) and dwell time
+  flow_stage_hourly  peak and last queue depth per stage per hour
+  flow_throughput    stage exits and dwell per agent class per hour
+"""
+
+from __future__ import annotations
+
+import datetime
+import sqlite3
+from typing import Any
+
+from minion_comms.db import get_read_db
+
+
+def _hour(ts: str) -> str:
+    return ts[:13]
+
+
+def _seconds_between(start: str | None, end: str) -> float | None:
+    if not start:
+        return None
+    try:
+        delta = datetime.datetime.fromisoformat(end) - datetime.datetime.fromisoformat(start)
+    except ValueError:
+        return None
+    return max(delta.total_seconds(), 0.0)
+
+
+def _record_depth(cursor: sqlite3.Cursor, task_type: str, status: str, hour: str) -> None:
+    cursor.execute(
+        """INSERT INTO flow_stage_hourly (task_type, status, hour, peak_depth, last_depth)
+           SELECT task_type, status, ?, entered - exited, entered - exited
+           FROM flow_stage_stats WHERE task_type = ? AND status = ?
+           ON CONFLICT (task_type, status, hour) DO UPDATE SET
+               peak_depth = MAX(peak_depth, excluded.last_depth),
+               last_depth = excluded.last_depth""",
+        (hour, task_type, status),
+    )
+
+
+def record_transitions(
+    cursor: sqlite3.Cursor,
+    rows: list[tuple[int, str | None, str, str, str]],
+) -> None:
+    """Fold a batch of (task_id, from, to, agent, timestamp) into the rollups."""
+    rows = [r for r in rows if r[1] != r[2]]
+    if not rows:
+        return
+
+    ids = sorted({r[0] for r in rows})
+    cursor.execute(
+        f"SELECT id, task_type, status_entered_at FROM tasks WHERE id IN ({','.join('?' for _ in ids)})",
+        ids,
+    )
+    task_type: dict[int, str] = {}
+    entered_at: dict[int, str | None] = {}
+    for r in cursor.fetchall():
+        task_type[r["id"]] = r["task_type"] or "bugfix"
+        entered_at[r["id"]] = r["status_entered_at"]
+
+    names = sorted({r[3] for r in rows})
+    cursor.execute(
+        f"SELECT name, agent_class FROM agents WHERE name IN ({','.join('?' for _ in names)})", names,
+    )
+    agent_class = {r["name"]: r["agent_class"] for r in cursor.fetchall()}
+
+    for task_id, from_status, to_status, agent, ts in rows:
+        flow = task_type.get(task_id, "bugfix")
+        hour = _hour(ts)
+        if from_status is not None:
+            dwell = _seconds_between(entered_at.get(task_id), ts)
+            cursor.execute(
+                """INSERT INTO flow_stage_stats (task_type, status, exited, dwell_count, dwell_total, dwell_max)
+                   VALUES (?, ?, 1, ?, ?, ?)
+                   ON CONFLICT (task_type, status) DO UPDATE SET
+                       exited = exited + 1,
+                       dwell_count = dwell_count + excluded.dwell_count,
+                       dwell_total = dwell_total + excluded.dwell_total,
+                       dwell_max = MAX(dwell_max, excluded.dwell_max)""",
+                (flow, from_status, int(dwell is not None), dwell or 0.0, dwell or 0.0),
+            )
+            cursor.execute(
+                """INSERT INTO flow_throughput (task_type, status, agent_class, hour, exits, dwell_total)
+                   VALUES (?, ?, ?, ?, 1, ?)
+                   ON CONFLICT (task_type, status, agent_class, hour) DO UPDATE SET
+                       exits = exits + 1,
+                       dwell_total = dwell_total + excluded.dwell_total""",
+                (flow, from_status, agent_class.get(agent, agent), hour, dwell or 0.0),
+            )
+            _record_depth(cursor, flow, from_status, hour)
+
+        cursor.execute(
+            """INSERT INTO flow_stage_stats (task_type, status, entered) VALUES (?, ?, 1)
+               ON CONFLICT (task_type, status) DO UPDATE SET entered = entered + 1""",
+            (flow, to_status),
+        )
+        _record_depth(cursor, flow, to_status, hour)
+        entered_at[task_id] = ts
+
+    cursor.executemany(
+        "UPDATE tasks SET status_entered_at = ? WHERE id = ?",
+        [(ts, tid) for tid, ts in entered_at.items() if ts and tid in task_type],
+    )
+
+
+def get_flow_stats(task_type: str = "", hours: int = 24) -> dict[str, object]:
+    """Per-stage depth, dwell and recent throughput, straight from the rollups."""
+    from minion_comms.flow_bridge import active_statuses
+
+    since_hour = _hour((datetime.datetime.now() - datetime.timedelta(hours=hours)).isoformat())
+    conn = get_read_db()
+    cursor = conn.cursor()
+    try:
+        query = "SELECT * FROM flow_stage_stats"
+        params: list[str] = []
+        if task_type:
+            query += " WHERE task_type = ?"
+            params.append(task_type)
+        cursor.execute(query + " ORDER BY task_type, status", params)
+        stats = cursor.fetchall()
+
+        flows: dict[str, dict[str, Any]] = {}
+        for s in stats:
+            flow = flows.setdefault(s["task_type"], {"stages": {}})
+            active = s["status"] in active_statuses(s["task_type"])
+            stage: dict[str, Any] = {
+                "depth": s["entered"] - s["exited"] if active else None,
+                "entered": s["entered"],
+                "exited": s["exited"],
+                "avg_dwell_seconds": round(s["dwell_total"] / s["dwell_count"], 1) if s["dwell_count"] else None,
+                "max_dwell_seconds": round(s["dwell_max"], 1) if s["dwell_count"] else None,
+            }
+            if active:
+                # Oldest task still waiting here — one probe of idx_tasks_status_entered
+                cursor.execute(
+                    """SELECT MIN(status_entered_at) FROM tasks
+                       WHERE status = ? AND COALESCE(task_type, 'bugfix') = ?""",
+                    (s["status"], s["task_type"]),
+                )
+                oldest = cursor.fetchone()[0]
+                stage["oldest_waiting_since"] = oldest
+
+                cursor.execute(
+                    """SELECT MAX(peak_depth) FROM flow_stage_hourly
+                       WHERE task_type = ? AND status = ? AND hour >= ?""",
+                    (s["task_type"], s["status"], since_hour),
+                )
+                stage["peak_depth"] = cursor.fetchone()[0] or 0
+            flow["stages"][s["status"]] = stage
+
+        query = """SELECT task_type, status, agent_class, SUM(exits) AS exits, SUM(dwell_total) AS dwell
+                   FROM flow_throughput WHERE hour >= ?"""
+        params = [since_hour]
+        if task_type:
+            query += " AND task_type = ?"
+            params.append(task_type)
+        cursor.execute(query + " GROUP BY task_type, status, agent_class ORDER BY task_type, status, agent_class", params)
+        for r in cursor.fetchall():
+            flow = flows.setdefault(r["task_type"], {"stages": {}})
+            flow.setdefault("throughput", []).append({
+                "status": r["status"],
+                "agent_class": r["agent_class"],
+                "exits": r["exits"],
+                "per_hour": round(r["exits"] / hours, 2),
+                "avg_dwell_seconds": round(r["dwell"] / r["exits"], 1) if r["exits"] else None,
+            })
+
+        return {"window_hours": hours, "flows": flows}
+    finally:
+        conn.close()
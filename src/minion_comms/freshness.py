@@ -0,0 +1,247 @@
+"""Read freshness — which agent read which file, and whether it changed since.
+
+agent_files_read is the reverse index: one row per (agent, file) with the
+file's stat at read time. Agents record reads through set-context
+--files-read. scan_file_changes stats each distinct indexed file once —
+not once per agent or per request — and marks every reader's row stale
+in bulk when the file moved on. who and sitrep then report stale reads
+from an indexed count instead of stat-ing anything.
+
+"Moved on" means the content changed, not the mtime: file_hashes caches a
+blake2b digest per path keyed by (size, mtime_ns), so a file is only read
+again when its stat key moves, and a touch, checkout or no-op formatter
+pass leaves its hash — and changed_at — where they were.
+"""
+
+from __future__ import annotations
+
+import datetime
+import hashlib
+import os
+import sqlite3
+import stat
+from typing import Any
+
+from minion_comms.db import emit_event, get_db, now_iso, split_file_list
+
+_SQL_CHUNK = 500
+_HASH_BLOCK = 1 << 20
+
+
+def _stat_key(path: str) -> tuple[int | None, int | None]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None, None
+    return st.st_mtime_ns, st.st_size
+
+
+def _hash_file(path: str) -> str | None:
+    digest = hashlib.blake2b(digest_size=16)
+    try:
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(_HASH_BLOCK), b""):
+                digest.update(block)
+    except OSError:
+        return None
+    return digest.hexdigest()
+
+
+def hash_lookup(
+    cursor: sqlite3.Cursor,
+    paths: list[str],
+    persist: bool = True,
+) -> dict[str, dict[str, Any] | None]:
+    """Content hash per path through the file_hashes cache. None for non-files.
+
+    Each entry carries hash, changed_at (last time the content, not the
+    mtime, changed), mtime_ns and size. Only paths whose stat key differs
+    from the cached one are read; the cache is updated in `cursor`'s
+    transaction unless persist=False, which leaves it untouched so the
+    lookup works on a read-only connection.
+    """
+    paths = list(dict.fromkeys(paths))
+    cached: dict[str, sqlite3.Row] = {}
+    for i in range(0, len(paths), _SQL_CHUNK):
+        chunk = paths[i:i + _SQL_CHUNK]
+        cursor.execute(
+            f"SELECT * FROM file_hashes WHERE file_path IN ({','.join('?' for _ in chunk)})",
+            chunk,
+        )
+        cached.update((r["file_path"], r) for r in cursor.fetchall())
+
+    out: dict[str, dict[str, Any] | None] = {}
+    upserts: list[tuple[str, int, int, str, str]] = []
+    for path in paths:
+        try:
+            st = os.stat(path)
+        except OSError:
+            out[path] = None
+            continue
+        if not stat.S_ISREG(st.st_mode):
+            out[path] = None
+            continue
+        row = cached.get(path)
+        if row and row["size"] == st.st_size and row["mtime_ns"] == st.st_mtime_ns:
+            out[path] = {"hash": row["hash"], "changed_at": row["changed_at"],
+                         "mtime_ns": st.st_mtime_ns, "size": st.st_size}
+            continue
+        digest = _hash_file(path)
+        if digest is None:
+            out[path] = None
+            continue
+        if row and row["hash"] == digest:
+            changed_at = row["changed_at"]
+        else:
+            changed_at = datetime.datetime.fromtimestamp(st.st_mtime_ns / 1e9).isoformat()
+        upserts.append((path, st.st_size, st.st_mtime_ns, digest, changed_at))
+        out[path] = {"hash": digest, "changed_at": changed_at,
+                     "mtime_ns": st.st_mtime_ns, "size": st.st_size}
+
+    if not persist:
+        return out
+    cursor.executemany(
+        """INSERT INTO file_hashes (file_path, size, mtime_ns, hash, changed_at)
+           VALUES (?, ?, ?, ?, ?)
+           ON CONFLICT (file_path) DO UPDATE SET
+               size = excluded.size, mtime_ns = excluded.mtime_ns,
+               hash = excluded.hash, changed_at = excluded.changed_at""",
+        upserts,
+    )
+    return out
+
+
+def content_hashes(paths: list[str]) -> dict[str, dict[str, Any] | None]:
+    """hash_lookup on its own connection, committing any cache updates."""
+    conn = get_db()
+    try:
+        result = hash_lookup(conn.cursor(), paths)
+        conn.commit()
+        return result
+    finally:
+        conn.close()
+
+
+def recorded_read_hashes(cursor: sqlite3.Cursor, agent_name: str, paths: list[str]) -> dict[str, str | None]:
+    """content_hash each path had when the agent last read it. Unread paths are absent."""
+    paths = list(dict.fromkeys(paths))
+    out: dict[str, str | None] = {}
+    for i in range(0, len(paths), _SQL_CHUNK):
+        chunk = paths[i:i + _SQL_CHUNK]
+        cursor.execute(
+            f"""SELECT file_path, content_hash FROM agent_files_read
+                WHERE agent_name = ? AND file_path IN ({','.join('?' for _ in chunk)})""",
+            (agent_name, *chunk),
+        )
+        out.update((r["file_path"], r["content_hash"]) for r in cursor.fetchall())
+    return out
+
+
+def record_reads(cursor: sqlite3.Cursor, agent_name: str, files: str) -> int:
+    """Index a comma-separated list of files as read by the agent just now."""
+    now = now_iso()
+    paths = split_file_list(files)
+    current = hash_lookup(cursor, paths)
+    rows: list[tuple[str, str, int | None, int | None, str, str | None]] = []
+    for p in paths:
+        cur = current[p]
+        if cur:
+            rows.append((agent_name, p, cur["mtime_ns"], cur["size"], now, cur["hash"]))
+        else:
+            rows.append((agent_name, p, *_stat_key(p), now, None))
+    cursor.executemany(
+        """INSERT INTO agent_files_read (agent_name, file_path, mtime_ns, size, read_at, stale, content_hash)
+           VALUES (?, ?, ?, ?, ?, 0, ?)
+           ON CONFLICT (agent_name, file_path) DO UPDATE SET
+               mtime_ns = excluded.mtime_ns, size = excluded.size,
+               read_at = excluded.read_at, stale = 0,
+               content_hash = excluded.content_hash""",
+        rows,
+    )
+    return len(rows)
+
+
+def scan_file_changes(agent_name: str = "system") -> dict[str, object]:
+    """Stat every fresh indexed file once and mark content changes stale for all readers.
+
+    Only files whose stat key moved are hashed. Rows whose content still
+    matches get the new stat key so the next scan is stat-only again.
+    """
+    conn = get_db()
+    cursor = conn.cursor()
+    try:
+        cursor.execute(
+            """SELECT DISTINCT file_path, mtime_ns, size, content_hash
+               FROM agent_files_read WHERE stale = 0"""
+        )
+        recorded: dict[str, set[tuple[int | None, int | None, str | None]]] = {}
+        for r in cursor.fetchall():
+            recorded.setdefault(r["file_path"], set()).add((r["mtime_ns"], r["size"], r["content_hash"]))
+
+        moved = [
+            path for path, keys in recorded.items()
+            if {(m, s) for m, s, _ in keys} != {_stat_key(path)}
+        ]
+        current = hash_lookup(cursor, moved)
+        changed: list[tuple[str, str | None]] = []
+        touched: list[tuple[int, int, str, str | None]] = []
+        for path in moved:
+            cur = current[path]
+            digest = cur["hash"] if cur else None
+            if any(h != digest for _, _, h in recorded[path]):
+                changed.append((path, digest))
+            if cur:
+                touched.append((cur["mtime_ns"], cur["size"], path, digest))
+
+        # Collect the readers this pass flips before flipping them, so rows
+        # that were already stale aren't reported again
+        digests = dict(changed)
+        paths = sorted(digests)
+        affected: dict[str, list[str]] = {}
+        for i in range(0, len(paths), _SQL_CHUNK):
+            chunk = paths[i:i + _SQL_CHUNK]
+            cursor.execute(
+                f"""SELECT agent_name, file_path, content_hash FROM agent_files_read
+                    WHERE stale = 0 AND file_path IN ({','.join('?' for _ in chunk)})""",
+                chunk,
+            )
+            for r in cursor.fetchall():
+                if r["content_hash"] != digests[r["file_path"]]:
+                    affected.setdefault(r["agent_name"], []).append(r["file_path"])
+
+        cursor.executemany(
+            """UPDATE agent_files_read SET stale = 1
+               WHERE file_path = ? AND stale = 0 AND content_hash IS NOT ?""",
+            changed,
+        )
+        cursor.executemany(
+            """UPDATE agent_files_read SET mtime_ns = ?, size = ?
+               WHERE file_path = ? AND stale = 0 AND content_hash IS ?""",
+            touched,
+        )
+        if not changed:
+            conn.commit()
+            return {"scanned": len(recorded), "changed": [], "agents": {}}
+
+        for agent, files in sorted(affected.items()):
+            emit_event(cursor, "agent", "reads_stale", agent, agent_name, {"files": sorted(files)})
+        conn.commit()
+        return {
+            "scanned": len(recorded),
+            "changed": paths,
+            "agents": {a: sorted(f) for a, f in sorted(affected.items())},
+        }
+    finally:
+        conn.close()
+
+
+def attach_stale_reads(cursor: sqlite3.Cursor, agents: list[dict[str, Any]]) -> None:
+    """Add stale_reads to enriched agent dicts; any stale read marks context stale."""
+    cursor.execute(
+        "SELECT agent_name, COUNT(*) AS n FROM agent_files_read WHERE stale = 1 GROUP BY agent_name"
+    )
+    counts = {r["agent_name"]: r["n"] for r in cursor.fetchall()}
+    for a in agents:
+        a["stale_reads"] = counts.get(a["name"], 0)
+        if a["stale_reads"]:
+            a["context_stale"] = True
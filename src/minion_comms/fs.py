@@ -63,6 +63,16 @@ def message_file_path(to_agent: str, from_agent: str, slug: str = "msg") -> str:
     return os.path.join(d, fname)
 
 
+def multicast_file_path(from_agent: str, slug: str = "msg") -> str:
+    """Build path: inbox/_multicast/<ts>-<from>-<slug>.md
+
+    One body file shared by every delivery row of a group send.
+    """
+    d = inbox_path("_multicast")
+    fname = f"{_timestamp()}-{_slugify(from_agent, 20)}-{_slugify(slug, 20)}.md"
+    return os.path.join(d, fname)
+
+
 def battle_plan_file_path(agent_name: str) -> str:
     """Build path: battle-plans/<ts>-<agent>-plan.md"""
     os.makedirs(BATTLE_PLAN_DIR, exist_ok=True)
@@ -7,60 +7,151 @@ import os
 from typing import Any
 
 from minion_comms.auth import CLASS_BRIEFING_FILES, get_tools_for_class
-from minion_comms.db import get_db, now_iso
+from minion_comms.db import BRIEFING_EVENT_FILTER, emit_event, get_db, now_iso
 from minion_comms.fs import read_content_file
 
 
-def cold_start(agent_name: str) -> dict[str, object]:
+CONVENTION_FILES = {
+    "intel": ".minion-comms/intel/",
+    "traps": ".minion-comms/traps/",
+    "code_map": ".minion-comms/CODE_MAP.md",
+    "code_owners": ".minion-comms/CODE_OWNERS.md",
+}
+
+
+def _plan_key(plan_file: str | None) -> str:
+    # Plan files are edited in place; the snapshot embeds their content
+    try:
+        st = os.stat(plan_file) if plan_file else None
+    except OSError:
+        st = None
+    return f"{st.st_size}:{st.st_mtime_ns}" if st else ""
+
+
+def _build_briefing(cursor: Any) -> dict[str, Any]:
+    cursor.execute("SELECT * FROM battle_plan WHERE status = 'active' ORDER BY created_at DESC LIMIT 1")
+    plan_row = cursor.fetchone()
+    plan = None
+    if plan_row:
+        plan = dict(plan_row)
+        plan["plan_content"] = read_content_file(plan.get("plan_file"))
+
+    cursor.execute("SELECT * FROM raid_log ORDER BY created_at DESC LIMIT 20")
+    raid_entries = []
+    for row in cursor.fetchall():
+        e = dict(row)
+        e["entry_content"] = read_content_file(e.get("entry_file"))
+        raid_entries.append(e)
+
+    cursor.execute(
+        "SELECT * FROM tasks WHERE status IN ('open', 'assigned', 'in_progress') ORDER BY created_at DESC"
+    )
+    open_tasks = [dict(row) for row in cursor.fetchall()]
+
+    cursor.execute("SELECT name, agent_class, status FROM agents ORDER BY name")
+    agents = [dict(row) for row in cursor.fetchall()]
+
+    return {"battle_plan": plan, "raid_log": raid_entries, "open_tasks": open_tasks, "agents": agents}
+
+
+def briefing_snapshot(cursor: Any) -> tuple[int, dict[str, Any]]:
+    """(version, body) of the shared cold-start briefing, rebuilding it if stale.
+
+    The version is bumped by a trigger on events (see BRIEFING_EVENT_FILTER),
+    so a current snapshot costs one row read plus a stat of the plan file.
+    """
+    cursor.execute("SELECT version, built_version, plan_key, body FROM briefing_snapshot WHERE id = 1")
+    row = cursor.fetchone()
+    version = row["version"] if row else 0
+    if row and row["body"] and row["built_version"] == version:
+        body = json.loads(row["body"])
+        plan = body["battle_plan"]
+        if _plan_key(plan["plan_file"] if plan else None) == row["plan_key"]:
+            return version, body
+
+    body = _build_briefing(cursor)
+    plan = body["battle_plan"]
+    cursor.execute(
+        """INSERT INTO briefing_snapshot (id, version, built_version, plan_key, body, built_at)
+           VALUES (1, ?, ?, ?, ?, ?)
+           ON CONFLICT (id) DO UPDATE SET
+               built_version = excluded.built_version, plan_key = excluded.plan_key,
+               body = excluded.body, built_at = excluded.built_at""",
+        (version, version, _plan_key(plan["plan_file"] if plan else None), json.dumps(body), now_iso()),
+    )
+    return version, body
+
+
+def _briefing_delta(cursor: Any, body: dict[str, Any], since: int, version: int) -> dict[str, Any]:
+    """Parts of `body` touched by briefing events in (since, version]."""
+    cursor.execute(
+        f"""SELECT entity, action, entity_id, data FROM events
+            WHERE seq > ? AND seq <= ? AND ({BRIEFING_EVENT_FILTER})""",
+        (since, version),
+    )
+    task_ids: set[int] = set()
+    raid_ids: set[int] = set()
+    names: set[str] = set()
+    plan_changed = False
+    for r in cursor.fetchall():
+        if r["entity"] == "task" and r["entity_id"]:
+            task_ids.add(int(r["entity_id"]))
+        elif r["entity"] == "raid_log" and r["entity_id"]:
+            raid_ids.add(int(r["entity_id"]))
+        elif r["entity"] == "agent":
+            names.add(r["entity_id"])
+            if r["action"] == "renamed" and r["data"]:
+                names.add(json.loads(r["data"]).get("old"))
+        else:
+            # battle_plan changes, or end_session (which also logs to the raid log)
+            plan_changed = True
+
+    open_tasks = [t for t in body["open_tasks"] if t["id"] in task_ids]
+    agents = [a for a in body["agents"] if a["name"] in names]
+    delta: dict[str, Any] = {
+        "raid_log": body["raid_log"] if plan_changed else [e for e in body["raid_log"] if e["id"] in raid_ids],
+        "open_tasks": open_tasks,
+        "tasks_no_longer_open": sorted(task_ids - {t["id"] for t in open_tasks}),
+        "agents": agents,
+        "agents_gone": sorted(n for n in names - {a["name"] for a in agents} if n),
+    }
+    if plan_changed:
+        delta["battle_plan"] = body["battle_plan"]
+    return delta
+
+
+def cold_start(agent_name: str, since_last: bool = False) -> dict[str, object]:
+    """Bootstrap an agent: battle plan, raid log, open tasks, roster, plus its own records.
+
+    The shared part comes from the materialized briefing snapshot. With
+    since_last, only what changed since this agent's previous cold start is
+    returned (a full briefing if it has none); static onboarding is omitted.
+    """
     conn = get_db()
     cursor = conn.cursor()
     now = now_iso()
     try:
-        cursor.execute("SELECT name, agent_class FROM agents WHERE name = ?", (agent_name,))
+        cursor.execute("SELECT name, agent_class, briefing_version FROM agents WHERE name = ?", (agent_name,))
         agent_row = cursor.fetchone()
         if not agent_row:
             return {"error": f"BLOCKED: Agent '{agent_name}' not registered. Call register first."}
 
         agent_class = agent_row["agent_class"]
-        result: dict[str, Any] = {"agent_name": agent_name, "agent_class": agent_class}
-
-        # Active battle plan
-        cursor.execute("SELECT * FROM battle_plan WHERE status = 'active' ORDER BY created_at DESC LIMIT 1")
-        plan_row = cursor.fetchone()
-        if plan_row:
-            plan = dict(plan_row)
-            plan["plan_content"] = read_content_file(plan.get("plan_file"))
-            result["battle_plan"] = plan
+        version, body = briefing_snapshot(cursor)
+        result: dict[str, Any] = {"agent_name": agent_name, "agent_class": agent_class, "briefing_version": version}
+
+        last = agent_row["briefing_version"]
+        if since_last and last is not None:
+            result["since_version"] = last
+            if last != version:
+                result.update(_briefing_delta(cursor, body, last, version))
+            else:
+                result["unchanged"] = True
         else:
-            result["battle_plan"] = None
-
-        # Recent raid log
-        cursor.execute("SELECT * FROM raid_log ORDER BY created_at DESC LIMIT 20")
-        raid_entries = []
-        for row in cursor.fetchall():
-            e = dict(row)
-            e["entry_content"] = read_content_file(e.get("entry_file"))
-            raid_entries.append(e)
-        result["raid_log"] = raid_entries
-
-        # Open tasks
-        cursor.execute(
-            "SELECT * FROM tasks WHERE status IN ('open', 'assigned', 'in_progress') ORDER BY created_at DESC"
-        )
-        result["open_tasks"] = [dict(row) for row in cursor.fetchall()]
-
-        # Registered agents
-        cursor.execute("SELECT name, agent_class, status, last_seen FROM agents ORDER BY last_seen DESC")
-        result["agents"] = [dict(row) for row in cursor.fetchall()]
-
-        # Briefing files
-        result["briefing_files"] = CLASS_BRIEFING_FILES.get(agent_class, [])
-        result["convention_files"] = {
-            "intel": ".minion-comms/intel/",
-            "traps": ".minion-comms/traps/",
-            "code_map": ".minion-comms/CODE_MAP.md",
-            "code_owners": ".minion-comms/CODE_OWNERS.md",
-        }
+            result.update(body)
+            result["briefing_files"] = CLASS_BRIEFING_FILES.get(agent_class, [])
+            result["convention_files"] = CONVENTION_FILES
+            result["tools"] = get_tools_for_class(agent_class)
 
         # Unconsumed fenix_down records
         cursor.execute(
@@ -78,10 +169,11 @@ def cold_start(agent_name: str) -> dict[str, object]:
                 record_ids,
             )
 
-        # Tool catalog for this class
-        result["tools"] = get_tools_for_class(agent_class)
-
-        cursor.execute("UPDATE agents SET last_seen = ? WHERE name = ?", (now, agent_name))
+        cursor.execute(
+            "UPDATE agents SET last_seen = ?, briefing_version = ? WHERE name = ?", (now, version, agent_name),
+        )
+        emit_event(cursor, "agent", "cold_start", agent_name, agent_name,
+                   {"fenix_down_consumed": [r["id"] for r in fenix_records], "briefing_version": version})
         conn.commit()
 
         return result
@@ -115,6 +207,8 @@ def fenix_down(agent_name: str, files: str, manifest: str = "") -> dict[str, obj
             "UPDATE agents SET status = 'phoenix_down', last_seen = ? WHERE name = ?",
             (now, agent_name),
         )
+        emit_event(cursor, "agent", "status", agent_name, agent_name, {"status": "phoenix_down"})
+        emit_event(cursor, "fenix_down", "recorded", record_id, agent_name, {"files": file_list})
         conn.commit()
 
         return {
@@ -147,6 +241,8 @@ def debrief(agent_name: str, debrief_file: str) -> dict[str, object]:
                VALUES (?, ?, 'critical', ?)""",
             (agent_name, debrief_file, now),
         )
+        emit_event(cursor, "raid_log", "logged", cursor.lastrowid, agent_name,
+                   {"priority": "critical", "entry_file": debrief_file, "debrief": True})
         cursor.execute("UPDATE agents SET last_seen = ? WHERE name = ?", (now, agent_name))
         conn.commit()
 
@@ -221,6 +317,8 @@ def end_session(agent_name: str) -> dict[str, object]:
                VALUES (?, 'SESSION_ENDED', 'critical', ?)""",
             (agent_name, now),
         )
+        emit_event(cursor, "session", "ended", None, agent_name,
+                   {"battle_plan_id": plan_row["id"] if plan_row else None})
         conn.commit()
 
         return {
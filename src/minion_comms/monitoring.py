@@ -7,7 +7,7 @@ import json
 import os
 from typing import Any
 
-from minion_comms.db import enrich_agent_row, get_db, get_lead, now_iso
+from minion_comms.db import enrich_agent_row, get_db, get_lead, get_read_db, now_iso
 from minion_comms.fs import atomic_write_file, message_file_path, read_content_file
 
 
@@ -63,7 +63,7 @@ def _agent_judgment(
 
 
 def party_status() -> dict[str, object]:
-    conn = get_db()
+    conn = get_read_db()
     cursor = conn.cursor()
     now = datetime.datetime.now()
     try:
@@ -110,7 +110,7 @@ def party_status() -> dict[str, object]:
 
 
 def check_activity(agent_name: str) -> dict[str, object]:
-    conn = get_db()
+    conn = get_read_db()
     cursor = conn.cursor()
     now = datetime.datetime.now()
     try:
@@ -151,11 +151,16 @@ def check_activity(agent_name: str) -> dict[str, object]:
             "SELECT file_path, claimed_at FROM file_claims WHERE agent_name = ?",
             (agent_name,),
         )
-        for claim in cursor.fetchall():
+        claims = cursor.fetchall()
+        # Judge activity on content changes — a touch or checkout isn't work
+        from minion_comms.freshness import content_hashes
+        changed = content_hashes([c["file_path"] for c in claims])
+        for claim in claims:
             fp = claim["file_path"]
             mt = _safe_mtime(fp)
             claimed_files.append({"file_path": fp, "claimed_at": claim["claimed_at"], "mtime": mt})
-            claimed_mtimes.append(mt)
+            cur = changed.get(fp)
+            claimed_mtimes.append(cur["changed_at"] if cur else mt)
         result["claimed_files"] = claimed_files
 
         zones: set[str] = set()
@@ -180,7 +185,7 @@ def check_activity(agent_name: str) -> dict[str, object]:
 
 
 def check_freshness(agent_name: str, file_paths: str) -> dict[str, object]:
-    conn = get_db()
+    conn = get_read_db()
     cursor = conn.cursor()
     try:
         cursor.execute("SELECT context_updated_at FROM agents WHERE name = ?", (agent_name,))
@@ -212,26 +217,33 @@ def check_freshness(agent_name: str, file_paths: str) -> dict[str, object]:
 
         try:
             context_dt = datetime.datetime.fromisoformat(context_updated_at)
-            context_ts = context_dt.timestamp()
         except ValueError:
             return {"error": f"Invalid context_updated_at timestamp for '{agent_name}'."}
 
+        # Stale = content changed: against the hash the agent recorded on read,
+        # else against the last content change vs its set-context time.
+        # A read-only check, so the hash cache is consulted but not written.
+        from minion_comms.freshness import hash_lookup, recorded_read_hashes
+        abs_paths = {fp: os.path.abspath(fp) for fp in paths}
+        current = hash_lookup(cursor, list(abs_paths.values()), persist=False)
+        read_hashes = recorded_read_hashes(cursor, agent_name, list(abs_paths.values()))
+
         files_result = []
         stale_count = 0
         for fp in paths:
             entry: dict[str, Any] = {"file_path": fp, "exists": os.path.exists(fp)}
-            if os.path.exists(fp):
-                try:
-                    file_mtime = os.path.getmtime(fp)
-                    entry["mtime"] = datetime.datetime.fromtimestamp(file_mtime).isoformat()
-                    entry["stale"] = file_mtime > context_ts
-                    if entry["stale"]:
-                        stale_count += 1
-                except OSError:
-                    entry["mtime"] = None
-                    entry["stale"] = False
+            cur = current.get(abs_paths[fp])
+            if cur:
+                entry["mtime"] = _safe_mtime(fp)
+                entry["content_changed_at"] = cur["changed_at"]
+                if read_hashes.get(abs_paths[fp]):
+                    entry["stale"] = read_hashes[abs_paths[fp]] != cur["hash"]
+                else:
+                    entry["stale"] = datetime.datetime.fromisoformat(cur["changed_at"]) > context_dt
+                if entry["stale"]:
+                    stale_count += 1
             else:
-                entry["mtime"] = None
+                entry["mtime"] = _safe_mtime(fp) if entry["exists"] else None
                 entry["stale"] = False
             files_result.append(entry)
 
@@ -248,15 +260,25 @@ def check_freshness(agent_name: str, file_paths: str) -> dict[str, object]:
         conn.close()
 
 
-def sitrep() -> dict[str, object]:
+def sitrep(replica: bool = False) -> dict[str, object]:
     """Fused COP: agents + tasks + zones + claims + flags + recent comms in one call."""
-    conn = get_db()
+    replica_info: dict[str, object] = {}
+    if replica:
+        from minion_comms.replica import get_replica_db
+        replica_conn, replica_info = get_replica_db()
+        if replica_conn is None:
+            return replica_info
+        conn = replica_conn
+    else:
+        conn = get_read_db()
     cursor = conn.cursor()
     now = datetime.datetime.now()
     try:
         # Agents with HP
         cursor.execute("SELECT * FROM agents ORDER BY last_seen DESC")
         agents = [enrich_agent_row(row, now) for row in cursor.fetchall()]
+        from minion_comms.freshness import attach_stale_reads
+        attach_stale_reads(cursor, agents)
 
         # Active tasks
         cursor.execute(
@@ -283,7 +305,7 @@ def sitrep() -> dict[str, object]:
         cursor.execute("SELECT from_agent, to_agent, timestamp, is_cc FROM messages ORDER BY timestamp DESC LIMIT 10")
         recent_comms = [dict(row) for row in cursor.fetchall()]
 
-        return {
+        result: dict[str, object] = {
             "agents": agents,
             "active_tasks": active_tasks,
             "file_claims": claims,
@@ -291,6 +313,9 @@ def sitrep() -> dict[str, object]:
             "battle_plan": battle_plan,
             "recent_comms": recent_comms[::-1],
         }
+        if replica:
+            result["replica"] = replica_info
+        return result
     finally:
         conn.close()
 
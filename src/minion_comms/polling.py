@@ -9,11 +9,14 @@ Exit codes (minion-swarm contract):
 
 from __future__ import annotations
 
+import datetime
 import os
-import time
+import signal
+import threading
 from typing import Any
 
-from minion_comms.db import get_db, now_iso
+from minion_comms.auth import CLAIM_LEASE_SECONDS, HEARTBEAT_SECONDS, TASK_LEASE_SECONDS
+from minion_comms.db import emit_event, get_db, get_read_db, lease_expiry, now_iso
 
 
 def _fetch_messages(agent: str) -> list[dict[str, Any]]:
@@ -51,6 +54,9 @@ def _fetch_messages(agent: str) -> list[dict[str, Any]]:
                 (agent, msg["id"]),
             )
 
+        if direct or broadcasts:
+            emit_event(cursor, "message", "read", None, agent,
+                       {"ids": [m["id"] for m in direct + broadcasts]})
         conn.commit()
 
         all_msgs = direct + broadcasts
@@ -74,9 +80,9 @@ def _fetch_messages(agent: str) -> list[dict[str, Any]]:
 
 def _find_available_tasks(agent: str) -> list[dict[str, Any]]:
     """Find claimable tasks for this agent without claiming them."""
-    from minion_comms.flow_bridge import active_statuses
+    from minion_comms.scheduler import next_tasks
 
-    conn = get_db()
+    conn = get_read_db()
     cursor = conn.cursor()
     try:
         # moon_crash blocks
@@ -85,82 +91,101 @@ def _find_available_tasks(agent: str) -> list[dict[str, Any]]:
         if mc and mc["value"] == "1":
             return []
 
-        cursor.execute("SELECT agent_class FROM agents WHERE name = ?", (agent,))
-        row = cursor.fetchone()
-        if not row:
-            return []
-        agent_class = row["agent_class"]
+        return [
+            {
+                "task_id": task["id"],
+                "title": task["title"],
+                "status": task["status"],
+                "priority": task["priority"],
+                "conflicts": task["conflicts"],
+                "task_file": task["task_file"],
+                "claim_cmd": f"minion pull-task --agent {agent} --task-id {task['id']}",
+            }
+            for task in next_tasks(cursor, agent)
+        ]
+    finally:
+        conn.close()
 
-        candidates: list[dict[str, Any]] = []
 
-        # P1: already assigned to agent
-        actives = active_statuses()
-        cursor.execute(
-            """SELECT id, title, task_file, status, class_required, blocked_by
-               FROM tasks WHERE assigned_to = ? AND status IN ({})
-               ORDER BY created_at ASC LIMIT 10""".format(
-                ",".join("?" for _ in actives)
-            ),
-            (agent, *actives),
+def _maintain_leases(agent: str) -> None:
+    """Renew this agent's task and file-claim leases; sweep lapsed ones from others.
+
+    Also the reaper's in-process trigger: any silent agent past the cutoff is
+    swept here, so a crew with live pollers needs no separate reaper loop.
+
+    A read-only probe runs every poll; a write connection is only opened when
+    a lease is past expiry or one of this agent's own is in its second half.
+    """
+    now = now_iso()
+    conn = get_read_db()
+    try:
+        cur = conn.cursor()
+        cur.execute(
+            "SELECT 1 FROM tasks WHERE lease_expires_at IS NOT NULL AND lease_expires_at < ? LIMIT 1",
+            (now,),
+        )
+        has_expired = cur.fetchone() is not None
+        cur.execute(
+            "SELECT 1 FROM tasks WHERE assigned_to = ? AND lease_expires_at < ? LIMIT 1",
+            (agent, lease_expiry(TASK_LEASE_SECONDS // 2)),
+        )
+        needs_renewal = cur.fetchone() is not None
+        cur.execute(
+            "SELECT 1 FROM file_claims WHERE expires_at IS NOT NULL AND expires_at < ? LIMIT 1",
+            (now,),
+        )
+        claims_expired = cur.fetchone() is not None
+        cur.execute(
+            "SELECT 1 FROM file_claims WHERE agent_name = ? AND expires_at < ? LIMIT 1",
+            (agent, lease_expiry(CLAIM_LEASE_SECONDS // 2)),
         )
-        candidates.extend(dict(r) for r in cursor.fetchall())
+        claims_need_renewal = cur.fetchone() is not None
+        from minion_comms.reaper import dead_agents_due
+        reap_due = dead_agents_due(cur)
+    finally:
+        conn.close()
 
-        # P2: open tasks matching class
-        if not candidates:
-            cursor.execute(
-                """SELECT id, title, task_file, status, class_required, blocked_by
-                   FROM tasks WHERE status = 'open' AND class_required = ? AND assigned_to IS NULL
-                   ORDER BY created_at ASC LIMIT 10""",
-                (agent_class,),
-            )
-            candidates.extend(dict(r) for r in cursor.fetchall())
+    if needs_renewal or claims_need_renewal:
+        from minion_comms.filesafety import renew_claims
+        from minion_comms.tasks import renew_task_leases
 
-        # P3: fixed tasks for reviewers
-        if not candidates and agent_class in ("recon", "oracle"):
-            cursor.execute(
-                """SELECT id, title, task_file, status, class_required, blocked_by
-                   FROM tasks WHERE status = 'fixed' AND assigned_to IS NULL
-                   ORDER BY created_at ASC LIMIT 10"""
-            )
-            candidates.extend(dict(r) for r in cursor.fetchall())
+        conn = get_db()
+        try:
+            renew_task_leases(conn.cursor(), agent)
+            renew_claims(conn.cursor(), agent)
+            conn.commit()
+        finally:
+            conn.close()
+    if has_expired:
+        from minion_comms.tasks import reclaim_expired_tasks
 
-        # P4: verified tasks for testers
-        if not candidates and agent_class == "recon":
-            cursor.execute(
-                """SELECT id, title, task_file, status, class_required, blocked_by
-                   FROM tasks WHERE status = 'verified' AND assigned_to IS NULL
-                   ORDER BY created_at ASC LIMIT 10"""
-            )
-            candidates.extend(dict(r) for r in cursor.fetchall())
-
-        # Filter blocked
-        result = []
-        for task in candidates:
-            blocked_by = task.get("blocked_by")
-            if blocked_by:
-                blocker_ids = [int(x.strip()) for x in blocked_by.split(",") if x.strip()]
-                placeholders = ",".join("?" for _ in blocker_ids)
-                cursor.execute(
-                    f"SELECT COUNT(*) FROM tasks WHERE id IN ({placeholders}) AND status != 'closed'",
-                    blocker_ids,
-                )
-                if cursor.fetchone()[0] > 0:
-                    continue
-            result.append({
-                "task_id": task["id"],
-                "title": task["title"],
-                "status": task["status"],
-                "task_file": task["task_file"],
-                "claim_cmd": f"minion pull-task --agent {agent} --task-id {task['id']}",
-            })
-        return result
+        reclaim_expired_tasks()
+    if claims_expired:
+        from minion_comms.filesafety import expire_claims
+
+        expire_claims()
+    if reap_due:
+        from minion_comms.reaper import reap_dead_agents
+
+        reap_dead_agents()
+
+
+def _heartbeat(agent: str, last_seen: str | None) -> None:
+    """Refresh last_seen for an idle poller, at most once per HEARTBEAT_SECONDS."""
+    cutoff = (datetime.datetime.now() - datetime.timedelta(seconds=HEARTBEAT_SECONDS)).isoformat()
+    if last_seen and last_seen >= cutoff:
+        return
+    conn = get_db()
+    try:
+        conn.execute("UPDATE agents SET last_seen = ? WHERE name = ?", (now_iso(), agent))
+        conn.commit()
     finally:
         conn.close()
 
 
 def _check_signals(agent: str) -> str | None:
     """Check stand_down / retire. Returns signal name or None."""
-    conn = get_db()
+    conn = get_read_db()
     try:
         cur = conn.cursor()
         cur.execute("SELECT value FROM flags WHERE key = 'stand_down'")
@@ -175,6 +200,16 @@ def _check_signals(agent: str) -> str | None:
         conn.close()
 
 
+def _signal_result(name: str) -> dict[str, Any]:
+    return {
+        "exit_code": 3,
+        "signal": name,
+        "action": "Do NOT restart polling. The party has been dismissed."
+        if name == "stand_down"
+        else "Do NOT restart polling. You have been retired from the party.",
+    }
+
+
 def poll_loop(agent: str, interval: int = 5, timeout: int = 0) -> dict[str, Any]:
     """Block until messages/tasks arrive, then return them.
 
@@ -184,23 +219,42 @@ def poll_loop(agent: str, interval: int = 5, timeout: int = 0) -> dict[str, Any]
       - tasks: list of available task dicts (if any)
       - signal: "stand_down" or "retire" (if exit_code 3)
       - transport_hint: restart reminder for terminal agents
+
+    The poller registers its PID so stand_down / retire can SIGTERM it
+    instead of waiting out the interval; SIGTERM returns exit code 3.
+    The handler only sets a flag, checked between steps, so a signal never
+    lands in the middle of a DB write.
     """
+    from minion_comms.processes import register_process, unregister_process
+
+    stop = threading.Event()
+
+    def _on_term(signum: int, frame: object) -> None:
+        stop.set()
+
+    register_process(agent, kind="poller")
+    previous = None
+    if threading.current_thread() is threading.main_thread():
+        previous = signal.signal(signal.SIGTERM, _on_term)
+    try:
+        return _poll(agent, interval, timeout, stop)
+    finally:
+        if previous is not None:
+            signal.signal(signal.SIGTERM, previous)
+        unregister_process()
+
+
+def _poll(agent: str, interval: int, timeout: int, stop: threading.Event) -> dict[str, Any]:
     elapsed = 0
 
     while True:
         # Check signals first
-        signal = _check_signals(agent)
-        if signal:
-            return {
-                "exit_code": 3,
-                "signal": signal,
-                "action": "Do NOT restart polling. The party has been dismissed."
-                if signal == "stand_down"
-                else "Do NOT restart polling. You have been retired from the party.",
-            }
+        pending = _check_signals(agent)
+        if pending or stop.is_set():
+            return _signal_result(pending or "retire")
 
         # Check for messages (peek — don't consume yet)
-        conn = get_db()
+        conn = get_read_db()
         try:
             cur = conn.cursor()
             cur.execute("SELECT COUNT(*) FROM messages WHERE to_agent = ? AND read_flag = 0", (agent,))
@@ -215,15 +269,26 @@ def poll_loop(agent: str, interval: int = 5, timeout: int = 0) -> dict[str, Any]
             has_messages = (direct + broadcast) > 0
 
             # Get transport
-            cur.execute("SELECT transport FROM agents WHERE name = ?", (agent,))
+            cur.execute("SELECT transport, last_seen FROM agents WHERE name = ?", (agent,))
             row = cur.fetchone()
             transport = row["transport"] if row else "terminal"
         finally:
             conn.close()
 
+        # A blocked poll is presence — keep the reaper off this agent
+        if row:
+            _heartbeat(agent, row["last_seen"])
+
+        # Keep our claims alive, return abandoned ones to the pool
+        _maintain_leases(agent)
+
         # Find available tasks
         available_tasks = _find_available_tasks(agent)
 
+        # SIGTERM during this pass: leave the messages unread for the next poller
+        if stop.is_set():
+            return _signal_result(_check_signals(agent) or "retire")
+
         if has_messages or available_tasks:
             # Consume messages
             messages = _fetch_messages(agent) if has_messages else []
@@ -240,7 +305,7 @@ def poll_loop(agent: str, interval: int = 5, timeout: int = 0) -> dict[str, Any]
                 )
             return result
 
-        time.sleep(interval)
+        stop.wait(interval)
         elapsed += interval
 
         if timeout > 0 and elapsed >= timeout:
@@ -0,0 +1,155 @@
+"""Process registry — PIDs of daemon and poller processes, for direct signalling.
+
+stand_down and retire_agent used to only set DB flags and wait for each
+agent's next poll to notice. Daemons and pollers now register their PID
+here with a start token (kernel start time), so shutdown can signal them
+directly: SIGTERM, a short graceful window, then SIGKILL for stragglers.
+
+The start token is what makes this safe: a PID whose current process has
+a different start time (or that is gone, or a zombie) is a stale row, and
+is pruned rather than signalled — a recycled PID never gets our SIGTERM.
+"""
+
+from __future__ import annotations
+
+import os
+import signal
+import sqlite3
+import subprocess
+import time
+
+from minion_comms.db import emit_event, get_db, get_read_db, now_iso
+
+DEFAULT_GRACE_SECONDS = 3.0
+_WAIT_STEP = 0.05
+
+
+def process_start_token(pid: int) -> str | None:
+    """Opaque start-time token for a live process; None if gone or a zombie."""
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            stat = f.read()
+    except FileNotFoundError:
+        return None
+    except OSError:
+        stat = ""
+    if stat:
+        fields = stat[stat.rindex(")") + 2:].split()
+        return None if fields[0] in ("Z", "X") else fields[19]
+
+    # No procfs (macOS): ps reports state and start time
+    result = subprocess.run(["ps", "-o", "stat=,lstart=", "-p", str(pid)], capture_output=True, text=True)
+    out = result.stdout.strip()
+    if result.returncode != 0 or not out or out.startswith("Z"):
+        return None
+    return out.split(None, 1)[1]
+
+
+def register_process(agent_name: str, pid: int = 0, kind: str = "poller") -> dict[str, object]:
+    """Record a process acting for an agent. pid=0 registers the caller."""
+    pid = pid or os.getpid()
+    token = process_start_token(pid)
+    if token is None:
+        return {"error": f"BLOCKED: No live process with PID {pid}."}
+    conn = get_db()
+    try:
+        conn.execute(
+            """INSERT INTO agent_processes (pid, agent_name, kind, start_token, registered_at)
+               VALUES (?, ?, ?, ?, ?)
+               ON CONFLICT (pid) DO UPDATE SET
+                   agent_name = excluded.agent_name, kind = excluded.kind,
+                   start_token = excluded.start_token, registered_at = excluded.registered_at""",
+            (pid, agent_name, kind, token, now_iso()),
+        )
+        conn.commit()
+        return {"status": "registered", "agent": agent_name, "pid": pid, "kind": kind}
+    finally:
+        conn.close()
+
+
+def unregister_process(pid: int = 0) -> None:
+    conn = get_db()
+    try:
+        conn.execute("DELETE FROM agent_processes WHERE pid = ?", (pid or os.getpid(),))
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def _send(pid: int, sig: int) -> None:
+    # Daemons started in their own session take their children down with them
+    try:
+        if os.getpgid(pid) == pid:
+            os.killpg(pid, sig)
+        else:
+            os.kill(pid, sig)
+    except ProcessLookupError:
+        pass
+
+
+def signal_agents(
+    agent_names: list[str] | None = None,
+    requested_by: str = "system",
+    grace: float = DEFAULT_GRACE_SECONDS,
+    exclude: tuple[str, ...] = (),
+) -> dict[str, object]:
+    """SIGTERM the registered processes of `agent_names` (None = all), SIGKILL after `grace`.
+
+    Agents in `exclude` (typically the caller) and this process are spared.
+    Returns {"terminated": [...], "killed": [...], "stale": [...]} as
+    {"agent", "pid", "kind"} dicts. Every handled row is removed.
+    """
+    conn = get_read_db()
+    rows: list[sqlite3.Row]
+    try:
+        if agent_names is None:
+            rows = conn.execute("SELECT * FROM agent_processes ORDER BY pid").fetchall()
+        else:
+            if not agent_names:
+                return {"terminated": [], "killed": [], "stale": []}
+            rows = conn.execute(
+                f"SELECT * FROM agent_processes WHERE agent_name IN ({','.join('?' for _ in agent_names)}) ORDER BY pid",
+                agent_names,
+            ).fetchall()
+    finally:
+        conn.close()
+
+    live: list[sqlite3.Row] = []
+    stale: list[sqlite3.Row] = []
+    for r in (r for r in rows if r["agent_name"] not in exclude):
+        (live if process_start_token(r["pid"]) == r["start_token"] else stale).append(r)
+    me = os.getpid()
+    live = [r for r in live if r["pid"] != me]
+    for r in live:
+        _send(r["pid"], signal.SIGTERM)
+
+    deadline = time.monotonic() + grace
+    pending: list[sqlite3.Row] = list(live)
+    while pending and time.monotonic() < deadline:
+        time.sleep(_WAIT_STEP)
+        pending = [r for r in pending if process_start_token(r["pid"]) == r["start_token"]]
+    for r in pending:
+        _send(r["pid"], signal.SIGKILL)
+
+    killed: set[int] = {r["pid"] for r in pending}
+    handled = live + stale
+    conn = get_db()
+    try:
+        cursor = conn.cursor()
+        cursor.executemany("DELETE FROM agent_processes WHERE pid = ?", [(r["pid"],) for r in handled])
+        for r in live:
+            emit_event(cursor, "agent", "signalled", r["agent_name"], requested_by, {
+                "pid": r["pid"], "kind": r["kind"], "signal": "SIGKILL" if r["pid"] in killed else "SIGTERM",
+            })
+        conn.commit()
+    finally:
+        conn.close()
+
+    def _brief(rs: list[sqlite3.Row]) -> list[dict[str, object]]:
+        return [{"agent": r["agent_name"], "pid": r["pid"], "kind": r["kind"]} for r in rs]
+
+    return {
+        "terminated": _brief([r for r in live if r["pid"] not in killed]),
+        "killed": _brief(pending),
+        "stale": _brief(stale),
+    }
@@ -0,0 +1,169 @@
+"""Reaper — act on agents that have gone silent.
+
+_agent_judgment only labels an agent "possibly dead" when someone asks.
+reap_dead_agents does something about it: every non-lead agent whose
+last_seen is older than AGENT_DEAD_SECONDS has its waitlist entries
+dropped, its file claims handed to their waitlists, its tasks requeued,
+and is stamped reaped_at so class and zone sends skip it. The lead gets
+one summary message per sweep. An agent whose claimed files changed
+content inside the window is still working without making comms calls:
+it is spared, and that change counts as it being seen.
+
+An agent that speaks again moves last_seen past reaped_at, which is all
+it takes to count as alive — sends include it and a later silence reaps
+it again. A sweep is a fixed handful of indexed queries however large the
+crew; pollers run it opportunistically (polling._maintain_leases) and
+`minion reap --interval N` runs it as a standalone loop.
+"""
+
+from __future__ import annotations
+
+import datetime
+import time
+from typing import Any
+
+from minion_comms.auth import AGENT_DEAD_SECONDS
+from minion_comms.db import emit_event, get_db, get_lead, now_iso
+from minion_comms.fs import atomic_write_file, message_file_path
+
+# Alive = seen since the last reaping (or never reaped)
+ALIVE_SQL = "(reaped_at IS NULL OR last_seen > reaped_at)"
+
+
+def _cutoff(dead_after: int) -> str:
+    return (datetime.datetime.now() - datetime.timedelta(seconds=dead_after)).isoformat()
+
+
+def dead_agents_due(cursor: Any, dead_after: int = AGENT_DEAD_SECONDS) -> bool:
+    """Cheap probe: is any live non-lead agent past the silence cutoff?"""
+    cursor.execute(
+        f"""SELECT 1 FROM agents WHERE last_seen < ? AND agent_class != 'lead'
+            AND {ALIVE_SQL} LIMIT 1""",
+        (_cutoff(dead_after),),
+    )
+    return cursor.fetchone() is not None
+
+
+def _editing_agents(cursor: Any, names: list[str], cutoff: str) -> dict[str, str]:
+    """Agents among `names` whose claimed files changed content after `cutoff` → latest change."""
+    from minion_comms.freshness import hash_lookup
+
+    cursor.execute(
+        f"SELECT agent_name, file_path FROM file_claims WHERE agent_name IN ({','.join('?' for _ in names)})",
+        names,
+    )
+    claims = cursor.fetchall()
+    if not claims:
+        return {}
+    hashes = hash_lookup(cursor, [c["file_path"] for c in claims])
+    editing: dict[str, str] = {}
+    for c in claims:
+        h = hashes.get(c["file_path"])
+        if h and h["changed_at"] > cutoff and h["changed_at"] > editing.get(c["agent_name"], ""):
+            editing[c["agent_name"]] = h["changed_at"]
+    return editing
+
+
+def reap_dead_agents(agent_name: str = "system", dead_after: int = AGENT_DEAD_SECONDS) -> dict[str, Any]:
+    """One sweep: release, requeue and mark every silent agent, then tell the lead."""
+    from minion_comms.filesafety import release_claims
+    from minion_comms.flow_bridge import active_statuses
+    from minion_comms.tasks import requeue_tasks
+
+    statuses = active_statuses()
+    conn = get_db()
+    cursor = conn.cursor()
+    now = now_iso()
+    try:
+        cursor.execute("BEGIN IMMEDIATE")
+        cutoff = _cutoff(dead_after)
+        cursor.execute(
+            f"""SELECT name, last_seen FROM agents WHERE last_seen < ? AND agent_class != 'lead'
+                AND {ALIVE_SQL} ORDER BY name""",
+            (cutoff,),
+        )
+        dead = cursor.fetchall()
+        editing = _editing_agents(cursor, [r["name"] for r in dead], cutoff) if dead else {}
+        if editing:
+            cursor.executemany("UPDATE agents SET last_seen = ? WHERE name = ?", [(t, n) for n, t in editing.items()])
+            dead = [r for r in dead if r["name"] not in editing]
+        if not dead:
+            conn.commit()
+            return {"status": "ok", "reaped": []}
+
+        names = [r["name"] for r in dead]
+        in_names = ",".join("?" for _ in names)
+        cursor.execute(f"DELETE FROM file_waitlist WHERE agent_name IN ({in_names})", names)
+        cursor.execute(f"SELECT * FROM file_claims WHERE agent_name IN ({in_names}) ORDER BY file_path", names)
+        claims = cursor.fetchall()
+        promoted, _ = release_claims(cursor, agent_name, claims) if claims else ({}, {})
+
+        cursor.execute(
+            f"""SELECT id, status, assigned_to FROM tasks
+                WHERE assigned_to IN ({in_names}) AND status IN ({','.join('?' for _ in statuses)})
+                ORDER BY id""",
+            [*names, *statuses],
+        )
+        tasks = cursor.fetchall()
+        requeued = requeue_tasks(cursor, tasks, agent_name, now) if tasks else []
+        cursor.execute(f"UPDATE agents SET reaped_at = ? WHERE name IN ({in_names})", [now, *names])
+
+        reaped: list[dict[str, Any]] = []
+        for r in dead:
+            entry = {
+                "agent": r["name"],
+                "last_seen": r["last_seen"],
+                "released_claims": [c["file_path"] for c in claims if c["agent_name"] == r["name"]],
+                "requeued_tasks": [t["task_id"] for t in requeued if t["from_agent"] == r["name"]],
+            }
+            reaped.append(entry)
+            emit_event(cursor, "agent", "reaped", r["name"], agent_name, {
+                "last_seen": r["last_seen"],
+                "claims": entry["released_claims"],
+                "tasks": entry["requeued_tasks"],
+            })
+
+        lead = get_lead(cursor)
+        if lead:
+            lines = [f"Reaped {len(reaped)} agent(s) silent for over {dead_after // 60}m:"]
+            for e in reaped:
+                lines.append(
+                    f"- {e['agent']} (last seen {e['last_seen']}): "
+                    f"{len(e['released_claims'])} claim(s) released, "
+                    f"tasks requeued: {', '.join(f'#{t}' for t in e['requeued_tasks']) or 'none'}"
+                )
+            content_file = message_file_path(lead, "system", "reaper")
+            atomic_write_file(content_file, "\n".join(lines))
+            cursor.execute(
+                "INSERT INTO messages (from_agent, to_agent, content_file, timestamp, read_flag, is_cc) VALUES (?, ?, ?, ?, 0, 0)",
+                ("system", lead, content_file, now),
+            )
+            emit_event(cursor, "message", "sent", content_file, "system", {"to": lead, "recipients": [lead], "cc": []})
+
+        conn.commit()
+        result: dict[str, Any] = {"status": "ok", "reaped": reaped, "notified": lead}
+        if promoted:
+            result["promoted"] = promoted
+        return result
+    finally:
+        conn.close()
+
+
+def run_reaper(
+    agent_name: str = "system",
+    interval: int = 60,
+    ticks: int = 0,
+    dead_after: int = AGENT_DEAD_SECONDS,
+) -> dict[str, object]:
+    """Sweep every `interval` seconds. ticks=0 runs until interrupted."""
+    reaped: list[dict[str, Any]] = []
+    tick = 0
+    try:
+        while not ticks or tick < ticks:
+            if tick:
+                time.sleep(interval)
+            tick += 1
+            reaped.extend(reap_dead_agents(agent_name, dead_after)["reaped"])
+    except KeyboardInterrupt:
+        pass
+    return {"status": "ok", "ticks": tick, "reaped": reaped}
@@ -0,0 +1,166 @@
+"""Read replica — a follower copy of minion.db for dashboards and analytics.
+
+The follower is rebuilt with SQLite's online backup API, copying `pages`
+at a time so the live DB is never locked for long. Each sync lands in a
+temp file that is renamed over the follower, so readers on the old file
+keep a consistent snapshot and never contend with the copy.
+
+Lag is measured in events (see changes.py): the follower records the
+outbox head it was copied at and when. Readers only ever open the
+follower and report its age from that record; keeping it current is
+run_replicator's job, so reader load never lands on the live DB.
+"""
+
+from __future__ import annotations
+
+import datetime
+import os
+import sqlite3
+import tempfile
+import time
+
+import minion_comms.db as db
+from minion_comms.db import get_db, get_read_db, now_iso
+from minion_comms.defaults import resolve_replica_path
+
+# Followers older than this are reported stale to readers
+REPLICA_MAX_LAG_SECONDS = 30
+
+_META_SQL = """
+CREATE TABLE IF NOT EXISTS replica_meta (
+    key     TEXT PRIMARY KEY,
+    value   TEXT NOT NULL
+);
+"""
+
+
+def replica_path() -> str:
+    """Follower path for the current DB (resolved at call time)."""
+    return resolve_replica_path(db.DB_PATH)
+
+
+def sync_replica(path: str = "", pages: int = 256) -> dict[str, object]:
+    """Copy the live DB to the follower in `pages`-sized backup steps."""
+    path = path or replica_path()
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    started = time.monotonic()
+
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix=".replica.tmp")
+    os.close(fd)
+    src = get_db()
+    dst = sqlite3.connect(tmp)
+    try:
+        src.backup(dst, pages=pages)
+        # Followers are opened read-only — rollback journal avoids needing -wal/-shm
+        dst.execute("PRAGMA journal_mode=DELETE")
+        seq = dst.execute("SELECT COALESCE(MAX(seq), 0) FROM events").fetchone()[0]
+        dst.executescript(_META_SQL)
+        dst.executemany(
+            "INSERT OR REPLACE INTO replica_meta (key, value) VALUES (?, ?)",
+            [("source_seq", str(seq)), ("synced_at", now_iso()), ("source_path", db.DB_PATH)],
+        )
+        dst.commit()
+    except BaseException:
+        dst.close()
+        os.unlink(tmp)
+        raise
+    finally:
+        src.close()
+    dst.close()
+    os.replace(tmp, path)
+
+    return {
+        "status": "synced",
+        "replica": path,
+        "source_seq": seq,
+        "elapsed_ms": round((time.monotonic() - started) * 1000, 1),
+    }
+
+
+def _read_meta(path: str) -> dict[str, str]:
+    if not os.path.exists(path):
+        return {}
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        return {k: v for k, v in conn.execute("SELECT key, value FROM replica_meta")}
+    except sqlite3.OperationalError:
+        return {}
+    finally:
+        conn.close()
+
+
+def _age_seconds(meta: dict[str, str]) -> float | None:
+    try:
+        synced = datetime.datetime.fromisoformat(meta["synced_at"])
+    except (KeyError, ValueError):
+        return None
+    return round((datetime.datetime.now() - synced).total_seconds(), 1)
+
+
+def replica_status(path: str = "") -> dict[str, object]:
+    """Report how far the follower trails the live DB."""
+    path = path or replica_path()
+    conn = get_read_db()
+    try:
+        head = conn.execute("SELECT COALESCE(MAX(seq), 0) FROM events").fetchone()[0]
+    finally:
+        conn.close()
+
+    meta = _read_meta(path)
+    if not meta:
+        return {"replica": path, "exists": os.path.exists(path), "source_seq": head, "replica_seq": None}
+
+    replica_seq = int(meta.get("source_seq", "0"))
+    result: dict[str, object] = {
+        "replica": path,
+        "exists": True,
+        "source_seq": head,
+        "replica_seq": replica_seq,
+        "lag_events": head - replica_seq,
+        "synced_at": meta.get("synced_at"),
+    }
+    age = _age_seconds(meta)
+    if age is not None:
+        result["age_seconds"] = age
+    return result
+
+
+def follower_status(path: str = "", max_lag_seconds: float = REPLICA_MAX_LAG_SECONDS) -> dict[str, object]:
+    """Staleness from the follower's own replica_meta — never opens the live DB."""
+    path = path or replica_path()
+    meta = _read_meta(path)
+    if not meta:
+        return {"replica": path, "replica_seq": None}
+    age = _age_seconds(meta)
+    result: dict[str, object] = {
+        "replica": path,
+        "replica_seq": int(meta.get("source_seq", "0")),
+        "synced_at": meta.get("synced_at"),
+        "stale": age is None or age >= max_lag_seconds,
+    }
+    if age is not None:
+        result["age_seconds"] = age
+    return result
+
+
+def get_replica_db(
+    path: str = "", max_lag_seconds: float = REPLICA_MAX_LAG_SECONDS,
+) -> tuple[sqlite3.Connection | None, dict[str, object]]:
+    """Open the follower read-only, with its follower_status.
+
+    Returns (None, {"error": ...}) if no follower has been synced yet.
+    """
+    status = follower_status(path, max_lag_seconds)
+    if status["replica_seq"] is None:
+        return None, {"error": f"BLOCKED: No read replica at {status['replica']}. Run `minion replicate --follow` first."}
+    return get_read_db(str(status["replica"])), status
+
+
+def run_replicator(path: str = "", interval: float = 2.0, pages: int = 256) -> None:
+    """Follow the live DB forever, re-syncing whenever new events commit."""
+    path = path or replica_path()
+    while True:
+        status = replica_status(path)
+        if status.get("replica_seq") is None or status.get("lag_events"):
+            sync_replica(path, pages)
+        time.sleep(interval)
@@ -0,0 +1,206 @@
+"""Task scheduler — pick the next task(s) an agent should work on.
+
+One query replaces the old tiered scan in polling:
+
+  tier 0 — tasks already held by the agent (live lease)
+  tier 1 — open tasks for the agent's class
+  tier 2 — fixed tasks awaiting review (recon / oracle)
+  tier 3 — verified tasks awaiting test (recon)
+
+Within a tier: tasks whose files nobody else has claimed first, then
+higher priority, then tasks in the agent's current zone, then oldest first.
+Tiers 1-3 are only offered while the agent holds fewer than
+TASK_INFLIGHT_CAP tasks, so one worker can't hoard the queue. Blockers
+and file overlaps are checked against the indexed task_dependencies and
+task_files tables.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+from typing import Any
+
+from minion_comms.auth import TASK_INFLIGHT_CAP
+from minion_comms.db import get_read_db, now_iso
+
+_REVIEW_CLASSES = ("recon", "oracle")
+_TEST_CLASSES = ("recon",)
+
+_UNBLOCKED = """NOT EXISTS (
+    SELECT 1 FROM task_dependencies d JOIN tasks b ON b.id = d.blocker_id
+    WHERE d.task_id = t.id AND b.status != 'closed'
+)"""
+
+# A claim row that may cover task file tf: exact match, or a directory/glob
+# claim whose prefix is an ancestor (globs are refined in Python where exact
+# answers matter; for ranking, the prefix is close enough)
+_CLAIM_JOIN = """JOIN file_claims fc ON (
+    fc.file_path = tf.file_path
+    OR (fc.kind != 'file' AND substr(tf.file_path, 1, length(fc.prefix)) = fc.prefix)
+)"""
+
+# Files in the task's set currently claimed by someone other than the puller
+_CONFLICTS = f"""(
+    SELECT COUNT(*) FROM task_files tf {_CLAIM_JOIN}
+    WHERE tf.task_id = q.id AND fc.agent_name != ?
+)"""
+
+_COLUMNS = "t.id, t.title, t.task_file, t.status, t.priority, t.zone, t.class_required, t.created_at"
+
+
+def inflight_count(cursor: sqlite3.Cursor, agent: str) -> int:
+    """Tasks the agent currently holds in a non-terminal status."""
+    from minion_comms.flow_bridge import active_statuses
+
+    actives = active_statuses()
+    cursor.execute(
+        f"SELECT COUNT(*) FROM tasks WHERE assigned_to = ? AND status IN ({','.join('?' for _ in actives)})",
+        (agent, *actives),
+    )
+    return cursor.fetchone()[0]
+
+
+def next_tasks(
+    cursor: sqlite3.Cursor,
+    agent: str,
+    limit: int = 10,
+    inflight_cap: int = TASK_INFLIGHT_CAP,
+) -> list[dict[str, Any]]:
+    """Return up to `limit` claimable tasks for the agent, best first."""
+    from minion_comms.flow_bridge import active_statuses
+
+    cursor.execute("SELECT agent_class, current_zone FROM agents WHERE name = ?", (agent,))
+    row = cursor.fetchone()
+    if not row:
+        return []
+    agent_class = row["agent_class"]
+    zone = row["current_zone"] or ""
+
+    actives = active_statuses()
+    branches = [
+        f"""SELECT 0 AS tier, {_COLUMNS} FROM tasks t
+            WHERE t.assigned_to = ? AND t.status IN ({','.join('?' for _ in actives)})
+            AND (t.lease_expires_at IS NULL OR t.lease_expires_at >= ?)"""
+    ]
+    params: list[object] = [agent, *actives, now_iso()]
+
+    if inflight_count(cursor, agent) < inflight_cap:
+        branches.append(
+            f"""SELECT 1, {_COLUMNS} FROM tasks t
+                WHERE t.status = 'open' AND t.class_required = ? AND t.assigned_to IS NULL"""
+        )
+        params.append(agent_class)
+        if agent_class in _REVIEW_CLASSES:
+            branches.append(
+                f"SELECT 2, {_COLUMNS} FROM tasks t WHERE t.status = 'fixed' AND t.assigned_to IS NULL"
+            )
+        if agent_class in _TEST_CLASSES:
+            branches.append(
+                f"SELECT 3, {_COLUMNS} FROM tasks t WHERE t.status = 'verified' AND t.assigned_to IS NULL"
+            )
+
+    union = " UNION ALL ".join(f"SELECT * FROM ({b} AND {_UNBLOCKED})" for b in branches)
+    cursor.execute(
+        f"""SELECT q.*, {_CONFLICTS} AS conflicts FROM ({union}) q
+            ORDER BY tier ASC, conflicts > 0, priority DESC,
+                     CASE WHEN ? != '' AND zone = ? THEN 0 ELSE 1 END,
+                     created_at ASC
+            LIMIT ?""",
+        (agent, *params, zone, zone, limit),
+    )
+    return [dict(r) for r in cursor.fetchall()]
+
+
+def claimable_depth(cursor: sqlite3.Cursor) -> dict[str, int]:
+    """Unassigned, unblocked tasks each agent class could pull right now.
+
+    Same tiers as next_tasks: open work by class_required, fixed tasks for
+    reviewers, verified tasks for testers. A review task counts toward
+    every class that may take it.
+    """
+    cursor.execute(
+        f"""SELECT t.class_required, t.status, COUNT(*) AS n FROM tasks t
+            WHERE t.assigned_to IS NULL AND t.status IN ('open', 'fixed', 'verified')
+            AND {_UNBLOCKED}
+            GROUP BY t.class_required, t.status"""
+    )
+    depth: dict[str, int] = {}
+    for r in cursor.fetchall():
+        if r["status"] == "open":
+            classes: tuple[str, ...] = (r["class_required"],) if r["class_required"] else ()
+        elif r["status"] == "fixed":
+            classes = _REVIEW_CLASSES
+        else:
+            classes = _TEST_CLASSES
+        for cls in classes:
+            depth[cls] = depth.get(cls, 0) + r["n"]
+    return depth
+
+
+def file_conflicts(cursor: sqlite3.Cursor, task_id: int, agent: str) -> list[dict[str, str]]:
+    """Files in the task's set that another agent has claimed."""
+    from minion_comms.filesafety import claim_covers
+
+    cursor.execute(
+        f"""SELECT tf.file_path, fc.agent_name, fc.kind, fc.file_path AS claim FROM task_files tf
+            {_CLAIM_JOIN}
+            WHERE tf.task_id = ? AND fc.agent_name != ?
+            ORDER BY tf.file_path""",
+        (task_id, agent),
+    )
+    return [
+        {"file": r["file_path"], "claimed_by": r["agent_name"]}
+        for r in cursor.fetchall() if claim_covers(r["kind"], r["claim"], r["file_path"])
+    ]
+
+
+def get_conflicts() -> dict[str, object]:
+    """Report active tasks whose file sets overlap each other or another agent's claims."""
+    from minion_comms.filesafety import claim_covers
+    from minion_comms.flow_bridge import active_statuses
+
+    actives = active_statuses()
+    placeholders = ",".join("?" for _ in actives)
+    conn = get_read_db()
+    cursor = conn.cursor()
+    try:
+        cursor.execute(
+            f"""SELECT a.file_path, ta.id AS task_a, ta.assigned_to AS agent_a,
+                       tb.id AS task_b, tb.assigned_to AS agent_b
+                FROM task_files a
+                JOIN task_files b ON b.file_path = a.file_path AND b.task_id > a.task_id
+                JOIN tasks ta ON ta.id = a.task_id AND ta.status IN ({placeholders})
+                JOIN tasks tb ON tb.id = b.task_id AND tb.status IN ({placeholders})
+                ORDER BY a.file_path, ta.id, tb.id""",
+            (*actives, *actives),
+        )
+        overlaps = [dict(r) for r in cursor.fetchall()]
+
+        cursor.execute(
+            f"""SELECT tf.file_path, t.id AS task_id, t.assigned_to, fc.agent_name AS claimed_by,
+                       fc.kind, fc.file_path AS claim
+                FROM task_files tf
+                JOIN tasks t ON t.id = tf.task_id AND t.status IN ({placeholders})
+                {_CLAIM_JOIN}
+                WHERE t.assigned_to IS NULL OR fc.agent_name != t.assigned_to
+                ORDER BY tf.file_path, t.id""",
+            actives,
+        )
+        claimed = [
+            {k: r[k] for k in ("file_path", "task_id", "assigned_to", "claimed_by")}
+            | ({"claim": r["claim"]} if r["kind"] != "file" else {})
+            for r in cursor.fetchall() if claim_covers(r["kind"], r["claim"], r["file_path"])
+        ]
+
+        return {"task_overlaps": overlaps, "claim_conflicts": claimed}
+    finally:
+        conn.close()
+
+
+def has_open_blockers(cursor: sqlite3.Cursor, task_id: int) -> bool:
+    cursor.execute(
+        """SELECT 1 FROM task_dependencies d JOIN tasks b ON b.id = d.blocker_id
+           WHERE d.task_id = ? AND b.status != 'closed' LIMIT 1""",
+        (task_id,),
+    )
+    return cursor.fetchone() is not None
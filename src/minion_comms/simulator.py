@@ -0,0 +1,330 @@
+"""Crew capacity simulator — discrete-event model of the task flow.
+
+Replays a backlog through the flow DAG from flow_bridge with a candidate
+crew composition and reports throughput, time to drain and which stage
+or class is the bottleneck. Nothing touches the live DB except reading
+task_history (to learn service times and pass rates) and the open backlog.
+
+Model: a task waits in a stage queue until an idle agent of an eligible
+class picks it up. That agent keeps the task across stages while
+workers_for() says "assignee continues" (None), and releases it when the
+next stage names its own worker classes (e.g. fixed → oracle/recon). A
+failed review sends the task back to the class that first pulled it.
+Service time per stage is bootstrapped from history when there are
+enough samples, otherwise exponential around DEFAULT_SERVICE_SECONDS.
+"""
+
+from __future__ import annotations
+
+import datetime
+import heapq
+import random
+import time
+from typing import Any
+
+from minion_comms.db import get_read_db
+from minion_comms.flow_bridge import active_statuses, is_terminal, next_status, workers_for
+
+DEFAULT_SERVICE_SECONDS = 600.0
+MIN_SAMPLES = 5
+MAX_STAGES_PER_TASK = 50
+
+
+# -- Learning from history --
+
+def learn_service_model(task_type: str = "bugfix") -> dict[str, Any]:
+    """Per-stage service-time samples and pass rates from task_history.
+
+    Service time is measured from the moment someone holds the task in a
+    stage (the pull, or stage entry if it was never re-pulled) to the
+    moment it leaves. The flow's entry stage is skipped — leaving it *is*
+    the pull, so its dwell is pure queue wait.
+    """
+    entry = active_statuses(task_type)[0] if active_statuses(task_type) else "open"
+    samples: dict[str, list[float]] = {}
+    passes: dict[str, list[int]] = {}
+
+    conn = get_read_db()
+    try:
+        rows = conn.execute(
+            """SELECT h.task_id, h.from_status, h.to_status, h.timestamp
+               FROM task_history h JOIN tasks t ON t.id = h.task_id
+               WHERE COALESCE(t.task_type, 'bugfix') = ?
+               ORDER BY h.task_id, h.id""",
+            (task_type,),
+        ).fetchall()
+    finally:
+        conn.close()
+
+    current: int | None = None
+    started: datetime.datetime | None = None
+    for r in rows:
+        ts = datetime.datetime.fromisoformat(r["timestamp"])
+        if r["task_id"] != current:
+            current, started = r["task_id"], None
+        frm, to = r["from_status"], r["to_status"]
+        if frm is None:
+            started = ts
+            continue
+        if frm == to:
+            started = ts  # re-pull: the holder starts the clock now
+            continue
+        if frm != entry and started is not None:
+            samples.setdefault(frm, []).append((ts - started).total_seconds())
+        fail_target = next_status(frm, task_type, passed=False)
+        if fail_target is not None:
+            passes.setdefault(frm, []).append(0 if to == fail_target else 1)
+        started = ts
+
+    return {
+        "samples": samples,
+        "pass_rate": {s: sum(v) / len(v) for s, v in passes.items() if v},
+    }
+
+
+# -- Simulation --
+
+def _service(rng: random.Random, model: dict[str, Any], status: str) -> float:
+    samples = model["samples"].get(status, [])
+    if len(samples) >= MIN_SAMPLES:
+        return rng.choice(samples)
+    mean = sum(samples) / len(samples) if samples else DEFAULT_SERVICE_SECONDS
+    return rng.expovariate(1.0 / max(mean, 1.0))
+
+
+def simulate(
+    crew: dict[str, int],
+    tasks: list[str],
+    model: dict[str, Any],
+    task_type: str = "bugfix",
+    seed: int = 0,
+) -> dict[str, object]:
+    """Run one simulation. `tasks` is the class_required of each backlog task."""
+    rng = random.Random(seed)
+    entry = active_statuses(task_type)[0]
+
+    idle: dict[str, int] = dict(crew)
+    busy_time: dict[str, float] = {c: 0.0 for c in crew}
+    # Ready tasks per eligible class, ordered (stage rank, arrival). A task
+    # eligible for several classes sits in each heap; `live` drops the copies.
+    ready: dict[str, list[tuple[int, int, int, float, str]]] = {}
+    live: set[int] = set()
+    stage_rank: dict[str, int] = {}
+    queued: dict[str, int] = {}
+    eligible: dict[int, list[str]] = {}
+    owner: dict[int, str] = {}
+    waits: dict[str, list[float]] = {}
+    max_queue: dict[str, int] = {}
+    stage_busy: dict[str, float] = {}
+    events: list[tuple[float, int, str, Any]] = []
+    seq = 0
+    done = 0
+    stuck = 0
+    now = 0.0
+
+    def enqueue(task_id: int, status: str, classes: list[str], at: float) -> None:
+        nonlocal seq
+        seq += 1
+        eligible[task_id] = classes
+        item = (stage_rank.setdefault(status, len(stage_rank)), seq, task_id, at, status)
+        for c in classes:
+            heapq.heappush(ready.setdefault(c, []), item)
+        live.add(seq)
+        queued[status] = queued.get(status, 0) + 1
+        max_queue[status] = max(max_queue.get(status, 0), queued[status])
+
+    def run_task(task_id: int, status: str, worker: str, at: float) -> None:
+        """Hold the task through consecutive same-worker stages; schedule the release."""
+        nonlocal seq, done, stuck
+        t = at
+        for _ in range(MAX_STAGES_PER_TASK):
+            service = _service(rng, model, status) if status != entry else 0.0
+            stage_busy[status] = stage_busy.get(status, 0.0) + service
+            t += service
+            passed = rng.random() < model["pass_rate"].get(status, 1.0)
+            nxt = next_status(status, task_type, passed) or next_status(status, task_type, True)
+            if nxt is None or is_terminal(nxt, task_type):
+                done += 1
+                break
+            classes = workers_for(nxt, tasks[task_id], task_type)
+            if classes is None and worker != owner[task_id]:
+                classes = [owner[task_id]]  # bounced back to the original assignee's class
+            status = nxt
+            if classes is not None:
+                seq += 1
+                heapq.heappush(events, (t, seq, "handoff", (task_id, status, [c for c in classes if c in crew])))
+                break
+        else:
+            stuck += 1
+        busy_time[worker] += t - at
+        seq += 1
+        heapq.heappush(events, (t, seq, "free", worker))
+
+    def head(cls: str) -> tuple[int, int, int, float, str] | None:
+        heap = ready.get(cls)
+        while heap and heap[0][1] not in live:
+            heapq.heappop(heap)
+        return heap[0] if heap else None
+
+    def dispatch(at: float, classes: list[str]) -> None:
+        """Start the earliest ready task that has an idle eligible class, until none has.
+
+        Only `classes` can have gained work or capacity since the last
+        dispatch, so only their heads are compared.
+        """
+        while True:
+            best = None
+            for c in classes:
+                if idle.get(c, 0) > 0:
+                    h = head(c)
+                    if h is not None and (best is None or h < best):
+                        best = h
+            if best is None:
+                return
+            _, key, task_id, since, status = best
+            live.discard(key)
+            queued[status] -= 1
+            worker = next(c for c in eligible[task_id] if idle.get(c, 0) > 0)
+            idle[worker] -= 1
+            owner.setdefault(task_id, worker)
+            waits.setdefault(status, []).append(at - since)
+            run_task(task_id, status, worker, at)
+
+    for task_id, class_required in enumerate(tasks):
+        classes = [class_required] if class_required in crew else []
+        if not classes:
+            stuck += 1
+            continue
+        enqueue(task_id, entry, classes, 0.0)
+    dispatch(0.0, list(crew))
+
+    while events:
+        now, _, kind, payload = heapq.heappop(events)
+        if kind == "free":
+            idle[payload] += 1
+            dispatch(now, [payload])
+        else:
+            task_id, status, classes = payload
+            if not classes:
+                stuck += 1
+                continue
+            enqueue(task_id, status, classes, now)
+            dispatch(now, classes)
+
+    stuck += sum(queued.values())
+    hours = now / 3600 if now else 0.0
+    stages = {
+        s: {
+            "avg_wait_seconds": round(sum(w) / len(w), 1) if w else 0.0,
+            "max_queue": max_queue.get(s, 0),
+            "work_seconds": round(stage_busy.get(s, 0.0), 1),
+        }
+        for s, w in sorted(waits.items())
+    }
+    utilization = {
+        c: round(busy_time[c] / (n * now), 3) if n and now else 0.0
+        for c, n in sorted(crew.items())
+    }
+    # The entry queue always holds the whole backlog at t=0 — judge hand-offs only
+    handoffs = [s for s in stages if s != entry]
+    bottleneck_stage = max(handoffs, key=lambda s: stages[s]["avg_wait_seconds"], default=None)
+    bottleneck_class = max(utilization, key=lambda c: utilization[c], default=None)
+    return {
+        "crew": dict(sorted(crew.items())),
+        "completed": done,
+        "stuck": stuck,
+        "drain_hours": round(hours, 2),
+        "throughput_per_hour": round(done / hours, 2) if hours else 0.0,
+        "stages": stages,
+        "utilization": utilization,
+        "bottleneck_stage": bottleneck_stage,
+        "bottleneck_class": bottleneck_class,
+    }
+
+
+# -- Entry point --
+
+def parse_crew(spec: str, project_dir: str = ".") -> dict[str, int] | str:
+    """`coder=3,recon=1` or a crew YAML name (lead excluded). Error string on failure."""
+    if "=" in spec:
+        crew: dict[str, int] = {}
+        for part in spec.split(","):
+            name, _, count = part.partition("=")
+            try:
+                crew[name.strip()] = int(count)
+            except ValueError:
+                return f"BLOCKED: Bad crew spec '{part}'. Use class=count,class=count."
+        return crew
+
+    import yaml
+
+    from minion_comms.crew.spawn import find_crew_file, role_to_class
+    crew_file = find_crew_file(spec, project_dir)
+    if not crew_file:
+        return f"BLOCKED: Crew '{spec}' not found."
+    with open(crew_file) as f:
+        cfg: dict[str, Any] = yaml.safe_load(f) or {}
+    roster: dict[str, dict[str, Any]] = cfg.get("agents") or {}
+    crew = {}
+    for agent_cfg in roster.values():
+        cls = role_to_class(str(agent_cfg.get("role", "")))
+        if cls != "lead":
+            crew[cls] = crew.get(cls, 0) + 1
+    return crew
+
+
+def simulate_crews(
+    crews: list[str],
+    n_tasks: int = 0,
+    class_required: str = "coder",
+    task_type: str = "bugfix",
+    runs: int = 5,
+    seed: int = 0,
+) -> dict[str, object]:
+    """Sweep crew compositions over the open backlog (or n_tasks synthetic tasks)."""
+    if not crews:
+        return {"error": "BLOCKED: Give at least one crew (e.g. coder=3,recon=1 or a crew name)."}
+    if runs < 1:
+        return {"error": "BLOCKED: runs must be at least 1."}
+    parsed: list[dict[str, int]] = []
+    for spec in crews:
+        crew = parse_crew(spec)
+        if isinstance(crew, str):
+            return {"error": crew}
+        parsed.append(crew)
+
+    if n_tasks:
+        backlog = [class_required] * n_tasks
+    else:
+        conn = get_read_db()
+        try:
+            rows = conn.execute(
+                """SELECT COALESCE(class_required, ?) FROM tasks
+                   WHERE status = ? AND COALESCE(task_type, 'bugfix') = ? ORDER BY id""",
+                (class_required, active_statuses(task_type)[0], task_type),
+            ).fetchall()
+        finally:
+            conn.close()
+        backlog = [r[0] for r in rows]
+    if not backlog:
+        return {"error": "No open backlog to drain. Pass --tasks N to simulate a synthetic one."}
+
+    model = learn_service_model(task_type)
+    started = time.perf_counter()
+    results: list[dict[str, object]] = []
+    for crew in parsed:
+        trials = [simulate(crew, backlog, model, task_type, seed + i) for i in range(runs)]
+        best = sorted(trials, key=lambda r: float(r["drain_hours"]))  # type: ignore[arg-type]
+        summary = dict(best[len(best) // 2])  # median run by drain time
+        summary["drain_hours_range"] = [best[0]["drain_hours"], best[-1]["drain_hours"]]
+        results.append(summary)
+    elapsed = time.perf_counter() - started
+
+    return {
+        "task_type": task_type,
+        "backlog": len(backlog),
+        "runs_per_crew": runs,
+        "learned_stages": {s: len(v) for s, v in sorted(model["samples"].items())},
+        "results": sorted(results, key=lambda r: float(r["drain_hours"])),  # type: ignore[arg-type]
+        "simulated_tasks_per_second": round(len(backlog) * runs * len(parsed) / elapsed) if elapsed else None,
+    }
@@ -4,25 +4,58 @@ from __future__ import annotations
 
 import json
 import os
-from typing import Any
+from typing import Any, cast
 
 import sqlite3
 
-from minion_comms.db import get_db, now_iso, staleness_check
+from minion_comms.auth import TASK_INFLIGHT_CAP
+from minion_comms.db import emit_event, get_db, get_read_db, lease_expiry, now_iso, split_file_list, staleness_check
 from minion_comms.flow_bridge import (
     all_statuses,
+    is_dead_end,
     is_terminal,
     next_status as dag_next_status,
     valid_transitions,
     workers_for,
 )
+from minion_comms.flowstats import record_transitions
+from minion_comms.scheduler import file_conflicts, has_open_blockers, inflight_count, next_tasks
 
 
 def _log_transition(cursor: sqlite3.Cursor, task_id: int, from_status: str | None, to_status: str, agent: str, timestamp: str) -> None:
-    """Record a status transition in task_history."""
-    cursor.execute(
+    """Record a status transition in task_history and the events outbox."""
+    _log_transitions(cursor, [(task_id, from_status, to_status, agent, timestamp)])
+
+
+def _log_transitions(
+    cursor: sqlite3.Cursor,
+    rows: list[tuple[int, str | None, str, str, str]],
+) -> None:
+    """Batch form of _log_transition: rows of (task_id, from, to, agent, timestamp)."""
+    cursor.executemany(
         "INSERT INTO task_history (task_id, from_status, to_status, agent, timestamp) VALUES (?, ?, ?, ?, ?)",
-        (task_id, from_status, to_status, agent, timestamp),
+        rows,
+    )
+    for task_id, from_status, to_status, agent, _ in rows:
+        emit_event(cursor, "task", "transition", task_id, agent, {"from": from_status, "to": to_status})
+    record_transitions(cursor, rows)
+
+
+def renew_task_leases(cursor: sqlite3.Cursor, agent_name: str) -> int:
+    """Extend the lease on every task the agent holds. Returns rows renewed."""
+    cursor.execute(
+        "UPDATE tasks SET lease_expires_at = ? WHERE assigned_to = ? AND lease_expires_at IS NOT NULL",
+        (lease_expiry(), agent_name),
+    )
+    return cursor.rowcount
+
+
+def _set_task_files(cursor: sqlite3.Cursor, task_id: int, files: str) -> None:
+    """Replace the task's indexed file set (task_files) from a CSV list."""
+    cursor.execute("DELETE FROM task_files WHERE task_id = ?", (task_id,))
+    cursor.executemany(
+        "INSERT INTO task_files (task_id, file_path) VALUES (?, ?)",
+        [(task_id, p) for p in split_file_list(files)],
     )
 
 
@@ -35,6 +68,8 @@ def create_task(
     blocked_by: str = "",
     class_required: str = "",
     task_type: str = "bugfix",
+    priority: int = 0,
+    files: str = "",
 ) -> dict[str, object]:
     conn = get_db()
     cursor = conn.cursor()
@@ -73,14 +108,22 @@ def create_task(
 
         cursor.execute(
             """INSERT INTO tasks
-               (title, task_file, project, zone, status, blocked_by,
-                class_required, task_type, created_by, activity_count, created_at, updated_at)
-               VALUES (?, ?, ?, ?, 'open', ?, ?, ?, ?, 0, ?, ?)""",
-            (title, task_file, project or None, zone or None, blocked_by_str,
-             class_required or None, task_type, agent_name, now, now),
+               (title, task_file, project, zone, status, blocked_by, files,
+                class_required, task_type, priority, created_by, activity_count, created_at, updated_at)
+               VALUES (?, ?, ?, ?, 'open', ?, ?, ?, ?, ?, ?, 0, ?, ?)""",
+            (title, task_file, project or None, zone or None, blocked_by_str, files or None,
+             class_required or None, task_type, priority, agent_name, now, now),
         )
         task_id = cursor.lastrowid
+        assert task_id is not None  # set by the INSERT above
+        if files:
+            _set_task_files(cursor, task_id, files)
+        cursor.executemany(
+            "INSERT OR IGNORE INTO task_dependencies (task_id, blocker_id) VALUES (?, ?)",
+            [(task_id, b) for b in blocker_ids],
+        )
         _log_transition(cursor, task_id, None, "open", agent_name, now)
+        emit_event(cursor, "task", "created", task_id, agent_name, {"title": title, "task_type": task_type})
         conn.commit()
 
         result: dict[str, object] = {"status": "created", "task_id": task_id, "title": title, "task_type": task_type}
@@ -88,11 +131,206 @@ def create_task(
             result["blocked_by"] = blocker_ids
         if class_required:
             result["class_required"] = class_required
+        if priority:
+            result["priority"] = priority
         return result
     finally:
         conn.close()
 
 
+_MANIFEST_FIELDS = {
+    "key", "title", "task_file", "project", "zone", "blocked_by",
+    "class_required", "task_type", "priority", "files",
+}
+
+
+def _load_manifest(manifest_path: str) -> list[Any]:
+    """Read a YAML (list, or mapping with `tasks:`) or JSONL manifest.
+
+    Entries come back as parsed; create_tasks checks each is a mapping.
+    """
+    with open(manifest_path) as f:
+        text = f.read()
+    if manifest_path.endswith(".jsonl"):
+        return [json.loads(line) for line in text.splitlines() if line.strip()]
+    import yaml
+    data: Any = yaml.safe_load(text) or []
+    if isinstance(data, dict):
+        data = cast(dict[str, Any], data).get("tasks", [])
+    if not isinstance(data, list):
+        raise ValueError("manifest must be a list of tasks or a mapping with a 'tasks' list")
+    return cast(list[Any], data)
+
+
+def _as_list(value: Any) -> list[str]:
+    if value is None or value == "":
+        return []
+    if isinstance(value, (list, tuple)):
+        return [str(v).strip() for v in cast(list[Any], value) if str(v).strip()]
+    return [v.strip() for v in str(value).split(",") if v.strip()]
+
+
+def _topo_order(keys: list[str], edges: dict[str, list[str]]) -> list[str]:
+    """Kahn's algorithm over intra-manifest blockers. Keys on a cycle are left out."""
+    indegree = {k: len(edges[k]) for k in keys}
+    dependents: dict[str, list[str]] = {k: [] for k in keys}
+    for k in keys:
+        for blocker in edges[k]:
+            dependents[blocker].append(k)
+    ready = [k for k in keys if indegree[k] == 0]
+    order: list[str] = []
+    while ready:
+        k = ready.pop(0)
+        order.append(k)
+        for d in dependents[k]:
+            indegree[d] -= 1
+            if indegree[d] == 0:
+                ready.append(d)
+    return order
+
+
+def create_tasks(agent_name: str, manifest_path: str) -> dict[str, object]:
+    """Create every task in a manifest in one transaction.
+
+    Entries take the same fields as create-task plus an optional `key`.
+    `blocked_by` may mix existing task ids and keys of other entries; task
+    files and `files` resolve relative to the manifest. Nothing is written
+    unless the whole manifest validates.
+    """
+    if not os.path.exists(manifest_path):
+        return {"error": f"BLOCKED: Manifest does not exist: {manifest_path}"}
+    try:
+        entries = _load_manifest(manifest_path)
+    except Exception as e:  # ValueError, json / yaml parse errors
+        return {"error": f"BLOCKED: Could not parse manifest: {e}"}
+    if not entries:
+        return {"error": "BLOCKED: Manifest contains no tasks."}
+
+    base_dir = os.path.dirname(os.path.abspath(manifest_path))
+    problems: list[str] = []
+    keys: list[str] = []
+    specs: dict[str, dict[str, Any]] = {}
+    edges: dict[str, list[str]] = {}
+    external: dict[str, list[int]] = {}
+
+    for i, raw in enumerate(entries, 1):
+        if not isinstance(raw, dict):
+            problems.append(f"entry {i}: not a mapping")
+            continue
+        entry = cast(dict[str, Any], raw)
+        key = str(entry.get("key") or f"#{i}")
+        if key in specs:
+            problems.append(f"entry {i}: duplicate key '{key}'")
+            continue
+        unknown = set(entry) - _MANIFEST_FIELDS
+        if unknown:
+            problems.append(f"{key}: unknown field(s) {', '.join(sorted(unknown))}")
+        if not entry.get("title"):
+            problems.append(f"{key}: missing title")
+        task_file = str(entry.get("task_file") or "")
+        if not task_file:
+            problems.append(f"{key}: missing task_file")
+        else:
+            task_file = os.path.join(base_dir, task_file)
+            if not os.path.exists(task_file):
+                problems.append(f"{key}: task file does not exist: {task_file}")
+        try:
+            priority = int(entry.get("priority") or 0)
+        except (TypeError, ValueError):
+            problems.append(f"{key}: priority must be an integer")
+            priority = 0
+
+        keys.append(key)
+        specs[key] = {**entry, "task_file": task_file, "priority": priority}
+        edges[key] = []
+        external[key] = []
+
+    # Resolve blocker refs: manifest keys first, then existing task ids
+    for key in keys:
+        for ref in _as_list(specs[key].get("blocked_by")):
+            if ref in specs:
+                if ref == key:
+                    problems.append(f"{key}: blocked by itself")
+                else:
+                    edges[key].append(ref)
+            elif ref.isdigit():
+                external[key].append(int(ref))
+            else:
+                problems.append(f"{key}: blocked_by '{ref}' is not a manifest key or task id")
+
+    order = _topo_order(keys, edges)
+    if len(order) < len(keys):
+        cyclic = sorted(set(keys) - set(order))
+        problems.append(f"dependency cycle among: {', '.join(cyclic)}")
+
+    conn = get_db()
+    cursor = conn.cursor()
+    now = now_iso()
+    try:
+        cursor.execute("SELECT agent_class FROM agents WHERE name = ?", (agent_name,))
+        row = cursor.fetchone()
+        if not row:
+            return {"error": f"BLOCKED: Agent '{agent_name}' not registered."}
+        if row["agent_class"] != "lead":
+            return {"error": f"BLOCKED: Only lead-class agents can create tasks. '{agent_name}' is '{row['agent_class']}'."}
+
+        cursor.execute("SELECT COUNT(*) FROM battle_plan WHERE status = 'active'")
+        if cursor.fetchone()[0] == 0:
+            return {"error": "BLOCKED: No active battle plan. Lead must call set-battle-plan first."}
+
+        wanted = sorted({tid for ids in external.values() for tid in ids})
+        if wanted:
+            cursor.execute(
+                f"SELECT id FROM tasks WHERE id IN ({','.join('?' for _ in wanted)})", wanted,
+            )
+            missing = set(wanted) - {r["id"] for r in cursor.fetchall()}
+            for key in keys:
+                for tid in external[key]:
+                    if tid in missing:
+                        problems.append(f"{key}: blocked_by task #{tid} does not exist")
+
+        if problems:
+            return {"error": f"BLOCKED: Manifest has {len(problems)} problem(s). Nothing created.", "problems": problems}
+
+        ids: dict[str, int] = {}
+        for key in order:
+            spec = specs[key]
+            blocker_ids = [ids[b] for b in edges[key]] + external[key]
+            files = ",".join(os.path.join(base_dir, f) for f in _as_list(spec.get("files")))
+            task_type = spec.get("task_type") or "bugfix"
+            cursor.execute(
+                """INSERT INTO tasks
+                   (title, task_file, project, zone, status, blocked_by, files,
+                    class_required, task_type, priority, created_by, activity_count, created_at, updated_at)
+                   VALUES (?, ?, ?, ?, 'open', ?, ?, ?, ?, ?, ?, 0, ?, ?)""",
+                (spec["title"], spec["task_file"], spec.get("project") or None, spec.get("zone") or None,
+                 ",".join(str(b) for b in blocker_ids) or None, files or None,
+                 spec.get("class_required") or None, task_type, spec["priority"], agent_name, now, now),
+            )
+            task_id = int(cursor.lastrowid or 0)
+            ids[key] = task_id
+            cursor.executemany(
+                "INSERT OR IGNORE INTO task_dependencies (task_id, blocker_id) VALUES (?, ?)",
+                [(task_id, b) for b in blocker_ids],
+            )
+            cursor.executemany(
+                "INSERT INTO task_files (task_id, file_path) VALUES (?, ?)",
+                [(task_id, p) for p in split_file_list(files)],
+            )
+            emit_event(cursor, "task", "created", task_id, agent_name, {"title": spec["title"], "task_type": task_type})
+
+        _log_transitions(cursor, [(ids[k], None, "open", agent_name, now) for k in order])
+        conn.commit()
+
+        return {
+            "status": "created",
+            "count": len(ids),
+            "tasks": [{"key": k, "task_id": ids[k], "title": specs[k]["title"]} for k in keys],
+        }
+    finally:
+        conn.close()
+
+
 def assign_task(agent_name: str, task_id: int, assigned_to: str) -> dict[str, object]:
     conn = get_db()
     cursor = conn.cursor()
@@ -123,10 +361,11 @@ def assign_task(agent_name: str, task_id: int, assigned_to: str) -> dict[str, ob
             return {"error": f"BLOCKED: Task #{task_id} is in terminal status '{task_row['status']}'."}
 
         cursor.execute(
-            "UPDATE tasks SET assigned_to = ?, status = 'assigned', updated_at = ? WHERE id = ?",
-            (assigned_to, now, task_id),
+            "UPDATE tasks SET assigned_to = ?, status = 'assigned', updated_at = ?, lease_expires_at = ? WHERE id = ?",
+            (assigned_to, now, lease_expiry(), task_id),
         )
         _log_transition(cursor, task_id, task_row["status"], "assigned", assigned_to, now)
+        emit_event(cursor, "task", "assigned", task_id, agent_name, {"assigned_to": assigned_to})
         conn.commit()
         return {"status": "assigned", "task_id": task_id, "assigned_to": assigned_to}
     finally:
@@ -184,8 +423,12 @@ def update_task(
             if status == "fixed" and not task_row["result_file"]:
                 warnings.append("Setting fixed without submit_result — result file required before close")
 
-        fields = ["activity_count = activity_count + 1", "updated_at = ?"]
-        params: list[str | int] = [now]
+        fields = [
+            "activity_count = activity_count + 1",
+            "updated_at = ?",
+            "lease_expires_at = CASE WHEN assigned_to IS NOT NULL THEN ? END",
+        ]
+        params: list[str | int] = [now, lease_expiry()]
 
         if status:
             fields.append("status = ?")
@@ -200,8 +443,12 @@ def update_task(
         params.append(task_id)
         cursor.execute(f"UPDATE tasks SET {', '.join(fields)} WHERE id = ?", params)
 
+        if files:
+            _set_task_files(cursor, task_id, files)
         if status:
             _log_transition(cursor, task_id, current_status, status, agent_name, now)
+        if progress or files:
+            emit_event(cursor, "task", "updated", task_id, agent_name, {"progress": progress or None, "files": files or None})
 
         cursor.execute("SELECT activity_count FROM tasks WHERE id = ?", (task_id,))
         new_count = cursor.fetchone()["activity_count"]
@@ -252,7 +499,7 @@ def get_tasks(
     if status and status not in all_statuses():
         return {"error": f"Invalid status '{status}'. Valid: {', '.join(sorted(all_statuses()))}"}
 
-    conn = get_db()
+    conn = get_read_db()
     cursor = conn.cursor()
     try:
         query = "SELECT * FROM tasks WHERE 1=1"
@@ -288,7 +535,7 @@ def get_tasks(
 
 
 def get_task(task_id: int) -> dict[str, object]:
-    conn = get_db()
+    conn = get_read_db()
     cursor = conn.cursor()
     try:
         cursor.execute("SELECT * FROM tasks WHERE id = ?", (task_id,))
@@ -318,10 +565,13 @@ def submit_result(agent_name: str, task_id: int, result_file: str) -> dict[str,
             return {"error": f"BLOCKED: Result file does not exist: {result_file}"}
 
         cursor.execute(
-            "UPDATE tasks SET result_file = ?, updated_at = ? WHERE id = ?",
-            (result_file, now, task_id),
+            """UPDATE tasks SET result_file = ?, updated_at = ?,
+                   lease_expires_at = CASE WHEN assigned_to IS NOT NULL THEN ? END
+               WHERE id = ?""",
+            (result_file, now, lease_expiry(), task_id),
         )
         cursor.execute("UPDATE agents SET last_seen = ? WHERE name = ?", (now, agent_name))
+        emit_event(cursor, "task", "result", task_id, agent_name, {"result_file": result_file})
         conn.commit()
 
         return {"status": "submitted", "task_id": task_id, "result_file": result_file}
@@ -351,7 +601,7 @@ def close_task(agent_name: str, task_id: int) -> dict[str, object]:
             return {"error": f"BLOCKED: Task #{task_id} has no result file. Agent must call submit-result first."}
 
         cursor.execute(
-            "UPDATE tasks SET status = 'closed', updated_at = ? WHERE id = ?",
+            "UPDATE tasks SET status = 'closed', updated_at = ?, lease_expires_at = NULL WHERE id = ?",
             (now, task_id),
         )
         _log_transition(cursor, task_id, task_row["status"], "closed", agent_name, now)
@@ -361,8 +611,164 @@ def close_task(agent_name: str, task_id: int) -> dict[str, object]:
         conn.close()
 
 
-def pull_task(agent_name: str, task_id: int) -> dict[str, object]:
-    """Claim a specific task. Agent calls this after poll shows available tasks."""
+def _select_bulk(
+    cursor: sqlite3.Cursor, ids: str, status: str, zone: str, project: str,
+) -> list[sqlite3.Row] | str:
+    """Resolve a bulk selector to task rows in one query, or an error string."""
+    try:
+        id_list = [int(x) for x in _as_list(ids)]
+    except ValueError:
+        return f"BLOCKED: Invalid task id list: '{ids}'."
+    if not (id_list or status or zone or project):
+        return "BLOCKED: Bulk operations need --ids, --status, --zone or --project."
+
+    query = "SELECT id, status, task_type, title, result_file FROM tasks WHERE 1=1"
+    params: list[str | int] = []
+    if id_list:
+        query += f" AND id IN ({','.join('?' for _ in id_list)})"
+        params.extend(id_list)
+    if status:
+        query += " AND status = ?"
+        params.append(status)
+    if zone:
+        query += " AND zone = ?"
+        params.append(zone)
+    if project:
+        query += " AND project = ?"
+        params.append(project)
+    cursor.execute(query + " ORDER BY id", params)
+    return cursor.fetchall()
+
+
+def _require_lead(cursor: sqlite3.Cursor, agent_name: str, verb: str) -> str | None:
+    cursor.execute("SELECT agent_class FROM agents WHERE name = ?", (agent_name,))
+    row = cursor.fetchone()
+    if not row:
+        return f"BLOCKED: Agent '{agent_name}' not registered."
+    if row["agent_class"] != "lead":
+        return f"BLOCKED: Only lead-class agents can {verb}. '{agent_name}' is '{row['agent_class']}'."
+    return None
+
+
+def close_tasks(
+    agent_name: str,
+    ids: str = "",
+    status: str = "",
+    zone: str = "",
+    project: str = "",
+) -> dict[str, object]:
+    """Close every selected task that has a result file, in one statement."""
+    conn = get_db()
+    cursor = conn.cursor()
+    now = now_iso()
+    try:
+        denied = _require_lead(cursor, agent_name, "close tasks")
+        if denied:
+            return {"error": denied}
+        rows = _select_bulk(cursor, ids, status, zone, project)
+        if isinstance(rows, str):
+            return {"error": rows}
+
+        results: list[dict[str, object]] = []
+        closing: list[sqlite3.Row] = []
+        for r in rows:
+            if is_terminal(r["status"], r["task_type"] or "bugfix"):
+                results.append({"task_id": r["id"], "error": f"already in terminal status '{r['status']}'"})
+            elif not r["result_file"]:
+                results.append({"task_id": r["id"], "error": "no result file — submit-result first"})
+            else:
+                closing.append(r)
+                results.append({"task_id": r["id"], "status": "closed", "from_status": r["status"]})
+
+        if closing:
+            placeholders = ",".join("?" for _ in closing)
+            cursor.execute(
+                f"""UPDATE tasks SET status = 'closed', updated_at = ?, lease_expires_at = NULL
+                    WHERE id IN ({placeholders})""",
+                [now, *(r["id"] for r in closing)],
+            )
+            _log_transitions(cursor, [(r["id"], r["status"], "closed", agent_name, now) for r in closing])
+        conn.commit()
+
+        return {
+            "status": "ok",
+            "closed": len(closing),
+            "skipped": len(results) - len(closing),
+            "results": results,
+        }
+    finally:
+        conn.close()
+
+
+def update_tasks(
+    agent_name: str,
+    new_status: str,
+    ids: str = "",
+    status: str = "",
+    zone: str = "",
+    project: str = "",
+) -> dict[str, object]:
+    """Move every selected task to new_status in one statement. Lead only.
+
+    Dead-end statuses (abandoned / stale / obsolete) also drop the holder
+    and lease so the reclaimer leaves them alone.
+    """
+    conn = get_db()
+    cursor = conn.cursor()
+    now = now_iso()
+    try:
+        denied = _require_lead(cursor, agent_name, "bulk-update tasks")
+        if denied:
+            return {"error": denied}
+        rows = _select_bulk(cursor, ids, status, zone, project)
+        if isinstance(rows, str):
+            return {"error": rows}
+
+        results: list[dict[str, object]] = []
+        moving: list[sqlite3.Row] = []
+        releasing: list[sqlite3.Row] = []
+        for r in rows:
+            task_type = r["task_type"] or "bugfix"
+            if is_terminal(r["status"], task_type):
+                results.append({"task_id": r["id"], "error": f"already in terminal status '{r['status']}'"})
+            elif new_status not in all_statuses(task_type):
+                results.append({"task_id": r["id"], "error": f"'{new_status}' is not a status in flow '{task_type}'"})
+            elif is_terminal(new_status, task_type):
+                results.append({"task_id": r["id"], "error": f"use close-tasks to reach '{new_status}'"})
+            elif r["status"] == new_status:
+                results.append({"task_id": r["id"], "error": f"already '{new_status}'"})
+            else:
+                (releasing if is_dead_end(new_status, task_type) else moving).append(r)
+                entry: dict[str, object] = {"task_id": r["id"], "status": "updated", "from_status": r["status"]}
+                valid_next = valid_transitions(r["status"], task_type)
+                if valid_next is not None and new_status not in valid_next:
+                    entry["transition_warning"] = f"Skipped steps — went from {r['status']} to {new_status}"
+                results.append(entry)
+
+        for batch, extra in ((moving, ""), (releasing, ", assigned_to = NULL, lease_expires_at = NULL")):
+            if not batch:
+                continue
+            cursor.execute(
+                f"""UPDATE tasks SET status = ?, updated_at = ?, activity_count = activity_count + 1{extra}
+                    WHERE id IN ({','.join('?' for _ in batch)})""",
+                [new_status, now, *(r["id"] for r in batch)],
+            )
+        changed = moving + releasing
+        _log_transitions(cursor, [(r["id"], r["status"], new_status, agent_name, now) for r in changed])
+        conn.commit()
+
+        return {
+            "status": "ok",
+            "updated": len(changed),
+            "skipped": len(results) - len(changed),
+            "results": results,
+        }
+    finally:
+        conn.close()
+
+
+def pull_task(agent_name: str, task_id: int = 0) -> dict[str, object]:
+    """Claim a specific task, or the scheduler's top pick when task_id is 0."""
     conn = get_db()
     cursor = conn.cursor()
     now = now_iso()
@@ -378,6 +784,12 @@ def pull_task(agent_name: str, task_id: int) -> dict[str, object]:
         if not agent_row:
             return {"error": f"BLOCKED: Agent '{agent_name}' not registered."}
 
+        if not task_id:
+            picks = next_tasks(cursor, agent_name, limit=1)
+            if not picks:
+                return {"error": f"No claimable tasks for '{agent_name}'."}
+            task_id = picks[0]["id"]
+
         cursor.execute(
             "SELECT id, title, task_file, status, assigned_to, blocked_by, task_type FROM tasks WHERE id = ?",
             (task_id,),
@@ -392,33 +804,28 @@ def pull_task(agent_name: str, task_id: int) -> dict[str, object]:
         if is_terminal(task_status, task_type):
             return {"error": f"BLOCKED: Task #{task_id} is in terminal status '{task_status}'."}
 
-        # Check blockers
-        blocked_by_str = task_row["blocked_by"]
-        if blocked_by_str:
-            blocker_ids = [int(x.strip()) for x in blocked_by_str.split(",") if x.strip()]
-            placeholders = ",".join("?" for _ in blocker_ids)
-            cursor.execute(
-                f"SELECT COUNT(*) FROM tasks WHERE id IN ({placeholders}) AND status != 'closed'",
-                blocker_ids,
-            )
-            if cursor.fetchone()[0] > 0:
-                return {"error": f"BLOCKED: Task #{task_id} has unresolved blockers."}
+        if has_open_blockers(cursor, task_id):
+            return {"error": f"BLOCKED: Task #{task_id} has unresolved blockers."}
+
+        # In-flight cap — re-pulling a task you already hold is always allowed
+        if task_row["assigned_to"] != agent_name and inflight_count(cursor, agent_name) >= TASK_INFLIGHT_CAP:
+            return {"error": f"BLOCKED: '{agent_name}' already holds {TASK_INFLIGHT_CAP} task(s). Finish one first."}
 
         # Atomic claim
         if task_status in ("fixed", "verified"):
             cursor.execute(
-                """UPDATE tasks SET assigned_to = ?, updated_at = ?
+                """UPDATE tasks SET assigned_to = ?, updated_at = ?, lease_expires_at = ?
                    WHERE id = ? AND status = ? AND (assigned_to IS NULL OR assigned_to = ?)""",
-                (agent_name, now, task_id, task_status, agent_name),
+                (agent_name, now, lease_expiry(), task_id, task_status, agent_name),
             )
         else:
             cursor.execute(
-                """UPDATE tasks SET assigned_to = ?, status = 'assigned', updated_at = ?
+                """UPDATE tasks SET assigned_to = ?, status = 'assigned', updated_at = ?, lease_expires_at = ?
                    WHERE id = ? AND (
                        (status = 'assigned' AND assigned_to = ?) OR
                        (status = 'open' AND assigned_to IS NULL)
                    )""",
-                (agent_name, now, task_id, agent_name),
+                (agent_name, now, lease_expiry(), task_id, agent_name),
             )
 
         if cursor.rowcount == 0:
@@ -449,6 +856,9 @@ def pull_task(agent_name: str, task_id: int) -> dict[str, object]:
         }
         if task_content:
             result["task_content"] = task_content
+        conflicts = file_conflicts(cursor, task_id, agent_name)
+        if conflicts:
+            result["file_conflicts"] = conflicts
         return result
     finally:
         conn.close()
@@ -495,6 +905,13 @@ def complete_task(agent_name: str, task_id: int, passed: bool = True) -> dict[st
         if eligible is not None:
             fields.append("assigned_to = NULL")
 
+        # Lease follows the assignment: dropped on hand-back or terminal, renewed otherwise
+        if eligible is not None or is_terminal(new_status, task_type):
+            fields.append("lease_expires_at = NULL")
+        else:
+            fields.append("lease_expires_at = CASE WHEN assigned_to IS NOT NULL THEN ? END")
+            params.append(lease_expiry())
+
         params.append(task_id)
         cursor.execute(f"UPDATE tasks SET {', '.join(fields)} WHERE id = ?", params)
 
@@ -519,11 +936,78 @@ def complete_task(agent_name: str, task_id: int, passed: bool = True) -> dict[st
         conn.close()
 
 
+def requeue_tasks(
+    cursor: sqlite3.Cursor,
+    rows: list[sqlite3.Row],
+    agent_name: str,
+    now: str,
+) -> list[dict[str, object]]:
+    """Drop the holder from tasks (id, status, assigned_to) rows.
+
+    Work-in-flight (assigned / in_progress) goes back to open; review stages
+    (fixed / verified) keep their status. `rows` must have been selected
+    under the same BEGIN IMMEDIATE, so every one is reported as requeued.
+    """
+    ids = [r["id"] for r in rows]
+    placeholders = ",".join("?" for _ in ids)
+    cursor.execute(
+        f"""UPDATE tasks SET
+                status = CASE WHEN status IN ('assigned', 'in_progress') THEN 'open' ELSE status END,
+                assigned_to = NULL, lease_expires_at = NULL, updated_at = ?
+            WHERE id IN ({placeholders})""",
+        [now, *ids],
+    )
+
+    requeued: list[dict[str, object]] = []
+    transitions: list[tuple[int, str | None, str, str, str]] = []
+    for r in rows:
+        new_status = "open" if r["status"] in ("assigned", "in_progress") else r["status"]
+        requeued.append({
+            "task_id": r["id"], "from_agent": r["assigned_to"],
+            "from_status": r["status"], "to_status": new_status,
+        })
+        if new_status != r["status"]:
+            transitions.append((r["id"], r["status"], new_status, agent_name, now))
+        emit_event(cursor, "task", "reclaimed", r["id"], r["assigned_to"], {"status": new_status})
+    if transitions:
+        _log_transitions(cursor, transitions)
+    return requeued
+
+
+def reclaim_expired_tasks(agent_name: str = "system") -> dict[str, object]:
+    """Return tasks whose claim lease lapsed to the pool.
+
+    Work-in-flight (assigned / in_progress) goes back to open; review stages
+    (fixed / verified) keep their status and just drop the holder.
+    """
+    conn = get_db()
+    cursor = conn.cursor()
+    now = now_iso()
+    try:
+        # Lock before selecting, so a renewal can't land between the read and the write
+        cursor.execute("BEGIN IMMEDIATE")
+        cursor.execute(
+            """SELECT id, status, assigned_to FROM tasks
+               WHERE lease_expires_at IS NOT NULL AND lease_expires_at < ?
+               ORDER BY id""",
+            (now,),
+        )
+        expired = cursor.fetchall()
+        if not expired:
+            return {"status": "ok", "reclaimed": []}
+
+        reclaimed = requeue_tasks(cursor, expired, agent_name, now)
+        conn.commit()
+        return {"status": "ok", "reclaimed": reclaimed}
+    finally:
+        conn.close()
+
+
 def get_task_lineage(task_id: int) -> dict[str, object]:
     """Return task detail + transition history + flow stages for lineage visualization."""
     from minion_comms.flow_bridge import all_statuses as fb_all_statuses, available_flows
 
-    conn = get_db()
+    conn = get_read_db()
     cursor = conn.cursor()
     try:
         cursor.execute("SELECT * FROM tasks WHERE id = ?", (task_id,))
@@ -5,7 +5,7 @@ from __future__ import annotations
 import json
 
 from minion_comms.auth import TRIGGER_WORDS
-from minion_comms.db import get_db, now_iso
+from minion_comms.db import emit_event, get_db, now_iso
 
 
 def get_triggers() -> dict[str, object]:
@@ -40,6 +40,7 @@ def clear_moon_crash(agent_name: str) -> dict[str, object]:
             "UPDATE flags SET value = '0', set_by = ?, set_at = ? WHERE key = 'moon_crash'",
             (agent_name, now),
         )
+        emit_event(cursor, "flag", "cleared", "moon_crash", agent_name)
         conn.commit()
         return {"status": "cleared", "agent": agent_name}
     finally:
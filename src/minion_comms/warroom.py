@@ -6,7 +6,7 @@ import json
 import os
 
 from minion_comms.auth import BATTLE_PLAN_STATUSES, RAID_LOG_PRIORITIES
-from minion_comms.db import get_db, now_iso
+from minion_comms.db import emit_event, get_db, get_read_db, now_iso
 from minion_comms.fs import (
     atomic_write_file,
     battle_plan_file_path,
@@ -43,6 +43,7 @@ def set_battle_plan(agent_name: str, plan: str) -> dict[str, object]:
             (agent_name, plan_file, now, now),
         )
         plan_id = cursor.lastrowid
+        emit_event(cursor, "battle_plan", "set", plan_id, agent_name, {"plan_file": plan_file})
         conn.commit()
 
         return {"status": "active", "plan_id": plan_id, "set_by": agent_name, "plan_file": plan_file}
@@ -54,7 +55,7 @@ def get_battle_plan(status: str = "active") -> dict[str, object]:
     if status not in BATTLE_PLAN_STATUSES:
         return {"error": f"Invalid status '{status}'. Valid: {', '.join(sorted(BATTLE_PLAN_STATUSES))}"}
 
-    conn = get_db()
+    conn = get_read_db()
     cursor = conn.cursor()
     try:
         cursor.execute(
@@ -99,6 +100,7 @@ def update_battle_plan_status(agent_name: str, plan_id: int, status: str) -> dic
             "UPDATE battle_plan SET status = ?, updated_at = ? WHERE id = ?",
             (status, now, plan_id),
         )
+        emit_event(cursor, "battle_plan", "status", plan_id, agent_name, {"from": old_status, "to": status})
         conn.commit()
         return {"status": "updated", "plan_id": plan_id, "old_status": old_status, "new_status": status}
     finally:
@@ -129,6 +131,7 @@ def log_raid(agent_name: str, entry: str, priority: str = "normal") -> dict[str,
         log_id = cursor.lastrowid
 
         cursor.execute("UPDATE agents SET last_seen = ? WHERE name = ?", (now, agent_name))
+        emit_event(cursor, "raid_log", "logged", log_id, agent_name, {"priority": priority, "entry_file": entry_file})
         conn.commit()
 
         return {"status": "logged", "log_id": log_id, "agent": agent_name, "priority": priority}
@@ -140,11 +143,20 @@ def get_raid_log(
     priority: str = "",
     count: int = 20,
     agent_name: str = "",
+    replica: bool = False,
 ) -> dict[str, object]:
     if priority and priority not in RAID_LOG_PRIORITIES:
         return {"error": f"Invalid priority '{priority}'. Valid: {', '.join(sorted(RAID_LOG_PRIORITIES))}"}
 
-    conn = get_db()
+    replica_info: dict[str, object] = {}
+    if replica:
+        from minion_comms.replica import get_replica_db
+        replica_conn, replica_info = get_replica_db()
+        if replica_conn is None:
+            return replica_info
+        conn = replica_conn
+    else:
+        conn = get_read_db()
     cursor = conn.cursor()
     try:
         query = "SELECT * FROM raid_log WHERE 1=1"
@@ -167,6 +179,9 @@ def get_raid_log(
             e["entry_content"] = read_content_file(e.get("entry_file"))
             entries.append(e)
 
-        return {"entries": entries}
+        result: dict[str, object] = {"entries": entries}
+        if replica:
+            result["replica"] = replica_info
+        return result
     finally:
         conn.close()
@@ -0,0 +1,49 @@
+"""Tests for the events outbox and change feed."""
+
+from minion_comms.changes import get_changes
+from minion_comms.comms import register, send, set_context
+from minion_comms.filesafety import claim_file, release_file
+from minion_comms.tasks import create_task, pull_task
+from minion_comms.warroom import log_raid
+
+
+class TestEventsOutbox:
+    def test_sequence_is_monotonic(self, isolated_db, lead_agent, coder_agent):
+        result = get_changes()
+        seqs = [e["seq"] for e in result["events"]]
+        assert seqs == sorted(seqs)
+        assert result["last_seq"] == result["head_seq"] == seqs[-1]
+        assert [e["kind"] for e in result["events"]] == ["agent.registered", "agent.registered"]
+
+    def test_since_returns_only_deltas(self, isolated_db, lead_agent, coder_agent, battle_plan, tmp_path):
+        head = get_changes()["last_seq"]
+        spec = tmp_path / "spec.md"
+        spec.write_text("spec")
+        create_task(lead_agent, "task", str(spec), class_required="coder")
+        pull_task(coder_agent, 1)
+
+        kinds = [e["kind"] for e in get_changes(since=head)["events"]]
+        assert kinds == ["task.transition", "task.created", "task.transition"]
+
+    def test_events_cover_each_module(self, isolated_db, lead_agent, coder_agent, battle_plan):
+        set_context(coder_agent, "loaded")
+        send(coder_agent, lead_agent, "hello")
+        claim_file(coder_agent, "/tmp/x.py")
+        release_file(coder_agent, "/tmp/x.py")
+        log_raid(coder_agent, "note")
+        entities = {e["entity"] for e in get_changes()["events"]}
+        assert {"agent", "battle_plan", "message", "claim", "raid_log"} <= entities
+
+    def test_entity_filter(self, isolated_db, lead_agent):
+        register("c1", "coder")
+        claim_file("c1", "/tmp/y.py")
+        events = get_changes(entity="claim")["events"]
+        assert len(events) == 1
+        assert events[0]["entity_id"] == "/tmp/y.py"
+        assert events[0]["agent"] == "c1"
+
+    def test_failed_call_emits_nothing(self, isolated_db, lead_agent):
+        head = get_changes()["last_seq"]
+        result = claim_file("ghost", "/tmp/z.py")
+        assert "error" in result
+        assert get_changes(since=head)["events"] == []
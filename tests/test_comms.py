@@ -3,12 +3,15 @@ set_context, who, send, check_inbox, get_history, purge_inbox."""
 
 import os
 
+import pytest
+
 from minion_comms.comms import (
     check_inbox,
     deregister,
     get_history,
     purge_inbox,
     register,
+    register_many,
     rename,
     send,
     set_context,
@@ -52,6 +55,89 @@ class TestRegister:
         assert result["class"] == "oracle"
 
 
+class TestRegisterMany:
+    def test_registers_crew_in_one_call(self, isolated_db):
+        crew = [
+            {"name": "lead", "agent_class": "lead", "transport": "terminal"},
+            {"name": "bob", "agent_class": "coder"},
+            {"name": "kara", "agent_class": "coder", "model": "claude-sonnet-4-6"},
+        ]
+        result = register_many(crew)
+        assert result["count"] == 3
+        assert result["agents"][1] == {"agent": "bob", "class": "coder", "transport": "daemon"}
+        assert "onboarding" not in result
+        assert sorted(a["name"] for a in who()["agents"]) == ["bob", "kara", "lead"]
+
+    def test_one_bad_entry_registers_nobody(self, isolated_db):
+        result = register_many([
+            {"name": "bob", "agent_class": "coder"},
+            {"name": "kara", "agent_class": "coder", "model": "gpt-4"},
+        ])
+        assert "kara" in result["error"]
+        assert who()["agents"] == []
+
+    def test_docs_once_per_class(self, isolated_db, monkeypatch):
+        import minion_comms.db as db_mod
+        loads = []
+        monkeypatch.setattr(db_mod, "_bundle_memo", {})
+        monkeypatch.setattr(db_mod, "load_onboarding", lambda cls: loads.append(cls) or f"{cls} docs")
+        crew = [{"name": f"coder{i}", "agent_class": "coder"} for i in range(5)]
+        result = register_many(crew + [{"name": "lead", "agent_class": "lead"}], include_docs=True)
+        assert loads == ["coder", "lead"]
+        assert set(result["onboarding"]) == {"coder", "lead"}
+        assert result["onboarding"]["coder"]["onboarding"] == "coder docs"
+
+
+class TestOnboardingBundle:
+    def _docs(self, isolated_db):
+        import minion_comms.db as db_mod
+        os.makedirs(db_mod.DOCS_DIR, exist_ok=True)
+        return db_mod.DOCS_DIR
+
+    def test_known_hash_gets_unchanged(self, isolated_db):
+        docs = self._docs(isolated_db)
+        with open(os.path.join(docs, "protocol-coder.md"), "w") as f:
+            f.write("coder rules")
+        first = register("agent1", "coder", transport="daemon")
+        assert "coder rules" in first["onboarding"]
+        again = register("agent1", "coder", transport="daemon", known_hash=first["onboarding_hash"])
+        assert again["onboarding"] == "unchanged"
+        assert "tools" not in again and "triggers" not in again
+
+    def test_known_hash_confirmed_without_reading_docs(self, isolated_db, monkeypatch):
+        import minion_comms.db as db_mod
+        docs = self._docs(isolated_db)
+        with open(os.path.join(docs, "protocol-common.md"), "w") as f:
+            f.write("common")
+        h = db_mod.onboarding_bundle("coder")["hash"]
+        monkeypatch.setattr(db_mod, "_bundle_memo", {})  # fresh process
+        monkeypatch.setattr(db_mod, "load_onboarding", lambda cls: pytest.fail("docs re-read"))
+        assert db_mod.onboarding_bundle("coder", h) == {"hash": h, "unchanged": True}
+
+    def test_bundle_served_from_db_in_fresh_process(self, isolated_db, monkeypatch):
+        import minion_comms.db as db_mod
+        docs = self._docs(isolated_db)
+        with open(os.path.join(docs, "protocol-common.md"), "w") as f:
+            f.write("common")
+        first = db_mod.onboarding_bundle("coder")
+        monkeypatch.setattr(db_mod, "_bundle_memo", {})
+        monkeypatch.setattr(db_mod, "load_onboarding", lambda cls: pytest.fail("docs re-read"))
+        assert db_mod.onboarding_bundle("coder") == first
+
+    def test_doc_edit_changes_hash(self, isolated_db):
+        import minion_comms.db as db_mod
+        docs = self._docs(isolated_db)
+        path = os.path.join(docs, "protocol-coder.md")
+        with open(path, "w") as f:
+            f.write("v1")
+        h1 = db_mod.onboarding_bundle("coder")["hash"]
+        with open(path, "w") as f:
+            f.write("v2 longer")
+        bundle = db_mod.onboarding_bundle("coder", h1)
+        assert bundle["hash"] != h1
+        assert "v2 longer" in bundle["onboarding"]
+
+
 class TestDeregister:
     def test_deregister_success(self, isolated_db):
         register("agent1", "coder")
@@ -255,3 +341,77 @@ class TestPurgeInbox:
     def test_purge_inbox(self, isolated_db, coder_agent):
         result = purge_inbox(coder_agent, 0)
         assert result["status"] == "purged"
+
+
+class TestMulticast:
+    def test_send_to_class_stores_body_once(self, isolated_db, battle_plan):
+        register("c1", "coder")
+        register("c2", "coder")
+        register("o1", "oracle")
+        set_context("lead", "coordinating")
+        result = send("lead", "", "refactor auth", to_class="coder")
+        assert result["status"] == "sent"
+        assert result["recipients"] == ["c1", "c2"]
+
+        files = {check_inbox(a)["messages"][0]["content_file"] for a in ("c1", "c2")}
+        assert len(files) == 1
+        assert check_inbox("o1")["messages"] == []
+
+    def test_send_to_zone(self, isolated_db, battle_plan):
+        from minion_comms.crew import hand_off_zone
+        register("o1", "oracle")
+        register("o2", "oracle")
+        register("o3", "oracle")
+        hand_off_zone("o1", "o2,o3", "src/auth/")
+        set_context("lead", "coordinating")
+        result = send("lead", "", "zone update", to_zone="src/auth/")
+        assert result["recipients"] == ["o2", "o3"]
+        inbox = check_inbox("o2")
+        assert inbox["messages"][0]["content"] == "zone update"
+        assert inbox["messages"][0]["group_target"] == "zone:src/auth/"
+
+    def test_send_to_list_ccs_lead_once(self, isolated_db, battle_plan):
+        register("c1", "coder")
+        register("c2", "coder")
+        register("c3", "coder")
+        set_context("c1", "loaded")
+        result = send("c1", "c2,c3", "pairing?")
+        assert result["recipients"] == ["c2", "c3"]
+        assert result["cc"] == ["lead"]
+        lead_inbox = check_inbox("lead")["messages"]
+        assert len(lead_inbox) == 1
+        assert lead_inbox[0]["cc_original_to"] == "list:c2,c3"
+
+    def test_send_to_empty_class(self, isolated_db, battle_plan):
+        set_context("lead", "coordinating")
+        result = send("lead", "", "anyone?", to_class="builder")
+        assert "error" in result
+
+    def test_send_requires_target(self, isolated_db, battle_plan):
+        result = send("lead", "", "hello")
+        assert "error" in result
+
+
+class TestReadOnlyConnection:
+    def test_read_db_rejects_writes(self, isolated_db):
+        import sqlite3
+
+        from minion_comms.db import get_read_db
+        conn = get_read_db()
+        try:
+            with pytest.raises(sqlite3.OperationalError):
+                conn.execute("DELETE FROM agents")
+        finally:
+            conn.close()
+
+    def test_read_db_holds_one_snapshot(self, isolated_db):
+        from minion_comms.db import get_read_db
+        register("a", "coder")
+        conn = get_read_db()
+        try:
+            assert conn.execute("SELECT COUNT(*) FROM agents").fetchone()[0] == 1
+            register("b", "coder")
+            assert conn.execute("SELECT COUNT(*) FROM agents").fetchone()[0] == 1
+        finally:
+            conn.close()
+        assert len(who()["agents"]) == 2
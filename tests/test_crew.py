@@ -1,7 +1,14 @@
 """Tests for crew + triggers: hand_off_zone, get_triggers, clear_moon_crash."""
 
+import shutil
+import subprocess
+
+import pytest
+
 from minion_comms.comms import register, send, set_context, check_inbox
-from minion_comms.crew import hand_off_zone
+from minion_comms.crew import autoscale, hand_off_zone
+from minion_comms.crew.autoscale import ScaleState, decide, load_policy, observe
+from minion_comms.tasks import create_task
 from minion_comms.triggers import clear_moon_crash, get_triggers
 from minion_comms.warroom import set_battle_plan
 
@@ -47,3 +54,159 @@ class TestHandOffZone:
         register("oracle1", "oracle")
         result = hand_off_zone("oracle1", "ghost", "src/auth/")
         assert "error" in result
+
+
+_CREW_YAML = """
+agents:
+  bob:
+    role: coder
+    transport: daemon
+    system: You are bob (coder class).
+autoscale:
+  up_per_agent: 2
+  down_idle_seconds: 60
+  sustain_ticks: 2
+  cooldown_seconds: 100
+  classes:
+    coder: {min: 1, max: 3}
+"""
+
+
+def _policy(tmp_path):
+    (tmp_path / "crews").mkdir(exist_ok=True)
+    (tmp_path / "crews" / "squad.yaml").write_text(_CREW_YAML)
+    return load_policy("squad", str(tmp_path))
+
+
+def _obs(depth, agents=("bob",), idle=()):
+    return {"coder": {"depth": depth, "agents": list(agents), "idle": list(idle)}}
+
+
+class TestAutoscale:
+    def test_policy_defaults_template_from_roster(self, isolated_db, tmp_path):
+        policy = _policy(tmp_path)
+        assert policy["classes"]["coder"] == {"min": 1, "max": 3, "template": "bob"}
+
+    def test_policy_requires_section(self, isolated_db, tmp_path):
+        (tmp_path / "crews").mkdir()
+        (tmp_path / "crews" / "plain.yaml").write_text("agents: {bob: {role: coder}}")
+        assert isinstance(load_policy("plain", str(tmp_path)), str)
+
+    def test_scale_up_needs_sustained_backlog(self, isolated_db, tmp_path):
+        policy, state = _policy(tmp_path), ScaleState()
+        assert decide(policy, _obs(5), state, now=0) == []
+        actions = decide(policy, _obs(5), state, now=10)
+        assert [a["action"] for a in actions] == ["spawn"]
+
+    def test_blip_resets_streak(self, isolated_db, tmp_path):
+        policy, state = _policy(tmp_path), ScaleState()
+        decide(policy, _obs(5), state, now=0)
+        decide(policy, _obs(1), state, now=10)  # inside the dead band
+        assert decide(policy, _obs(5), state, now=20) == []
+
+    def test_cooldown_between_actions(self, isolated_db, tmp_path):
+        policy, state = _policy(tmp_path), ScaleState()
+        for t in (0, 10):
+            decide(policy, _obs(9), state, now=t)
+        busy = ("bob", "bob2")
+        assert decide(policy, _obs(9, busy), state, now=20) == []
+        assert decide(policy, _obs(9, busy), state, now=120) != []
+
+    def test_below_min_spawn_respects_cooldown(self, isolated_db, tmp_path):
+        policy, state = _policy(tmp_path), ScaleState()
+        assert [a["action"] for a in decide(policy, _obs(0, ()), state, now=0)] == ["spawn"]
+        assert decide(policy, _obs(0, ()), state, now=10) == []
+        assert decide(policy, _obs(0, ()), state, now=100) != []
+
+    def test_failed_clone_is_rolled_back(self, isolated_db, tmp_path, monkeypatch):
+        import importlib
+
+        import yaml
+
+        from minion_comms.comms import who
+
+        scaler = importlib.import_module("minion_comms.crew.autoscale")
+        policy = _policy(tmp_path)
+        monkeypatch.setenv("HOME", str(tmp_path))
+        (tmp_path / ".minion-swarm").mkdir()
+        config = tmp_path / ".minion-swarm" / "squad.yaml"
+        config.write_text(yaml.dump({"agents": policy["roster"]}))
+        monkeypatch.setattr(scaler.subprocess, "run", lambda *a, **kw: subprocess.CompletedProcess(a, 0))
+        monkeypatch.setattr(scaler, "spawn_pane", lambda *a: "no space for new pane")
+
+        result = scaler._spawn_clone(policy, "coder", str(tmp_path), "python")
+        assert "No pane for bob2" in result["error"]
+        assert "bob2" not in yaml.safe_load(config.read_text())["agents"]
+        assert "bob2" not in [a["name"] for a in who()["agents"]]
+
+    def test_retire_prefers_scaled_agents_and_respects_min(self, isolated_db, tmp_path):
+        policy, state = _policy(tmp_path), ScaleState()
+        idle = [{"agent": "bob", "seconds": 900, "scaled": False},
+                {"agent": "bob2", "seconds": 100, "scaled": True}]
+        decide(policy, _obs(0, ("bob", "bob2"), idle), state, now=0)
+        actions = decide(policy, _obs(0, ("bob", "bob2"), idle), state, now=10)
+        assert actions[0]["agent"] == "bob2"
+        state = ScaleState()
+        for t in (0, 10, 20):
+            assert decide(policy, _obs(0, ("bob",), idle[:1]), state, now=t) == []
+
+    def test_observe_counts_claimable_depth(self, isolated_db, lead_agent, battle_plan, tmp_path):
+        register("bob", "coder", transport="daemon")
+        register("stranger", "coder", transport="daemon")
+        spec = tmp_path / "t.md"
+        spec.write_text("t")
+        create_task(lead_agent, "t", str(spec), class_required="coder")
+        observed = observe(_policy(tmp_path))
+        assert observed["coder"]["depth"] == 1
+        assert observed["coder"]["agents"] == ["bob"]
+
+    def test_dry_run_lead_only(self, isolated_db, coder_agent, tmp_path):
+        _policy(tmp_path)
+        assert "error" in autoscale(coder_agent, "squad", str(tmp_path), ticks=1, dry_run=True)
+
+    def test_dry_run_reports_min_spawn(self, isolated_db, lead_agent, tmp_path):
+        _policy(tmp_path)
+        result = autoscale(lead_agent, "squad", str(tmp_path), ticks=1, dry_run=True)
+        assert result["actions"][0]["action"] == "spawn"
+        assert result["roster"] == {"coder": []}
+
+
+@pytest.fixture
+def private_tmux(tmp_path, monkeypatch):
+    """A tmux server of our own, torn down after the test."""
+    if not shutil.which("tmux"):
+        pytest.skip("tmux not installed")
+    monkeypatch.setenv("TMUX_TMPDIR", str(tmp_path))
+    monkeypatch.delenv("TMUX", raising=False)
+    yield
+    subprocess.run(["tmux", "kill-server"], capture_output=True)
+
+
+class TestSpawnPanes:
+    def _titles(self, session):
+        out = subprocess.run(
+            ["tmux", "list-panes", "-t", session, "-F", "#{pane_title}"], capture_output=True, text=True,
+        ).stdout
+        return out.split("\n")[:-1]
+
+    def test_batch_creates_and_styles_every_pane(self, isolated_db, private_tmux, tmp_path, monkeypatch):
+        from minion_comms.crew import _tmux, daemon
+
+        calls = []
+        real = subprocess.run
+        monkeypatch.setattr(_tmux.subprocess, "run", lambda argv, **kw: calls.append(argv) or real(argv, **kw))
+        crew = [{"name": f"bob{i}", "role": "coder", "model": "sonnet"} for i in range(4)]
+        spawned, failed = daemon.spawn_panes("crew-t", crew, str(tmp_path), session_exists=False)
+        assert (spawned, failed) == ([c["name"] for c in crew], {})
+        assert len(calls) == 1
+        assert self._titles("crew-t") == [f"bob{i}(coder) sonnet" for i in range(4)]
+
+    def test_appends_to_existing_session(self, isolated_db, private_tmux, tmp_path):
+        from minion_comms.crew import daemon
+
+        daemon.spawn_panes("crew-t", [{"name": "ann", "role": "lead"}], str(tmp_path), session_exists=False)
+        spawned, _ = daemon.spawn_panes(
+            "crew-t", [{"name": "bob", "role": "coder"}], str(tmp_path), session_exists=True, first_idx=1,
+        )
+        assert spawned == ["bob"]
+        assert self._titles("crew-t") == ["ann(lead)", "bob(coder)"]
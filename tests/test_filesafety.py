@@ -1,7 +1,19 @@
 """Tests for file safety: claim, release, get_claims."""
 
-from minion_comms.comms import register
-from minion_comms.filesafety import claim_file, get_claims, release_file
+import subprocess
+
+from minion_comms.comms import check_inbox, deregister, register, set_context
+from minion_comms.db import get_db, now_iso
+from minion_comms.filesafety import (
+    audit_edits,
+    claim_file,
+    claim_files,
+    expire_claims,
+    get_claims,
+    normalize_claim,
+    release_file,
+    release_files,
+)
 
 
 class TestClaimFile:
@@ -29,6 +41,205 @@ class TestClaimFile:
         assert "error" in result
 
 
+class TestHierarchicalClaims:
+    def test_normalize_kinds(self, isolated_db):
+        assert normalize_claim("/src/auth/**") == ("/src/auth/", "dir", "/src/auth/")
+        assert normalize_claim("/src/auth/") == ("/src/auth/", "dir", "/src/auth/")
+        assert normalize_claim("/src/**/*.sql") == ("/src/**/*.sql", "glob", "/src/")
+        assert normalize_claim("/src/a.py") == ("/src/a.py", "file", "/src/a.py")
+
+    def test_dir_claim_blocks_descendant_file(self, isolated_db):
+        register("coder1", "coder")
+        register("coder2", "coder")
+        assert claim_file("coder1", "/repo/src/auth/**")["kind"] == "dir"
+        result = claim_file("coder2", "/repo/src/auth/deep/login.py")
+        assert "overlaps '/repo/src/auth/'" in result["error"]
+        assert claim_file("coder2", "/repo/src/authz.py")["status"] == "claimed"
+
+    def test_dir_claim_blocked_by_descendant_file(self, isolated_db):
+        register("coder1", "coder")
+        register("coder2", "coder")
+        claim_file("coder1", "/repo/src/auth/login.py")
+        assert "error" in claim_file("coder2", "/repo/src/")
+        assert claim_file("coder2", "/repo/docs/")["status"] == "claimed"
+
+    def test_glob_matches_segments(self, isolated_db):
+        register("coder1", "coder")
+        register("coder2", "coder")
+        claim_file("coder1", "/repo/db/**/*.sql")
+        assert "error" in claim_file("coder2", "/repo/db/migrations/001.sql")
+        assert claim_file("coder2", "/repo/db/migrations/001.py")["status"] == "claimed"
+
+    def test_own_dir_covers_file(self, isolated_db):
+        register("coder1", "coder")
+        claim_file("coder1", "/repo/src/")
+        result = claim_file("coder1", "/repo/src/a.py")
+        assert result["status"] == "already_claimed"
+        assert result["via"] == "/repo/src/"
+
+    def test_release_dir_claim(self, isolated_db):
+        register("coder1", "coder")
+        claim_file("coder1", "/repo/src/**")
+        assert release_file("coder1", "/repo/src/")["status"] == "released"
+
+    def test_set_context_respects_dir_claims(self, isolated_db):
+        register("coder1", "coder")
+        claim_file("coder1", "/repo/src/")
+        result = set_context("coder1", "editing", files_modified="/repo/src/a.py,/repo/README.md")
+        assert result["unclaimed_files"] == ["/repo/README.md"]
+
+
+class TestBatchClaims:
+    def test_claim_all(self, isolated_db):
+        register("coder1", "coder")
+        result = claim_files("coder1", ["/repo/b.py", "/repo/a.py", "/repo/a.py"])
+        assert result["claimed"] == ["/repo/a.py", "/repo/b.py"]
+        assert len(get_claims("coder1")["claims"]) == 2
+
+    def test_all_or_nothing(self, isolated_db):
+        register("coder1", "coder")
+        register("coder2", "coder")
+        claim_file("coder2", "/repo/b.py")
+        result = claim_files("coder1", ["/repo/a.py", "/repo/b.py", "/repo/c.py"])
+        assert result["blocked"] == [{"file": "/repo/b.py", "claim": "/repo/b.py",
+                                      "holder": "coder2", "since": result["blocked"][0]["since"]}]
+        assert get_claims("coder1")["claims"] == []
+        waitlist = get_claims()["waitlist"]
+        assert [(w["file_path"], w["agent_name"]) for w in waitlist] == [("/repo/b.py", "coder1")]
+
+    def test_already_held_reported(self, isolated_db):
+        register("coder1", "coder")
+        claim_file("coder1", "/repo/src/")
+        result = claim_files("coder1", ["/repo/src/a.py", "/repo/b.py"])
+        assert result["claimed"] == ["/repo/b.py"]
+        assert result["already_claimed"] == ["/repo/src/a.py"]
+
+    def test_release_all_or_nothing(self, isolated_db):
+        register("coder1", "coder")
+        register("coder2", "coder")
+        claim_files("coder1", ["/repo/a.py", "/repo/b.py"])
+        claim_file("coder2", "/repo/c.py")
+        result = release_files("coder1", ["/repo/a.py", "/repo/c.py"])
+        assert len(result["problems"]) == 1
+        assert len(get_claims("coder1")["claims"]) == 2
+
+        result = release_files("coder1", ["/repo/a.py", "/repo/b.py"])
+        assert result["released"] == ["/repo/a.py", "/repo/b.py"]
+        assert get_claims("coder1")["claims"] == []
+
+    def test_release_hands_off_in_bulk(self, isolated_db):
+        register("coder1", "coder")
+        register("coder2", "coder")
+        register("coder3", "coder")
+        claim_files("coder1", ["/repo/a.py", "/repo/b.py"])
+        claim_files("coder2", ["/repo/a.py", "/repo/b.py"])
+        claim_file("coder3", "/repo/a.py")
+        result = release_files("coder1", ["/repo/a.py", "/repo/b.py"])
+        assert result["promoted"] == {"/repo/a.py": "coder2", "/repo/b.py": "coder2"}
+        assert result["waitlisted_agents"] == {"/repo/a.py": ["coder3"]}
+
+
+def _expire(path):
+    conn = get_db()
+    conn.execute("UPDATE file_claims SET expires_at = '2000-01-01T00:00:00' WHERE file_path = ?", (path,))
+    conn.commit()
+    conn.close()
+
+
+class TestClaimLeases:
+    def test_claim_has_lease(self, isolated_db):
+        register("coder1", "coder")
+        claim_file("coder1", "/repo/a.py")
+        assert get_claims()["claims"][0]["expires_at"] > now_iso()
+
+    def test_release_promotes_head_and_notifies(self, isolated_db):
+        register("coder1", "coder")
+        register("coder2", "coder")
+        register("coder3", "coder")
+        claim_file("coder1", "/repo/a.py")
+        claim_file("coder2", "/repo/a.py")
+        claim_file("coder3", "/repo/a.py")
+        result = release_file("coder1", "/repo/a.py")
+        assert result["promoted"] == {"/repo/a.py": "coder2"}
+        assert result["waitlisted_agents"] == ["coder3"]
+        assert get_claims("coder2")["claims"][0]["file_path"] == "/repo/a.py"
+        inbox = check_inbox("coder2")["messages"]
+        assert "Claim granted" in inbox[0]["content"]
+
+    def test_dir_release_promotes_file_waiter(self, isolated_db):
+        register("coder1", "coder")
+        register("coder2", "coder")
+        claim_file("coder1", "/repo/src/")
+        claim_file("coder2", "/repo/src/a.py")
+        result = release_file("coder1", "/repo/src/")
+        assert result["promoted"] == {"/repo/src/a.py": "coder2"}
+
+    def test_expiry_promotes_waiter(self, isolated_db):
+        register("coder1", "coder")
+        register("coder2", "coder")
+        claim_file("coder1", "/repo/a.py")
+        claim_file("coder2", "/repo/a.py")
+        _expire("/repo/a.py")
+        result = expire_claims()
+        assert result["expired"] == [{"file": "/repo/a.py", "from_agent": "coder1"}]
+        assert result["promoted"] == {"/repo/a.py": "coder2"}
+
+    def test_activity_renews(self, isolated_db):
+        register("coder1", "coder")
+        claim_file("coder1", "/repo/a.py")
+        _expire("/repo/a.py")
+        set_context("coder1", "still here")
+        assert expire_claims()["expired"] == []
+
+    def test_deregister_promotes(self, isolated_db):
+        register("coder1", "coder")
+        register("coder2", "coder")
+        claim_file("coder1", "/repo/a.py")
+        claim_file("coder2", "/repo/a.py")
+        result = deregister("coder1")
+        assert result["waitlist_notify"] == ["/repo/a.py -> coder2 claimed"]
+
+
+def _git_repo(tmp_path):
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    subprocess.run(["git", "init", "-q", str(repo)], check=True)
+    for name in ("a.py", "b.py", "c.py"):
+        (repo / name).write_text("x\n")
+    subprocess.run(["git", "-C", str(repo), "add", "."], check=True)
+    subprocess.run(["git", "-C", str(repo), "-c", "user.email=t@t", "-c", "user.name=t",
+                    "commit", "-qm", "init"], check=True)
+    return repo
+
+
+class TestAuditEdits:
+    def test_reports_unclaimed_and_foreign(self, isolated_db, tmp_path):
+        repo = _git_repo(tmp_path)
+        register("coder1", "coder")
+        register("coder2", "coder")
+        for name in ("a.py", "b.py"):
+            (repo / name).write_text("changed\n")
+        (repo / "new.py").write_text("new\n")
+        claim_file("coder1", str(repo / "a.py"))
+        claim_file("coder2", str(repo / "b.py"))
+
+        result = audit_edits(str(repo), "coder1")
+        assert result["changed"] == 3
+        assert result["unclaimed"] == [str(repo / "new.py")]
+        assert result["claimed"] == {"coder1": [str(repo / "a.py")], "coder2": [str(repo / "b.py")]}
+        assert result["foreign"] == [{"file": str(repo / "b.py"), "claimed_by": "coder2"}]
+
+    def test_dir_claim_covers_edits(self, isolated_db, tmp_path):
+        repo = _git_repo(tmp_path)
+        register("coder1", "coder")
+        (repo / "c.py").write_text("changed\n")
+        claim_file("coder1", f"{repo}/**")
+        assert audit_edits(str(repo))["unclaimed"] == []
+
+    def test_not_a_repo(self, isolated_db, tmp_path):
+        assert "error" in audit_edits(str(tmp_path / "nowhere"))
+
+
 class TestReleaseFile:
     def test_release_success(self, isolated_db):
         register("coder1", "coder")
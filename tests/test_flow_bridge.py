@@ -81,3 +81,124 @@ class TestUnknownFlowFallback:
         # nonexistent flow type should cache None and use fallback
         assert is_terminal("closed", "nonexistent_flow_xyz") is True
         assert next_status("open", "nonexistent_flow_xyz") == "assigned"
+
+
+_FAKE_MINION_TASKS = '''
+import os
+import yaml
+
+_DIR = os.path.join(os.path.dirname(__file__), "flows")
+LOADS = []
+
+
+class _Stage:
+    def __init__(self, cfg):
+        self.terminal = bool(cfg.get("terminal"))
+        self.next = cfg.get("next")
+        self.fail = cfg.get("fail")
+        self.workers = cfg.get("workers")
+
+
+class TaskFlow:
+    def __init__(self, data):
+        self.stages = {name: _Stage(cfg or {}) for name, cfg in data["stages"].items()}
+        self.dead_ends = set(data.get("dead_ends", []))
+
+    def is_terminal(self, s):
+        return s in self.stages and self.stages[s].terminal
+
+    def valid_transitions(self, s):
+        st = self.stages.get(s)
+        return {t for t in (st.next, st.fail) if t} if st else set()
+
+    def next_status(self, s, passed):
+        st = self.stages.get(s)
+        return (st.next if passed else st.fail) if st else None
+
+    def workers_for(self, s, class_required):
+        st = self.stages.get(s)
+        return st.workers if st else None
+
+
+def list_flows():
+    return sorted(f[:-5] for f in os.listdir(_DIR) if f.endswith(".yaml"))
+
+
+def load_flow(name):
+    LOADS.append(name)
+    with open(os.path.join(_DIR, name + ".yaml")) as f:
+        return TaskFlow(yaml.safe_load(f))
+'''
+
+_REVIEW_FLOW = """
+stages:
+  open: {next: review}
+  review: {next: done, fail: open, workers: [oracle]}
+  done: {terminal: true}
+"""
+
+
+class TestCompiledFlowCache:
+    """Flows from a (fake) minion-tasks install compile once and load from disk."""
+
+    @pytest.fixture(autouse=True)
+    def fake_dag(self, tmp_path, monkeypatch):
+        import importlib
+        import sys
+
+        import minion_comms.flow_bridge as fb
+
+        pkg = tmp_path / "site" / "minion_tasks"
+        (pkg / "flows").mkdir(parents=True)
+        (pkg / "__init__.py").write_text(_FAKE_MINION_TASKS)
+        (pkg / "flows" / "review.yaml").write_text(_REVIEW_FLOW)
+        monkeypatch.syspath_prepend(str(tmp_path / "site"))
+        monkeypatch.setenv("MINION_FLOW_CACHE", str(tmp_path / "flow-cache.json"))
+        monkeypatch.setattr(fb, "_HAS_DAG", None)
+        importlib.invalidate_caches()
+        _flow_cache.clear()
+        yield pkg
+        _flow_cache.clear()
+        sys.modules.pop("minion_tasks", None)
+
+    def test_compiled_tables_answer_queries(self, fake_dag):
+        assert next_status("open", "review") == "review"
+        assert next_status("review", "review", passed=False) == "open"
+        assert workers_for("review", "coder", "review") == ["oracle"]
+        assert is_terminal("done", "review") is True
+        assert available_flows() == ["review"]
+
+    def test_second_process_loads_cache_without_import(self, fake_dag):
+        import sys
+
+        from minion_comms.flow_bridge import compile_flows
+        assert compile_flows()["flows"] == ["review"]
+        _flow_cache.clear()
+        sys.modules.pop("minion_tasks", None)
+
+        assert next_status("open", "review") == "review"
+        assert "minion_tasks" not in sys.modules
+
+    def test_yaml_change_recompiles(self, fake_dag):
+        import os
+
+        from minion_comms.flow_bridge import compile_flows
+        compile_flows()
+        flow_file = fake_dag / "flows" / "review.yaml"
+        flow_file.write_text(_REVIEW_FLOW.replace("workers: [oracle]", "workers: [recon]"))
+        st = flow_file.stat()
+        os.utime(flow_file, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+        _flow_cache.clear()
+
+        assert workers_for("review", "coder", "review") == ["recon"]
+
+    def test_invalid_flow_reported_at_compile_time(self, fake_dag):
+        from minion_comms.flow_bridge import compile_flows
+        (fake_dag / "flows" / "broken.yaml").write_text(
+            "stages:\n  open: {next: nowhere}\n  done: {terminal: true}\n"
+        )
+        result = compile_flows()
+        assert result["flows"] == ["review"]
+        assert "unknown status" in result["errors"]["broken"]
+        # Runtime falls back to the built-in flow instead of misrouting
+        assert next_status("open", "broken") == "assigned"
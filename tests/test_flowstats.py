@@ -0,0 +1,58 @@
+"""Tests for flow rollups: depth, dwell and throughput maintained on transition."""
+
+from minion_comms.db import get_db
+from minion_comms.flowstats import get_flow_stats
+from minion_comms.tasks import complete_task, create_task, pull_task
+
+
+def _task(lead, tmp_path, title="t"):
+    spec = tmp_path / f"{title}.md"
+    spec.write_text(title)
+    return create_task(lead, title, str(spec), class_required="coder")["task_id"]
+
+
+def _stages():
+    return get_flow_stats()["flows"]["bugfix"]["stages"]
+
+
+class TestFlowStats:
+    def test_depth_tracks_open_queue(self, isolated_db, lead_agent, coder_agent, battle_plan, tmp_path):
+        _task(lead_agent, tmp_path, "a")
+        _task(lead_agent, tmp_path, "b")
+        assert _stages()["open"]["depth"] == 2
+
+        pull_task(coder_agent, 1)
+        stages = _stages()
+        assert stages["open"]["depth"] == 1
+        assert stages["open"]["peak_depth"] == 2
+        assert stages["assigned"]["depth"] == 1
+
+    def test_dwell_measured_from_stage_entry(self, isolated_db, lead_agent, coder_agent, battle_plan, tmp_path):
+        tid = _task(lead_agent, tmp_path)
+        conn = get_db()
+        conn.execute("UPDATE tasks SET status_entered_at = '2000-01-01T00:00:00' WHERE id = ?", (tid,))
+        conn.commit()
+        conn.close()
+        pull_task(coder_agent, tid)
+        open_stage = _stages()["open"]
+        assert open_stage["exited"] == 1
+        assert open_stage["max_dwell_seconds"] > 86400
+
+    def test_throughput_by_agent_class(self, isolated_db, lead_agent, coder_agent, battle_plan, tmp_path):
+        tid = _task(lead_agent, tmp_path)
+        pull_task(coder_agent, tid)
+        complete_task(coder_agent, tid)
+        rows = get_flow_stats()["flows"]["bugfix"]["throughput"]
+        by_stage = {(r["status"], r["agent_class"]): r["exits"] for r in rows}
+        assert by_stage[("open", "coder")] == 1
+        assert by_stage[("assigned", "coder")] == 1
+
+    def test_same_status_repull_not_counted(self, isolated_db, lead_agent, coder_agent, battle_plan, tmp_path):
+        tid = _task(lead_agent, tmp_path)
+        pull_task(coder_agent, tid)
+        pull_task(coder_agent, tid)
+        assert _stages()["assigned"]["entered"] == 1
+
+    def test_filter_by_type(self, isolated_db, lead_agent, battle_plan, tmp_path):
+        _task(lead_agent, tmp_path)
+        assert get_flow_stats(task_type="feature")["flows"] == {}
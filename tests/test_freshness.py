@@ -0,0 +1,157 @@
+"""Tests for the files-read index, the content-hash cache and the bulk change scanner."""
+
+import os
+
+from minion_comms.comms import deregister, register, set_context, who
+from minion_comms.freshness import content_hashes, scan_file_changes
+from minion_comms.monitoring import check_freshness, sitrep
+
+
+def _touch(path, content):
+    path.write_text(content)
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+
+def _agent(name):
+    return next(a for a in who()["agents"] if a["name"] == name)
+
+
+class TestFilesRead:
+    def test_unchanged_files_stay_fresh(self, isolated_db, tmp_path):
+        f = tmp_path / "a.py"
+        f.write_text("a")
+        register("oracle1", "oracle")
+        set_context("oracle1", "briefed", files_read=str(f))
+        result = scan_file_changes()
+        assert result["scanned"] == 1
+        assert result["changed"] == []
+        assert _agent("oracle1")["stale_reads"] == 0
+
+    def test_change_marks_every_reader_stale(self, isolated_db, tmp_path):
+        f, g = tmp_path / "a.py", tmp_path / "b.py"
+        f.write_text("a")
+        g.write_text("b")
+        register("oracle1", "oracle")
+        register("recon1", "recon")
+        set_context("oracle1", "briefed", files_read=f"{f},{g}")
+        set_context("recon1", "briefed", files_read=str(f))
+        _touch(f, "changed")
+
+        result = scan_file_changes()
+        assert result["changed"] == [str(f)]
+        assert result["agents"] == {"oracle1": [str(f)], "recon1": [str(f)]}
+        oracle = _agent("oracle1")
+        assert oracle["stale_reads"] == 1
+        assert oracle["context_stale"] is True
+        assert scan_file_changes()["changed"] == []  # already stale, not re-reported
+
+    def test_only_newly_stale_readers_are_reported(self, isolated_db, tmp_path):
+        f = tmp_path / "a.py"
+        f.write_text("a")
+        register("oracle1", "oracle")
+        register("recon1", "recon")
+        set_context("oracle1", "briefed", files_read=str(f))
+        _touch(f, "b")
+        assert scan_file_changes()["agents"] == {"oracle1": [str(f)]}
+        set_context("recon1", "briefed", files_read=str(f))
+        _touch(f, "c")
+        assert scan_file_changes()["agents"] == {"recon1": [str(f)]}
+
+    def test_reread_clears_stale(self, isolated_db, tmp_path):
+        f = tmp_path / "a.py"
+        f.write_text("a")
+        register("oracle1", "oracle")
+        set_context("oracle1", "briefed", files_read=str(f))
+        _touch(f, "changed")
+        scan_file_changes()
+        set_context("oracle1", "re-read", files_read=str(f))
+        assert _agent("oracle1")["stale_reads"] == 0
+
+    def test_deleted_file_is_stale(self, isolated_db, tmp_path):
+        f = tmp_path / "a.py"
+        f.write_text("a")
+        register("oracle1", "oracle")
+        set_context("oracle1", "briefed", files_read=str(f))
+        f.unlink()
+        assert scan_file_changes()["changed"] == [str(f)]
+
+    def test_sitrep_shows_stale_reads(self, isolated_db, tmp_path):
+        f = tmp_path / "a.py"
+        f.write_text("a")
+        register("oracle1", "oracle")
+        set_context("oracle1", "briefed", files_read=str(f))
+        _touch(f, "changed")
+        scan_file_changes()
+        agents = {a["name"]: a for a in sitrep()["agents"]}
+        assert agents["oracle1"]["stale_reads"] == 1
+
+    def test_deregister_drops_reads(self, isolated_db, tmp_path):
+        f = tmp_path / "a.py"
+        f.write_text("a")
+        register("oracle1", "oracle")
+        set_context("oracle1", "briefed", files_read=str(f))
+        deregister("oracle1")
+        assert scan_file_changes()["scanned"] == 0
+
+
+class TestContentHashes:
+    def test_touch_only_is_not_a_change(self, isolated_db, tmp_path):
+        f = tmp_path / "a.py"
+        f.write_text("a")
+        register("oracle1", "oracle")
+        set_context("oracle1", "briefed", files_read=str(f))
+        before = content_hashes([str(f)])[str(f)]
+        _touch(f, "a")
+
+        assert scan_file_changes()["changed"] == []
+        after = content_hashes([str(f)])[str(f)]
+        assert after["hash"] == before["hash"]
+        assert after["changed_at"] == before["changed_at"]
+        assert check_freshness("oracle1", str(f))["stale_count"] == 0
+
+    def test_content_change_is_stale(self, isolated_db, tmp_path):
+        f = tmp_path / "a.py"
+        f.write_text("a")
+        register("oracle1", "oracle")
+        set_context("oracle1", "briefed", files_read=str(f))
+        _touch(f, "b")
+        assert check_freshness("oracle1", str(f))["stale_count"] == 1
+        assert scan_file_changes()["changed"] == [str(f)]
+
+    def test_check_freshness_leaves_cache_alone(self, isolated_db, tmp_path):
+        from minion_comms.db import get_db
+
+        f = tmp_path / "a.py"
+        f.write_text("a")
+        register("oracle1", "oracle")
+        set_context("oracle1", "briefed", files_read=str(f))
+        _touch(f, "b")
+        conn = get_db()
+        before = conn.execute("SELECT * FROM file_hashes").fetchall()
+        assert check_freshness("oracle1", str(f))["stale_count"] == 1
+        assert conn.execute("SELECT * FROM file_hashes").fetchall() == before
+        conn.close()
+
+    def test_freshness_lookup_is_chunked(self, isolated_db, tmp_path, monkeypatch):
+        import minion_comms.freshness as freshness
+        monkeypatch.setattr(freshness, "_SQL_CHUNK", 2)
+        files = [tmp_path / f"f{i}.txt" for i in range(5)]
+        for f in files:
+            f.write_text("v1")
+        register("oracle1", "oracle")
+        set_context("oracle1", "briefed", files_read=",".join(str(f) for f in files))
+        _touch(files[3], "v2")
+        result = check_freshness("oracle1", ",".join(str(f) for f in files))
+        assert [f["stale"] for f in result["files"]] == [False, False, False, True, False]
+
+    def test_batch_lookup_skips_missing_and_dirs(self, isolated_db, tmp_path):
+        files = [tmp_path / f"f{i}.txt" for i in range(600)]
+        for i, f in enumerate(files):
+            f.write_text(str(i))
+        paths = [str(f) for f in files] + [str(tmp_path), str(tmp_path / "gone")]
+        result = content_hashes(paths)
+        assert result[str(tmp_path)] is None
+        assert result[str(tmp_path / "gone")] is None
+        assert len({result[str(f)]["hash"] for f in files}) == 600
+        assert content_hashes(paths) == result  # served from cache
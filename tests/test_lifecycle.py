@@ -3,9 +3,12 @@
 import os
 import tempfile
 
-from minion_comms.comms import register
+from minion_comms.comms import register, set_status
+from minion_comms.crew.hand_off import hand_off_zone
+from minion_comms.db import get_read_db
 from minion_comms.lifecycle import cold_start, debrief, end_session, fenix_down
-from minion_comms.warroom import set_battle_plan
+from minion_comms.tasks import create_task
+from minion_comms.warroom import log_raid, set_battle_plan
 
 
 class TestColdStart:
@@ -20,6 +23,74 @@ class TestColdStart:
         assert "briefing_files" in result
 
 
+def _snapshot_built_at():
+    conn = get_read_db()
+    try:
+        return conn.execute("SELECT built_at FROM briefing_snapshot WHERE id = 1").fetchone()[0]
+    finally:
+        conn.close()
+
+
+class TestBriefingSnapshot:
+    def test_snapshot_reused_across_cold_starts(self, isolated_db, lead_agent, coder_agent, battle_plan):
+        first = cold_start(lead_agent)
+        built_at = _snapshot_built_at()
+        second = cold_start(coder_agent)
+        assert _snapshot_built_at() == built_at
+        assert second["briefing_version"] == first["briefing_version"]
+        assert second["battle_plan"] == first["battle_plan"]
+
+    def test_snapshot_invalidated_by_changes(self, isolated_db, lead_agent, battle_plan):
+        before = cold_start(lead_agent)
+        log_raid(lead_agent, "found the boss", "high")
+        after = cold_start(lead_agent)
+        assert after["briefing_version"] > before["briefing_version"]
+        assert after["raid_log"][0]["entry_content"] == "found the boss"
+
+    def test_plan_file_edit_rebuilds(self, isolated_db, lead_agent, battle_plan):
+        plan_file = cold_start(lead_agent)["battle_plan"]["plan_file"]
+        with open(plan_file, "w") as f:
+            f.write("revised plan, longer than before")
+        assert cold_start(lead_agent)["battle_plan"]["plan_content"] == "revised plan, longer than before"
+
+    def test_hand_off_entry_invalidates(self, isolated_db, lead_agent, coder_agent, battle_plan):
+        register("coder2", "coder")
+        cold_start(lead_agent)
+        hand_off_zone(coder_agent, "coder2", "src/auth")
+        entries = cold_start(lead_agent)["raid_log"]
+        assert entries[0]["entry_content"].startswith("ZONE HANDOFF")
+
+    def test_fenix_down_status_invalidates(self, isolated_db, lead_agent, coder_agent, battle_plan):
+        cold_start(lead_agent)
+        fenix_down(coder_agent, "/tmp/notes.md")
+        agents = {a["name"]: a["status"] for a in cold_start(lead_agent)["agents"]}
+        assert agents[coder_agent] == "phoenix_down"
+
+    def test_since_without_prior_is_full(self, isolated_db, lead_agent, battle_plan):
+        result = cold_start(lead_agent, since_last=True)
+        assert "since_version" not in result
+        assert result["battle_plan"] is not None
+        assert "tools" in result
+
+    def test_since_returns_only_changes(self, isolated_db, lead_agent, coder_agent, battle_plan, tmp_path):
+        spec = tmp_path / "t.md"
+        spec.write_text("t")
+        create_task(lead_agent, "old", str(spec))
+        first = cold_start(coder_agent)
+
+        tid = create_task(lead_agent, "new", str(spec))["task_id"]
+        set_status(lead_agent, "planning")
+        delta = cold_start(coder_agent, since_last=True)
+        assert delta["since_version"] == first["briefing_version"]
+        assert [t["id"] for t in delta["open_tasks"]] == [tid]
+        assert [a["name"] for a in delta["agents"]] == [lead_agent]
+        assert delta["raid_log"] == []
+        assert "battle_plan" not in delta
+        assert "tools" not in delta
+
+        assert cold_start(coder_agent, since_last=True)["unchanged"] is True
+
+
 class TestFenixDown:
     def test_fenix_down_success(self, isolated_db, coder_agent):
         result = fenix_down(coder_agent, "/tmp/notes.md,/tmp/findings.md", "halfway through auth")
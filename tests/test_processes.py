@@ -0,0 +1,112 @@
+"""Tests for the process registry: start tokens, SIGTERM/SIGKILL, stale PIDs, poll exit."""
+
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+
+from minion_comms.db import get_db, get_read_db
+from minion_comms.polling import poll_loop
+from minion_comms.processes import process_start_token, register_process, signal_agents
+
+_IGNORE_TERM = "import signal, time; signal.signal(signal.SIGTERM, signal.SIG_IGN); print('ready', flush=True); time.sleep(30)"
+
+
+def _child(code="import time; print('ready', flush=True); time.sleep(30)"):
+    proc = subprocess.Popen([sys.executable, "-c", code], stdout=subprocess.PIPE, start_new_session=True)
+    proc.stdout.readline()
+    return proc
+
+
+def _registered():
+    conn = get_read_db()
+    try:
+        return [r["pid"] for r in conn.execute("SELECT pid FROM agent_processes")]
+    finally:
+        conn.close()
+
+
+class TestProcessRegistry:
+    def test_start_token_tracks_liveness(self, isolated_db):
+        proc = _child()
+        assert process_start_token(proc.pid) is not None
+        proc.kill()
+        proc.wait()
+        assert process_start_token(proc.pid) is None
+
+    def test_sigterm_stops_daemon(self, isolated_db):
+        proc = _child()
+        register_process("coder1", proc.pid, kind="daemon")
+        started = time.monotonic()
+        result = signal_agents(["coder1"], "lead")
+        assert time.monotonic() - started < 1
+        assert [p["pid"] for p in result["terminated"]] == [proc.pid]
+        assert proc.wait(timeout=2) == -signal.SIGTERM
+        assert _registered() == []
+
+    def test_sigkill_after_grace(self, isolated_db):
+        proc = _child(_IGNORE_TERM)
+        register_process("coder1", proc.pid, kind="daemon")
+        result = signal_agents(["coder1"], "lead", grace=0.2)
+        assert [p["pid"] for p in result["killed"]] == [proc.pid]
+        assert proc.wait(timeout=2) == -signal.SIGKILL
+
+    def test_recycled_pid_is_not_signalled(self, isolated_db):
+        proc = _child()
+        register_process("coder1", proc.pid, kind="daemon")
+        conn = get_db()
+        conn.execute("UPDATE agent_processes SET start_token = 'other' WHERE pid = ?", (proc.pid,))
+        conn.commit()
+        conn.close()
+        try:
+            result = signal_agents(None, "lead")
+            assert [p["pid"] for p in result["stale"]] == [proc.pid]
+            assert proc.poll() is None
+            assert _registered() == []
+        finally:
+            proc.kill()
+            proc.wait()
+
+    def test_excluded_agent_spared(self, isolated_db):
+        proc = _child()
+        register_process("lead", proc.pid, kind="daemon")
+        try:
+            assert signal_agents(None, "lead", exclude=("lead",))["terminated"] == []
+            assert proc.poll() is None
+        finally:
+            proc.kill()
+            proc.wait()
+
+    def test_sigterm_ends_blocked_poll(self, isolated_db, lead_agent, coder_agent, battle_plan):
+        seen = []
+        threading.Timer(0.3, lambda: (seen.extend(_registered()), os.kill(os.getpid(), signal.SIGTERM))).start()
+        started = time.monotonic()
+        result = poll_loop(coder_agent, interval=30, timeout=60)
+        assert result["exit_code"] == 3
+        assert time.monotonic() - started < 5
+        assert seen == [os.getpid()]
+        assert _registered() == []
+
+
+class TestStandDownTeardown:
+    def test_swarm_stop_runs_after_signalling(self, isolated_db, lead_agent, coder_agent, tmp_path, monkeypatch):
+        import importlib
+
+        sd = importlib.import_module("minion_comms.crew.stand_down")
+        monkeypatch.setenv("HOME", str(tmp_path))
+        (tmp_path / ".minion-swarm").mkdir()
+        config = tmp_path / ".minion-swarm" / "blue.yaml"
+        config.write_text("agents:\n  coder1: {role: coder}\n  coder2: {role: coder}\n")
+        calls = []
+        monkeypatch.setattr(sd.subprocess, "run", lambda argv, **kw: calls.append(argv))
+        monkeypatch.setattr(sd, "close_terminal_by_title", lambda title: None)
+
+        proc = _child()
+        register_process("coder1", proc.pid, kind="poller")
+        result = sd.stand_down(lead_agent, crew="blue")
+        proc.wait(timeout=2)
+        assert [p["pid"] for p in result["processes"]["terminated"]] == [proc.pid]
+        # coder2's python-runtime daemon never registered — the swarm stop must still run
+        assert ["minion-swarm", "stop", "--config", str(config)] in calls
@@ -2,6 +2,8 @@
 
 import os
 import tempfile
+import threading
+import time
 
 from minion_comms.comms import register
 from minion_comms.tasks import (
@@ -173,3 +175,89 @@ class TestCompleteTask:
         self._setup_assigned_task(lead_agent, coder_agent)
         result = complete_task(coder_agent, 1)
         assert "eligible_classes" in result
+
+
+class TestTaskLeases:
+    def _claimed_task(self, lead, coder, tmp_path):
+        spec = tmp_path / "spec.md"
+        spec.write_text("spec")
+        create_task(lead, "leased task", str(spec), class_required="coder")
+        pull_task(coder, 1)
+
+    def _expire(self, task_id):
+        from minion_comms.db import get_db
+        conn = get_db()
+        conn.execute("UPDATE tasks SET lease_expires_at = '2000-01-01T00:00:00' WHERE id = ?", (task_id,))
+        conn.commit()
+        conn.close()
+
+    def test_pull_sets_lease(self, isolated_db, lead_agent, coder_agent, battle_plan, tmp_path):
+        self._claimed_task(lead_agent, coder_agent, tmp_path)
+        assert get_task(1)["task"]["lease_expires_at"]
+
+    def test_reclaim_returns_task_to_pool(self, isolated_db, lead_agent, coder_agent, battle_plan, tmp_path):
+        from minion_comms.tasks import reclaim_expired_tasks
+        self._claimed_task(lead_agent, coder_agent, tmp_path)
+        self._expire(1)
+        result = reclaim_expired_tasks()
+        assert [r["task_id"] for r in result["reclaimed"]] == [1]
+        task = get_task(1)["task"]
+        assert task["status"] == "open"
+        assert task["assigned_to"] is None
+        assert task["lease_expires_at"] is None
+        # Someone else can now pick it up
+        register("coder2", "coder")
+        assert pull_task("coder2", 1)["status"] == "claimed"
+
+    def test_reclaim_ignores_live_leases(self, isolated_db, lead_agent, coder_agent, battle_plan, tmp_path):
+        from minion_comms.tasks import reclaim_expired_tasks
+        self._claimed_task(lead_agent, coder_agent, tmp_path)
+        assert reclaim_expired_tasks()["reclaimed"] == []
+        assert get_task(1)["task"]["assigned_to"] == coder_agent
+
+    def test_reclaim_waits_for_concurrent_renewal(self, isolated_db, lead_agent, coder_agent, battle_plan, tmp_path):
+        from minion_comms.db import get_db
+        from minion_comms.tasks import reclaim_expired_tasks
+        self._claimed_task(lead_agent, coder_agent, tmp_path)
+        self._expire(1)
+        writer = get_db()
+        writer.execute("BEGIN IMMEDIATE")
+        result = {}
+        sweep = threading.Thread(target=lambda: result.update(reclaim_expired_tasks()))
+        sweep.start()
+        time.sleep(0.2)
+        writer.execute("UPDATE tasks SET lease_expires_at = '2999-01-01T00:00:00' WHERE id = 1")
+        writer.commit()
+        writer.close()
+        sweep.join()
+        assert result["reclaimed"] == []
+        assert get_task(1)["task"]["assigned_to"] == coder_agent
+
+    def test_review_stage_keeps_status(self, isolated_db, lead_agent, coder_agent, battle_plan, tmp_path):
+        from minion_comms.tasks import reclaim_expired_tasks
+        self._claimed_task(lead_agent, coder_agent, tmp_path)
+        register("oracle1", "oracle")
+        complete_task(coder_agent, 1)
+        complete_task(coder_agent, 1)
+        pull_task("oracle1", 1)
+        status = get_task(1)["task"]["status"]
+        self._expire(1)
+        reclaim_expired_tasks()
+        task = get_task(1)["task"]
+        assert task["status"] == status
+        assert task["assigned_to"] is None
+
+    def test_update_renews_lease(self, isolated_db, lead_agent, coder_agent, battle_plan, tmp_path):
+        self._claimed_task(lead_agent, coder_agent, tmp_path)
+        self._expire(1)
+        update_task(coder_agent, 1, progress="still going")
+        assert get_task(1)["task"]["lease_expires_at"] > "2000-01-01T00:00:00"
+
+    def test_poll_sweeps_expired(self, isolated_db, lead_agent, coder_agent, battle_plan, tmp_path):
+        from minion_comms.polling import _find_available_tasks, _maintain_leases
+        self._claimed_task(lead_agent, coder_agent, tmp_path)
+        self._expire(1)
+        assert _find_available_tasks(coder_agent) == []
+        register("coder2", "coder")
+        _maintain_leases("coder2")
+        assert [t["task_id"] for t in _find_available_tasks("coder2")] == [1]
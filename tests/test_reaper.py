@@ -0,0 +1,98 @@
+"""Tests for the dead-agent reaper: claims, tasks, group sends, lead notice."""
+
+import datetime
+import os
+
+from minion_comms.comms import check_inbox, register, send, set_context
+from minion_comms.db import get_db, get_read_db
+from minion_comms.filesafety import claim_file, get_claims
+from minion_comms.polling import poll_loop
+from minion_comms.reaper import reap_dead_agents
+from minion_comms.tasks import create_task, get_task, pull_task
+
+
+def _silence(agent, minutes=60):
+    ago = (datetime.datetime.now() - datetime.timedelta(minutes=minutes)).isoformat()
+    conn = get_db()
+    conn.execute("UPDATE agents SET last_seen = ? WHERE name = ?", (ago, agent))
+    conn.commit()
+    conn.close()
+
+
+def _lead_inbox():
+    conn = get_read_db()
+    try:
+        return conn.execute("SELECT * FROM messages WHERE to_agent = 'lead' AND from_agent = 'system'").fetchall()
+    finally:
+        conn.close()
+
+
+class TestReaper:
+    def test_live_agents_untouched(self, isolated_db, lead_agent, coder_agent):
+        assert reap_dead_agents()["reaped"] == []
+
+    def test_reaps_claims_and_tasks(self, isolated_db, lead_agent, coder_agent, battle_plan, tmp_path):
+        spec = tmp_path / "t.md"
+        spec.write_text("t")
+        tid = create_task(lead_agent, "t", str(spec), class_required="coder")["task_id"]
+        pull_task(coder_agent, tid)
+        claim_file(coder_agent, "src/a.py")
+        _silence(coder_agent)
+        _silence(lead_agent)
+
+        result = reap_dead_agents()
+        assert [r["agent"] for r in result["reaped"]] == [coder_agent]  # leads never reaped
+        assert result["reaped"][0]["requeued_tasks"] == [tid]
+        assert get_claims()["claims"] == []
+        task = get_task(tid)["task"]
+        assert task["status"] == "open"
+        assert task["assigned_to"] is None
+        assert len(_lead_inbox()) == 1
+        assert reap_dead_agents()["reaped"] == []  # not reaped twice
+
+    def test_editing_claimed_files_is_alive(self, isolated_db, lead_agent, coder_agent, battle_plan, tmp_path):
+        spec = tmp_path / "t.md"
+        spec.write_text("t")
+        tid = create_task(lead_agent, "t", str(spec), class_required="coder")["task_id"]
+        pull_task(coder_agent, tid)
+        work = tmp_path / "a.py"
+        work.write_text("v1")
+        claim_file(coder_agent, str(work))
+        _silence(coder_agent)
+        work.write_text("v2, mid-edit")
+
+        assert reap_dead_agents()["reaped"] == []
+        assert [c["agent_name"] for c in get_claims()["claims"]] == [coder_agent]
+        assert get_task(tid)["task"]["assigned_to"] == coder_agent
+
+    def test_waitlist_promoted_on_reap(self, isolated_db, lead_agent, coder_agent):
+        register("coder2", "coder")
+        claim_file(coder_agent, "src/a.py")
+        claim_file("coder2", "src/a.py")
+        _silence(coder_agent)
+        assert reap_dead_agents()["promoted"] == {os.path.abspath("src/a.py"): "coder2"}
+
+    def test_class_send_skips_reaped_until_seen(self, isolated_db, lead_agent, coder_agent, battle_plan):
+        register("coder2", "coder")
+        set_context(lead_agent, "planning")
+        _silence(coder_agent)
+        reap_dead_agents()
+        check_inbox(lead_agent)
+        assert send(lead_agent, "", "hi", to_class="coder")["recipients"] == ["coder2"]
+
+        set_context(coder_agent, "back")
+        assert send(lead_agent, "", "hi again", to_class="coder")["recipients"] == [coder_agent, "coder2"]
+
+    def test_idle_poll_heartbeats_and_sweeps(self, isolated_db, lead_agent, coder_agent, battle_plan):
+        register("coder2", "coder")
+        _silence(coder_agent)
+        _silence("coder2")
+        poll_loop(coder_agent, interval=1, timeout=1)
+
+        conn = get_read_db()
+        try:
+            rows = {r["name"]: r for r in conn.execute("SELECT name, reaped_at FROM agents")}
+        finally:
+            conn.close()
+        assert rows[coder_agent]["reaped_at"] is None
+        assert rows["coder2"]["reaped_at"] is not None
@@ -0,0 +1,83 @@
+"""Tests for the read replica — two local SQLite files."""
+
+import sqlite3
+
+import pytest
+
+from minion_comms.comms import get_history, send, set_context
+from minion_comms.monitoring import sitrep
+from minion_comms.replica import get_replica_db, replica_status, sync_replica
+from minion_comms.warroom import get_raid_log, log_raid
+
+
+class TestSyncReplica:
+    def test_sync_copies_state(self, isolated_db, lead_agent, tmp_path):
+        log_raid(lead_agent, "before sync")
+        path = str(tmp_path / "follower.db")
+        result = sync_replica(path, pages=1)
+        assert result["status"] == "synced"
+
+        conn = sqlite3.connect(path)
+        assert conn.execute("SELECT COUNT(*) FROM raid_log").fetchone()[0] == 1
+        conn.close()
+
+    def test_status_reports_lag(self, isolated_db, lead_agent, tmp_path):
+        path = str(tmp_path / "follower.db")
+        sync_replica(path)
+        assert replica_status(path)["lag_events"] == 0
+
+        log_raid(lead_agent, "after sync")
+        assert replica_status(path)["lag_events"] == 1
+
+    def test_status_without_replica(self, isolated_db, tmp_path):
+        result = replica_status(str(tmp_path / "missing.db"))
+        assert result["exists"] is False
+        assert result["replica_seq"] is None
+
+
+class TestReplicaReads:
+    def test_replica_is_read_only(self, isolated_db, lead_agent):
+        sync_replica()
+        conn, _ = get_replica_db()
+        assert conn is not None
+        try:
+            with pytest.raises(sqlite3.OperationalError):
+                conn.execute("DELETE FROM agents")
+        finally:
+            conn.close()
+
+    def test_missing_replica_is_an_error(self, isolated_db, tmp_path):
+        conn, info = get_replica_db(str(tmp_path / "missing.db"))
+        assert conn is None
+        assert "error" in info
+
+    def test_lag_within_bound_serves_follower(self, isolated_db, lead_agent, tmp_path):
+        path = str(tmp_path / "follower.db")
+        sync_replica(path)
+        log_raid(lead_agent, "not yet replicated")
+        conn, info = get_replica_db(path, max_lag_seconds=3600)
+        assert conn is not None
+        assert conn.execute("SELECT COUNT(*) FROM raid_log").fetchone()[0] == 0
+        assert info["stale"] is False
+        conn.close()
+
+    def test_lag_over_bound_reported_not_synced(self, isolated_db, lead_agent, tmp_path):
+        path = str(tmp_path / "follower.db")
+        sync_replica(path)
+        log_raid(lead_agent, "left for the replicator")
+        conn, info = get_replica_db(path, max_lag_seconds=0)
+        assert conn is not None
+        assert conn.execute("SELECT COUNT(*) FROM raid_log").fetchone()[0] == 0
+        assert info["stale"] is True
+        conn.close()
+
+    def test_commands_read_from_replica(self, isolated_db, lead_agent, battle_plan):
+        set_context(lead_agent, "coordinating")
+        send(lead_agent, "all", "standup")
+        log_raid(lead_agent, "entry")
+        sync_replica()
+        raid = get_raid_log(replica=True)
+        assert len(raid["entries"]) == 1
+        assert raid["replica"]["stale"] is False
+        assert len(get_history(replica=True)["messages"]) == 1
+        assert sitrep(replica=True)["battle_plan"] is not None
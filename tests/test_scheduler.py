@@ -0,0 +1,133 @@
+"""Tests for the task scheduler: priority, zone affinity, in-flight cap, blockers."""
+
+from minion_comms.comms import register
+from minion_comms.db import get_db, get_read_db
+from minion_comms.scheduler import claimable_depth, next_tasks
+from minion_comms.tasks import close_task, create_task, pull_task, submit_result
+
+
+def _picks(agent):
+    conn = get_read_db()
+    try:
+        return [t["id"] for t in next_tasks(conn.cursor(), agent)]
+    finally:
+        conn.close()
+
+
+def _task(lead, tmp_path, title, **kw):
+    spec = tmp_path / f"{title}.md"
+    spec.write_text(title)
+    return create_task(lead, title, str(spec), class_required="coder", **kw)["task_id"]
+
+
+class TestNextTasks:
+    def test_priority_beats_age(self, isolated_db, lead_agent, coder_agent, battle_plan, tmp_path):
+        old = _task(lead_agent, tmp_path, "old")
+        urgent = _task(lead_agent, tmp_path, "urgent", priority=5)
+        assert _picks(coder_agent) == [urgent, old]
+
+    def test_zone_affinity_breaks_ties(self, isolated_db, lead_agent, coder_agent, battle_plan, tmp_path):
+        other = _task(lead_agent, tmp_path, "other", zone="src/ui/")
+        mine = _task(lead_agent, tmp_path, "mine", zone="src/auth/")
+        conn = get_db()
+        conn.execute("UPDATE agents SET current_zone = 'src/auth/' WHERE name = ?", (coder_agent,))
+        conn.commit()
+        conn.close()
+        assert _picks(coder_agent) == [mine, other]
+
+    def test_inflight_cap_hides_new_work(self, isolated_db, lead_agent, coder_agent, battle_plan, tmp_path):
+        first = _task(lead_agent, tmp_path, "first")
+        _task(lead_agent, tmp_path, "second")
+        pull_task(coder_agent, first)
+        assert _picks(coder_agent) == [first]
+
+        register("coder2", "coder")
+        assert len(_picks("coder2")) == 1
+
+    def test_pull_blocked_at_cap(self, isolated_db, lead_agent, coder_agent, battle_plan, tmp_path):
+        first = _task(lead_agent, tmp_path, "first")
+        second = _task(lead_agent, tmp_path, "second")
+        pull_task(coder_agent, first)
+        result = pull_task(coder_agent, second)
+        assert "error" in result
+        # Re-pulling the held task still works
+        assert pull_task(coder_agent, first)["status"] == "claimed"
+
+    def test_blocked_tasks_excluded(self, isolated_db, lead_agent, coder_agent, battle_plan, tmp_path):
+        blocker = _task(lead_agent, tmp_path, "blocker")
+        blocked = _task(lead_agent, tmp_path, "blocked", blocked_by=str(blocker), priority=9)
+        assert _picks(coder_agent) == [blocker]
+        submit_result(lead_agent, blocker, str(tmp_path / "blocker.md"))
+        close_task(lead_agent, blocker)
+        assert _picks(coder_agent) == [blocked]
+
+    def test_pull_without_id_takes_top_pick(self, isolated_db, lead_agent, coder_agent, battle_plan, tmp_path):
+        _task(lead_agent, tmp_path, "low")
+        high = _task(lead_agent, tmp_path, "high", priority=3)
+        result = pull_task(coder_agent)
+        assert result["status"] == "claimed"
+        assert result["task_id"] == high
+
+    def test_pull_without_id_empty_queue(self, isolated_db, lead_agent, coder_agent, battle_plan):
+        assert "error" in pull_task(coder_agent)
+
+
+class TestFileConflicts:
+    def test_claimed_files_sink_in_queue(self, isolated_db, lead_agent, coder_agent, battle_plan, tmp_path):
+        from minion_comms.filesafety import claim_file
+        busy = _task(lead_agent, tmp_path, "busy", files="src/a.py,src/b.py", priority=5)
+        free = _task(lead_agent, tmp_path, "free", files="src/c.py")
+        register("coder2", "coder")
+        claim_file("coder2", "src/a.py")
+        assert _picks(coder_agent) == [free, busy]
+
+        result = pull_task(coder_agent, busy)
+        assert result["file_conflicts"][0]["claimed_by"] == "coder2"
+
+    def test_directory_claim_counts_as_conflict(self, isolated_db, lead_agent, coder_agent, battle_plan, tmp_path):
+        from minion_comms.filesafety import claim_file
+        busy = _task(lead_agent, tmp_path, "busy", files="src/auth/login.py", priority=5)
+        free = _task(lead_agent, tmp_path, "free", files="src/ui/app.py")
+        register("coder2", "coder")
+        claim_file("coder2", "src/auth/**")
+        assert _picks(coder_agent) == [free, busy]
+        assert pull_task(coder_agent, busy)["file_conflicts"][0]["claimed_by"] == "coder2"
+
+    def test_update_task_files_replaces_set(self, isolated_db, lead_agent, coder_agent, battle_plan, tmp_path):
+        from minion_comms.tasks import update_task
+        tid = _task(lead_agent, tmp_path, "t", files="x.py")
+        update_task(lead_agent, tid, files="y.py, z.py")
+        conn = get_read_db()
+        try:
+            rows = conn.execute("SELECT file_path FROM task_files WHERE task_id = ?", (tid,)).fetchall()
+        finally:
+            conn.close()
+        assert [r[0].rsplit("/", 1)[-1] for r in rows] == ["y.py", "z.py"]
+
+    def test_conflicts_report(self, isolated_db, lead_agent, coder_agent, battle_plan, tmp_path):
+        from minion_comms.filesafety import claim_file
+        from minion_comms.scheduler import get_conflicts
+        a = _task(lead_agent, tmp_path, "a", files="shared.py,a.py")
+        b = _task(lead_agent, tmp_path, "b", files="shared.py")
+        _task(lead_agent, tmp_path, "c", files="c.py")
+        claim_file(coder_agent, "a.py")
+
+        report = get_conflicts()
+        assert [(o["task_a"], o["task_b"]) for o in report["task_overlaps"]] == [(a, b)]
+        assert [c["task_id"] for c in report["claim_conflicts"]] == [a]
+
+
+class TestClaimableDepth:
+    def test_depth_by_class_and_review_stage(self, isolated_db, lead_agent, coder_agent, battle_plan, tmp_path):
+        _task(lead_agent, tmp_path, "a")
+        tid = _task(lead_agent, tmp_path, "b")
+        conn = get_db()
+        conn.execute("UPDATE tasks SET status = 'fixed' WHERE id = ?", (tid,))
+        conn.commit()
+        conn.close()
+        conn = get_read_db()
+        try:
+            depth = claimable_depth(conn.cursor())
+        finally:
+            conn.close()
+        assert depth == {"coder": 1, "recon": 1, "oracle": 1}
@@ -0,0 +1,75 @@
+"""Tests for the crew capacity simulator."""
+
+from minion_comms.db import get_db
+from minion_comms.simulator import learn_service_model, parse_crew, simulate, simulate_crews
+from minion_comms.tasks import complete_task, create_task, pull_task
+
+_FLAT = {"samples": {}, "pass_rate": {}}
+
+
+class TestSimulate:
+    def test_all_tasks_drain(self):
+        r = simulate({"coder": 2, "oracle": 1, "recon": 1}, ["coder"] * 20, _FLAT)
+        assert r["completed"] == 20
+        assert r["stuck"] == 0
+        assert r["drain_hours"] > 0
+
+    def test_more_coders_drain_faster(self):
+        backlog = ["coder"] * 40
+        one = simulate({"coder": 1, "recon": 4}, backlog, _FLAT, seed=1)
+        four = simulate({"coder": 4, "recon": 4}, backlog, _FLAT, seed=1)
+        assert four["drain_hours"] < one["drain_hours"]
+
+    def test_missing_class_reports_stuck(self):
+        r = simulate({"coder": 2}, ["coder"] * 5, _FLAT)
+        assert r["completed"] == 0
+        assert r["stuck"] == 5
+
+    def test_bottleneck_is_scarce_reviewer(self):
+        r = simulate({"coder": 6, "recon": 1}, ["coder"] * 30, _FLAT, seed=3)
+        assert r["bottleneck_class"] == "recon"
+
+    def test_deterministic_for_seed(self):
+        crew = {"coder": 2, "recon": 1}
+        assert simulate(crew, ["coder"] * 10, _FLAT, seed=7) == simulate(crew, ["coder"] * 10, _FLAT, seed=7)
+
+
+class TestLearnServiceModel:
+    def test_samples_from_history(self, isolated_db, lead_agent, coder_agent, battle_plan, tmp_path):
+        spec = tmp_path / "t.md"
+        spec.write_text("t")
+        tid = create_task(lead_agent, "t", str(spec), class_required="coder")["task_id"]
+        pull_task(coder_agent, tid)
+        conn = get_db()
+        conn.execute("UPDATE task_history SET timestamp = '2000-01-01T00:00:00' WHERE task_id = ?", (tid,))
+        conn.commit()
+        conn.close()
+        complete_task(coder_agent, tid)
+        model = learn_service_model()
+        assert "open" not in model["samples"]  # queue wait, not service
+        assert model["samples"]["assigned"][0] > 86400
+
+
+class TestSimulateCrews:
+    def test_parse_crew_spec(self):
+        assert parse_crew("coder=3, recon=1") == {"coder": 3, "recon": 1}
+        assert isinstance(parse_crew("coder=many"), str)
+
+    def test_runs_must_be_positive(self, isolated_db):
+        assert "error" in simulate_crews(["coder=1,recon=1"], n_tasks=5, runs=0)
+
+    def test_throughput_at_scale(self, isolated_db):
+        r = simulate_crews(["coder=3,recon=1"], n_tasks=5000, runs=1)
+        assert r["results"][0]["completed"] == 5000
+        assert r["simulated_tasks_per_second"] >= 1000
+
+    def test_sweep_sorted_by_drain(self, isolated_db):
+        r = simulate_crews(["coder=1,recon=1", "coder=4,recon=2"], n_tasks=20, runs=3)
+        assert r["backlog"] == 20
+        assert [res["crew"]["coder"] for res in r["results"]] == [4, 1]
+
+    def test_empty_backlog(self, isolated_db):
+        assert "error" in simulate_crews(["coder=1"])
+
+    def test_unknown_crew(self, isolated_db):
+        assert "error" in simulate_crews(["no-such-crew"], n_tasks=5)
@@ -187,3 +187,138 @@ class TestGetTasks:
         result = get_task(1)
         assert result["task"]["title"] == "task1"
         os.unlink(f.name)
+
+
+class TestCreateTasks:
+    def _manifest(self, tmp_path, body, name="tasks.yaml"):
+        (tmp_path / "spec.md").write_text("spec")
+        path = tmp_path / name
+        path.write_text(body)
+        return str(path)
+
+    def test_yaml_with_symbolic_blockers(self, isolated_db, lead_agent, battle_plan, tmp_path):
+        from minion_comms.tasks import create_tasks
+        manifest = self._manifest(tmp_path, """
+tasks:
+  - key: api
+    title: Build API
+    task_file: spec.md
+    blocked_by: [schema]
+    class_required: coder
+  - key: schema
+    title: Design schema
+    task_file: spec.md
+    priority: 2
+    files: db.py, models.py
+""")
+        result = create_tasks(lead_agent, manifest)
+        assert result["status"] == "created"
+        assert result["count"] == 2
+        ids = {t["key"]: t["task_id"] for t in result["tasks"]}
+        # Blocker inserted first so its real id exists
+        assert ids["schema"] < ids["api"]
+        api = get_task(ids["api"])["task"]
+        assert api["blocked_by"] == str(ids["schema"])
+        assert get_task(ids["schema"])["task"]["priority"] == 2
+
+    def test_files_resolve_against_manifest(self, isolated_db, lead_agent, battle_plan, tmp_path, monkeypatch):
+        from minion_comms.tasks import create_tasks
+        manifest = self._manifest(tmp_path, """
+tasks:
+  - title: Touch models
+    task_file: spec.md
+    files: src/models.py
+""")
+        monkeypatch.chdir("/")
+        tid = create_tasks(lead_agent, manifest)["tasks"][0]["task_id"]
+        assert get_task(tid)["task"]["files"] == str(tmp_path / "src" / "models.py")
+
+    def test_jsonl_mixes_existing_ids(self, isolated_db, lead_agent, battle_plan, tmp_path):
+        from minion_comms.tasks import create_tasks
+        (tmp_path / "spec.md").write_text("spec")
+        existing = create_task(lead_agent, "existing", str(tmp_path / "spec.md"))["task_id"]
+        manifest = self._manifest(
+            tmp_path,
+            f'{{"key": "a", "title": "A", "task_file": "spec.md", "blocked_by": "{existing}"}}\n'
+            '{"key": "b", "title": "B", "task_file": "spec.md", "blocked_by": "a"}\n',
+            name="tasks.jsonl",
+        )
+        result = create_tasks(lead_agent, manifest)
+        assert result["count"] == 2
+        ids = {t["key"]: t["task_id"] for t in result["tasks"]}
+        assert get_task(ids["a"])["task"]["blocked_by"] == str(existing)
+
+    def test_cycle_rejected_atomically(self, isolated_db, lead_agent, battle_plan, tmp_path):
+        from minion_comms.tasks import create_tasks
+        manifest = self._manifest(tmp_path, """
+- {key: a, title: A, task_file: spec.md, blocked_by: c}
+- {key: b, title: B, task_file: spec.md, blocked_by: a}
+- {key: c, title: C, task_file: spec.md, blocked_by: b}
+- {key: d, title: D, task_file: spec.md}
+""")
+        result = create_tasks(lead_agent, manifest)
+        assert "error" in result
+        assert any("cycle" in p for p in result["problems"])
+        assert get_tasks()["tasks"] == []
+
+    def test_all_problems_reported(self, isolated_db, lead_agent, battle_plan, tmp_path):
+        from minion_comms.tasks import create_tasks
+        manifest = self._manifest(tmp_path, """
+- {key: a, title: A, task_file: missing.md}
+- {key: b, task_file: spec.md, blocked_by: "999, nope"}
+""")
+        result = create_tasks(lead_agent, manifest)
+        assert len(result["problems"]) == 4
+
+    def test_lead_only(self, isolated_db, lead_agent, coder_agent, battle_plan, tmp_path):
+        from minion_comms.tasks import create_tasks
+        manifest = self._manifest(tmp_path, "- {title: A, task_file: spec.md}\n")
+        assert "error" in create_tasks(coder_agent, manifest)
+
+
+class TestBulkTransitions:
+    def _tasks(self, lead, tmp_path, n, **kw):
+        spec = tmp_path / "spec.md"
+        spec.write_text("spec")
+        return [create_task(lead, f"t{i}", str(spec), **kw)["task_id"] for i in range(n)]
+
+    def test_close_tasks_by_zone(self, isolated_db, lead_agent, battle_plan, tmp_path):
+        from minion_comms.tasks import close_tasks
+        ids = self._tasks(lead_agent, tmp_path, 3, zone="src/auth/")
+        other = self._tasks(lead_agent, tmp_path, 1, zone="src/ui/")
+        for tid in ids[:2] + other:
+            submit_result(lead_agent, tid, str(tmp_path / "spec.md"))
+
+        result = close_tasks(lead_agent, zone="src/auth/")
+        assert result["closed"] == 2
+        assert result["skipped"] == 1
+        assert "result file" in next(r for r in result["results"] if r["task_id"] == ids[2])["error"]
+        assert get_task(ids[0])["task"]["status"] == "closed"
+        assert get_task(other[0])["task"]["status"] == "open"
+
+    def test_update_tasks_abandon_releases_holder(self, isolated_db, lead_agent, coder_agent, battle_plan, tmp_path):
+        from minion_comms.tasks import get_task_lineage, update_tasks
+        ids = self._tasks(lead_agent, tmp_path, 2)
+        assign_task(lead_agent, ids[0], coder_agent)
+
+        result = update_tasks(lead_agent, "abandoned", ids=",".join(map(str, ids)))
+        assert result["updated"] == 2
+        task = get_task(ids[0])["task"]
+        assert task["status"] == "abandoned"
+        assert task["assigned_to"] is None
+        assert get_task_lineage(ids[1])["history"][-1]["to_status"] == "abandoned"
+
+    def test_update_tasks_rejects_terminal_target(self, isolated_db, lead_agent, battle_plan, tmp_path):
+        from minion_comms.tasks import update_tasks
+        ids = self._tasks(lead_agent, tmp_path, 1)
+        result = update_tasks(lead_agent, "closed", ids=str(ids[0]))
+        assert result["updated"] == 0
+        assert "close-tasks" in result["results"][0]["error"]
+
+    def test_bulk_requires_selector(self, isolated_db, lead_agent, battle_plan):
+        from minion_comms.tasks import close_tasks
+        assert "error" in close_tasks(lead_agent)
+
+    def test_bulk_lead_only(self, isolated_db, lead_agent, coder_agent, battle_plan):
+        from minion_comms.tasks import update_tasks
+        assert "error" in update_tasks(coder_agent, "abandoned", ids="1")